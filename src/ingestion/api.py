@@ -166,7 +166,7 @@ class IngestionAPI:
                 return BatchIngestionResponse(
                     success=result.success,
                     total_events=len(request.events),
-                    processed_events=len(result.processed_events),
+                    processed_events=result.processed_count,
                     validation_errors=len(result.validation_errors),
                     processing_errors=len(result.processing_errors),
                     batch_id=result.batch_id,
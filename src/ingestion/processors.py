@@ -4,17 +4,20 @@ Event Processing for PharmIQ
 Core event processing logic with validation and audit logging.
 """
 
+import json
 import time
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, Union
 from dataclasses import dataclass
+from pydantic import ValidationError
 
-from src.models.events import BaseCanonicalEvent, create_canonical_event
+from src.models.events import BaseCanonicalEvent, EventType, create_canonical_event
 from src.utils.validation import EventValidator, ValidationResult
 from src.utils.audit import AuditLogger, AuditAction
+from src.utils.compat import DATACLASS_SLOTS
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ProcessingResult:
     """Result of event processing"""
     success: bool
@@ -23,6 +26,12 @@ class ProcessingResult:
     processing_errors: List[Dict[str, Any]]
     processing_time_ms: int
     batch_id: Optional[str] = None
+    processed_count: Optional[int] = None
+    
+    def __post_init__(self):
+        # Count defaults to the retained events unless the caller counted without retaining
+        if self.processed_count is None:
+            object.__setattr__(self, "processed_count", len(self.processed_events))
 
 
 class EventProcessor:
@@ -32,6 +41,26 @@ class EventProcessor:
         self.audit_logger = audit_logger or AuditLogger()
         self.validator = EventValidator()
     
+    def _validate_and_build(self, event_data: Dict[str, Any]) -> Tuple[ValidationResult, Optional[BaseCanonicalEvent]]:
+        """Validate an event, returning the canonical event built while validating
+        
+        The canonical event is constructed once and reused by the caller rather
+        than rebuilt after validation. Errors other than pydantic validation
+        failures propagate to the caller.
+        """
+        validation_result = self.validator.validate_fields(event_data)
+        if not validation_result.is_valid:
+            return validation_result, None
+        
+        try:
+            canonical_event = create_canonical_event(event_data)
+        except ValidationError as e:
+            validation_result.add_error(f"Pydantic validation failed: {str(e)}")
+            return validation_result, None
+        
+        self.validator.validate_event_specific_fields(canonical_event, validation_result)
+        return validation_result, canonical_event
+    
     def process_single_event(self, event_data: Dict[str, Any], 
                            source_system: str = None) -> ProcessingResult:
         """Process a single event"""
@@ -46,8 +75,8 @@ class EventProcessor:
                 event_data=event_data
             )
             
-            # Validate event
-            validation_result = self.validator.validate_single_event(event_data)
+            # Validate event and build its canonical form
+            validation_result, canonical_event = self._validate_and_build(event_data)
             self.audit_logger.log_event_validated(
                 event_id=event_id,
                 validation_result=validation_result.is_valid,
@@ -64,9 +93,6 @@ class EventProcessor:
                     processing_time_ms=processing_time_ms
                 )
             
-            # Create canonical event
-            canonical_event = create_canonical_event(event_data)
-            
             # Add received timestamp if not present
             if not canonical_event.received_timestamp:
                 canonical_event.received_timestamp = datetime.now(timezone.utc)
@@ -104,13 +130,22 @@ class EventProcessor:
                 processing_time_ms=processing_time_ms
             )
     
-    def process_batch(self, batch_data: List[Dict[str, Any]], 
-                      source_system: str = None) -> ProcessingResult:
-        """Process a batch of events"""
+    def process_batch(self, batch_data: Union[List[Dict[str, Any]], str, bytes], 
+                      source_system: str = None, retain_events: bool = True) -> ProcessingResult:
+        """Process a batch of events
+        
+        ``batch_data`` may also be a raw JSON array (``str``/``bytes``), which
+        is decoded once for the whole batch. With ``retain_events=False`` the
+        canonical events are only counted (``processed_count``) and released as
+        soon as they are validated, keeping memory flat for large batches.
+        """
         start_time = time.time()
         batch_id = self.audit_logger.generate_batch_id()
         
         try:
+            if isinstance(batch_data, (str, bytes)):
+                batch_data = json.loads(batch_data)
+            
             # Log batch receipt
             self.audit_logger.log_batch_received(
                 batch_id=batch_id,
@@ -118,12 +153,26 @@ class EventProcessor:
                 event_count=len(batch_data)
             )
             
-            # Validate batch
-            batch_validation, event_validations = self.validator.validate_batch(batch_data)
+            # Validate events, keeping the canonical events built along the way
+            event_outcomes = []
+            for event_data in batch_data:
+                try:
+                    event_result, canonical_event = self._validate_and_build(event_data)
+                    if not retain_events:
+                        canonical_event = None
+                    event_outcomes.append((event_result, canonical_event, None))
+                except Exception as e:
+                    event_outcomes.append((None, None, e))
+            
+            batch_validation = self.validator.validate_batch_structure(batch_data)
+            valid_count = sum(
+                1 for event_result, _, _ in event_outcomes
+                if event_result is not None and event_result.is_valid
+            )
             self.audit_logger.log_batch_validated(
                 batch_id=batch_id,
-                valid_count=len([ev for ev in event_validations if ev[1].is_valid]),
-                invalid_count=len([ev for ev in event_validations if not ev[1].is_valid])
+                valid_count=valid_count,
+                invalid_count=len(event_outcomes) - valid_count
             )
             
             # If batch validation failed, return early
@@ -140,42 +189,44 @@ class EventProcessor:
             
             # Process events
             processed_events = []
+            processed_count = 0
             validation_errors = []
             processing_errors = []
             
-            for i, event_data in enumerate(batch_data):
-                event_id = event_data.get("event_id", f"event_{i}")
+            for i, (event_result, canonical_event, error) in enumerate(event_outcomes):
+                event_id = batch_data[i].get("event_id", f"event_{i}")
+                
+                if error is not None:
+                    processing_errors.append({"event_id": event_id, "error": str(error)})
+                    self.audit_logger.log_processing_error(
+                        event_id=event_id,
+                        batch_id=batch_id,
+                        error=error,
+                        processing_time_ms=0
+                    )
+                    continue
                 
                 # Skip events that failed validation
-                if i < len(event_validations) and not event_validations[i][1].is_valid:
+                if not event_result.is_valid:
                     validation_errors.append({
                         "event_id": event_id,
-                        "errors": event_validations[i][1].errors,
-                        "warnings": event_validations[i][1].warnings
+                        "errors": event_result.errors,
+                        "warnings": event_result.warnings
                     })
                     continue
                 
-                try:
-                    # Create canonical event
-                    canonical_event = create_canonical_event(event_data)
-                    
-                    # Add received timestamp if not present
-                    if not canonical_event.received_timestamp:
-                        canonical_event.received_timestamp = datetime.now(timezone.utc)
-                    
-                    # Add batch context
-                    canonical_event.correlation_id = batch_id
-                    
-                    processed_events.append(canonical_event)
-                    
-                except Exception as e:
-                    processing_errors.append({"event_id": event_id, "error": str(e)})
-                    self.audit_logger.log_processing_error(
-                        event_id=event_id,
-                        batch_id=batch_id,
-                        error=e,
-                        processing_time_ms=0
-                    )
+                processed_count += 1
+                if canonical_event is None:
+                    continue
+                
+                # Add received timestamp if not present
+                if not canonical_event.received_timestamp:
+                    canonical_event.received_timestamp = datetime.now(timezone.utc)
+                
+                # Add batch context
+                canonical_event.correlation_id = batch_id
+                
+                processed_events.append(canonical_event)
             
             # Calculate processing time
             processing_time_ms = int((time.time() - start_time) * 1000)
@@ -184,7 +235,7 @@ class EventProcessor:
             self.audit_logger.log_batch_processed(
                 batch_id=batch_id,
                 processing_time_ms=processing_time_ms,
-                processed_count=len(processed_events)
+                processed_count=processed_count
             )
             
             # Determine success
@@ -196,7 +247,8 @@ class EventProcessor:
                 validation_errors=validation_errors,
                 processing_errors=processing_errors,
                 processing_time_ms=processing_time_ms,
-                batch_id=batch_id
+                batch_id=batch_id,
+                processed_count=processed_count
             )
             
         except Exception as e:
@@ -261,6 +313,20 @@ class EventEnricher:
         return [self.enrich_event(event) for event in events]
 
 
+# Category destination per event type, resolved once from the type prefixes
+_CATEGORY_DESTINATIONS: Dict[EventType, str] = {
+    event_type: destination
+    for event_type in EventType
+    for prefix, destination in (
+        ("refill_", "refill_processor"),
+        ("pa_", "pa_processor"),
+        ("oos_", "oos_processor"),
+        ("bundle_", "bundle_processor"),
+    )
+    if event_type.value.startswith(prefix)
+}
+
+
 class EventRouter:
     """Route events to appropriate downstream systems"""
     
@@ -281,14 +347,9 @@ class EventRouter:
             destinations.append(self.routes[event_type])
         
         # Category-based routing
-        if event_type.startswith("refill_"):
-            destinations.append("refill_processor")
-        elif event_type.startswith("pa_"):
-            destinations.append("pa_processor")
-        elif event_type.startswith("oos_"):
-            destinations.append("oos_processor")
-        elif event_type.startswith("bundle_"):
-            destinations.append("bundle_processor")
+        category_destination = _CATEGORY_DESTINATIONS.get(event.event_type)
+        if category_destination:
+            destinations.append(category_destination)
         
         # Default route
         if not destinations:
@@ -303,8 +364,6 @@ class EventRouter:
         for event in events:
             destinations = self.route_event(event)
             for destination in destinations:
-                if destination not in routed_events:
-                    routed_events[destination] = []
-                routed_events[destination].append(event)
+                routed_events.setdefault(destination, []).append(event)
         
         return routed_events
@@ -8,11 +8,17 @@ from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional, Set
 from dataclasses import dataclass, field
 from collections import defaultdict
+from itertools import chain
 
 from src.models.events import BaseCanonicalEvent, EventType
+from src.utils.compat import DATACLASS_SLOTS
 
 
-@dataclass
+_ONE_HOUR = timedelta(hours=1)
+_INACTIVITY_THRESHOLD = timedelta(hours=12)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class BundleContext:
     """Bundle context information"""
     bundle_id: Optional[str] = None
@@ -44,11 +50,11 @@ class BundleContext:
         """Check if bundle is complete"""
         return self.bundle_status == "completed"
     
-    def age_in_hours(self) -> float:
-        """Get bundle age in hours"""
+    def age_in_hours(self, now: Optional[datetime] = None) -> float:
+        """Get bundle age in hours, optionally relative to a caller-supplied ``now``"""
         if not self.formation_time:
             return 0.0
-        return (datetime.now(timezone.utc) - self.formation_time).total_seconds() / 3600
+        return ((now or datetime.now(timezone.utc)) - self.formation_time) / _ONE_HOUR
 
 
 class BundleDetector:
@@ -57,7 +63,8 @@ class BundleDetector:
     def __init__(self):
         self.active_bundles: Dict[str, BundleContext] = {}
         self.completed_bundles: Dict[str, BundleContext] = {}
-        self.bundle_relationships: Dict[str, List[str]] = defaultdict(list)  # member_id -> bundle_ids
+        # member_id -> bundle_ids, as an insertion-ordered dict for O(1) membership
+        self.bundle_relationships: Dict[str, Dict[str, None]] = defaultdict(dict)
     
     def detect_bundle_context(self, event: BaseCanonicalEvent) -> BundleContext:
         """Detect bundle context for an event"""
@@ -65,7 +72,7 @@ class BundleDetector:
         # If event has explicit bundle_id, use existing or create new
         if event.bundle_id:
             bundle_context = self._get_or_create_bundle(event.bundle_id)
-            bundle_context.add_event(event)
+            self._add_event_to_bundle(bundle_context, event)
             return bundle_context
         
         # Try to infer bundle context from timing and relationships
@@ -100,7 +107,7 @@ class BundleDetector:
             bundle_id = recent_bundles[0]
             bundle_context = self.active_bundles.get(bundle_id)
             if bundle_context:
-                bundle_context.add_event(event)
+                self._add_event_to_bundle(bundle_context, event)
                 return bundle_context
         
         # Look for timing-based bundle formation
@@ -110,15 +117,33 @@ class BundleDetector:
         
         return None
     
+    def _add_event_to_bundle(self, bundle_context: BundleContext, event: BaseCanonicalEvent) -> None:
+        """Add event to bundle and index the member -> bundle relationship"""
+        bundle_context.add_event(event)
+        self.bundle_relationships[event.member_id][bundle_context.bundle_id] = None
+    
+    def _unlink_bundle(self, bundle_context: BundleContext) -> None:
+        """Drop the bundle from its members' relationship entries, removing emptied ones"""
+        for member_id in bundle_context.member_ids:
+            member_bundles = self.bundle_relationships.get(member_id)
+            if member_bundles is None:
+                continue
+            member_bundles.pop(bundle_context.bundle_id, None)
+            if not member_bundles:
+                del self.bundle_relationships[member_id]
+    
     def _find_recent_member_bundles(self, member_id: str, timestamp: datetime, 
                                    hours_window: int = 24) -> List[str]:
         """Find recent bundles for a member"""
         recent_bundles = []
+        window = timedelta(hours=hours_window)
         
-        for bundle_id, bundle_context in self.active_bundles.items():
-            if (member_id in bundle_context.member_ids and 
+        # Only the member's own bundles need checking, via the relationship index
+        for bundle_id in self.bundle_relationships.get(member_id, ()):
+            bundle_context = self.active_bundles.get(bundle_id)
+            if (bundle_context and
                 bundle_context.last_activity and
-                abs((timestamp - bundle_context.last_activity).total_seconds()) < hours_window * 3600):
+                abs(timestamp - bundle_context.last_activity) < window):
                 recent_bundles.append(bundle_id)
         
         # Sort by last activity (most recent first)
@@ -142,7 +167,7 @@ class BundleDetector:
             best_bundle = min(candidate_events, 
                             key=lambda x: abs((event.event_timestamp - x[1].last_activity)))
             bundle_context = best_bundle[1]
-            bundle_context.add_event(event)
+            self._add_event_to_bundle(bundle_context, event)
             return bundle_context
         
         return None
@@ -155,12 +180,9 @@ class BundleDetector:
             bundle_type="individual",
             bundle_status="active"
         )
-        bundle_context.add_event(event)
+        self._add_event_to_bundle(bundle_context, event)
         self.active_bundles[bundle_id] = bundle_context
         
-        # Track member relationship
-        self.bundle_relationships[event.member_id].append(bundle_id)
-        
         return bundle_context
     
     def complete_bundle(self, bundle_id: str, completion_reason: str = "shipped") -> BundleContext:
@@ -168,6 +190,7 @@ class BundleDetector:
         if bundle_id in self.active_bundles:
             bundle_context = self.active_bundles.pop(bundle_id)
             bundle_context.bundle_status = completion_reason
+            self._unlink_bundle(bundle_context)
             self.completed_bundles[bundle_id] = bundle_context
             return bundle_context
         
@@ -181,9 +204,10 @@ class BundleDetector:
             return []
         
         risk_factors = []
+        now = datetime.now(timezone.utc)
         
         # Age-based risks
-        age_hours = bundle_context.age_in_hours()
+        age_hours = bundle_context.age_in_hours(now)
         if age_hours > 48:
             risk_factors.append("bundle_age_over_48h")
         elif age_hours > 24:
@@ -197,8 +221,7 @@ class BundleDetector:
         
         # Inactivity risks
         if bundle_context.last_activity:
-            inactive_hours = (datetime.now(timezone.utc) - bundle_context.last_activity).total_seconds() / 3600
-            if inactive_hours > 12:
+            if now - bundle_context.last_activity > _INACTIVITY_THRESHOLD:
                 risk_factors.append("bundle_inactive_over_12h")
         
         # Type-specific risks
@@ -219,20 +242,19 @@ class BundleDetector:
             "risk_distribution": defaultdict(int)
         }
         
-        # Calculate average bundle size
-        all_bundles = list(self.active_bundles.values()) + list(self.completed_bundles.values())
-        if all_bundles:
-            stats["average_bundle_size"] = sum(b.refill_count for b in all_bundles) / len(all_bundles)
-        
-        # Count bundle types
-        for bundle in all_bundles:
+        # Single sweep over all bundles for size, type and risk counts
+        bundle_count = 0
+        total_refills = 0
+        for bundle in chain(self.active_bundles.values(), self.completed_bundles.values()):
+            bundle_count += 1
+            total_refills += bundle.refill_count
             stats["bundle_types"][bundle.bundle_type] += 1
-        
-        # Count risk factors
-        for bundle in all_bundles:
             for risk in bundle.risk_factors:
                 stats["risk_distribution"][risk] += 1
         
+        if bundle_count:
+            stats["average_bundle_size"] = total_refills / bundle_count
+        
         return dict(stats)
     
     def find_related_events(self, event: BaseCanonicalEvent, max_events: int = 10) -> List[BaseCanonicalEvent]:
@@ -260,15 +282,14 @@ class BundleDetector:
     def cleanup_old_bundles(self, max_age_hours: int = 168) -> int:  # 1 week
         """Clean up old completed bundles"""
         cutoff_time = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
-        old_bundles = []
-        
-        for bundle_id, bundle_context in list(self.completed_bundles.items()):
-            if (bundle_context.last_activity and 
-                bundle_context.last_activity < cutoff_time):
-                old_bundles.append(bundle_id)
+        old_bundles = [
+            bundle_id for bundle_id, bundle_context in self.completed_bundles.items()
+            if bundle_context.last_activity and bundle_context.last_activity < cutoff_time
+        ]
         
         for bundle_id in old_bundles:
-            del self.completed_bundles[bundle_id]
+            # Events naming a completed bundle can relink it, so unlink again here
+            self._unlink_bundle(self.completed_bundles.pop(bundle_id))
         
         return len(old_bundles)
     
@@ -277,7 +298,9 @@ class BundleDetector:
         export_data = {
             "active_bundles": {},
             "completed_bundles": {},
-            "member_relationships": dict(self.bundle_relationships)
+            "member_relationships": {
+                member_id: list(bundle_ids) for member_id, bundle_ids in self.bundle_relationships.items()
+            }
         }
         
         for bundle_id, bundle_context in self.active_bundles.items():
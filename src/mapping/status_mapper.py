@@ -5,15 +5,58 @@ Deterministic mapping from source system statuses to bundle-aware canonical even
 """
 
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Callable, Set
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import json
 import re
 
 from src.models.events import (
     EventType, EventSource, RefillStatus, PAStatus, BaseCanonicalEvent,
     RefillEvent, PAEvent, OSEvent, BundleEvent
 )
+from src.utils.compat import DATACLASS_SLOTS
+
+
+# Regex rules of the form ".*LITERAL.*" reduce to a substring check
+_SUBSTRING_PATTERN = re.compile(r"\.\*([A-Za-z0-9_]+)\.\*")
+
+# Upper bound on memoized (source_system, source_status) candidate lookups
+_CANDIDATE_CACHE_SIZE = 4096
+
+
+def _condition_equals(actual_value: Any, value: Any) -> bool:
+    return actual_value == value
+
+
+def _condition_contains(actual_value: Any, value: Any) -> bool:
+    return value in str(actual_value)
+
+
+def _condition_greater_than(actual_value: Any, value: Any) -> bool:
+    return isinstance(actual_value, (int, float)) and actual_value > value
+
+
+def _condition_less_than(actual_value: Any, value: Any) -> bool:
+    return isinstance(actual_value, (int, float)) and actual_value < value
+
+
+def _condition_in(actual_value: Any, value: Any) -> bool:
+    return actual_value in value
+
+
+def _condition_present(actual_value: Any, value: Any) -> bool:
+    return True
+
+
+# Condition operator -> check; unknown operators only require the field to be present
+_CONDITION_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "equals": _condition_equals,
+    "contains": _condition_contains,
+    "greater_than": _condition_greater_than,
+    "less_than": _condition_less_than,
+    "in": _condition_in,
+}
 
 
 class MappingConfidence(str, Enum):
@@ -23,7 +66,15 @@ class MappingConfidence(str, Enum):
     LOW = "low"          # Ambiguous mapping requiring review
 
 
-@dataclass
+# Ordering used to pick the most confident of several matching rules
+_CONFIDENCE_RANK: Dict[MappingConfidence, int] = {
+    MappingConfidence.HIGH: 3,
+    MappingConfidence.MEDIUM: 2,
+    MappingConfidence.LOW: 1,
+}
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class MappingResult:
     """Result of status mapping operation"""
     success: bool
@@ -32,36 +83,61 @@ class MappingResult:
     confidence: MappingConfidence
     bundle_context: Optional[Dict[str, Any]] = None
     mapping_rules_applied: List[str] = None
-    warnings: List[str] = None
+    warnings: Tuple[str, ...] = ()
     requires_manual_review: bool = False
     
     def __post_init__(self):
         if self.mapping_rules_applied is None:
-            self.mapping_rules_applied = []
+            object.__setattr__(self, "mapping_rules_applied", [])
         if self.warnings is None:
-            self.warnings = []
+            object.__setattr__(self, "warnings", ())
 
 
+@dataclass(frozen=True, eq=False, **DATACLASS_SLOTS)
 class StatusMappingRule:
     """Individual status mapping rule"""
+    source_system: str
+    source_status: str
+    canonical_event_type: EventType
+    canonical_status: Optional[str]
+    confidence: MappingConfidence
+    description: str
+    conditions: Optional[Dict[str, Any]] = None
+    bundle_context: Optional[Dict[str, Any]] = None
+    _regex_match: Optional[Callable[[str], Optional[re.Match]]] = field(default=None, init=False, repr=False)
+    _status_key: Optional[str] = field(default=None, init=False, repr=False)
+    _substring: Optional[str] = field(default=None, init=False, repr=False)
+    _compiled_conditions: Tuple[Tuple[str, Callable[[Any, Any], bool], Any], ...] = field(
+        default=(), init=False, repr=False)
     
-    def __init__(self, 
-                 source_system: str,
-                 source_status: str,
-                 canonical_event_type: EventType,
-                 canonical_status: Optional[str],
-                 confidence: MappingConfidence,
-                 description: str,
-                 conditions: Optional[Dict[str, Any]] = None,
-                 bundle_context: Optional[Dict[str, Any]] = None):
-        self.source_system = source_system
-        self.source_status = source_status
-        self.canonical_event_type = canonical_event_type
-        self.canonical_status = canonical_status
-        self.confidence = confidence
-        self.description = description
-        self.conditions = conditions or {}
-        self.bundle_context = bundle_context or {}
+    def __post_init__(self):
+        object.__setattr__(self, "conditions", self.conditions or {})
+        object.__setattr__(self, "bundle_context", self.bundle_context or {})
+        
+        # Compile regex patterns once instead of on every match
+        if isinstance(self.source_status, str) and self.source_status.startswith("regex:"):
+            pattern = self.source_status[6:]  # Remove "regex:" prefix
+            # Bound match method of the compiled pattern, called directly by matches()
+            object.__setattr__(self, "_regex_match", re.compile(pattern, re.IGNORECASE).match)
+            literal = _SUBSTRING_PATTERN.fullmatch(pattern)
+            if literal:
+                object.__setattr__(self, "_substring", literal.group(1).casefold())
+        elif isinstance(self.source_status, str):
+            # Case-folded once so exact matching only folds the incoming status
+            object.__setattr__(self, "_status_key", self.source_status.casefold())
+        
+        # Resolve each condition to (field, check, value) once
+        compiled_conditions = []
+        for field_name, expected_value in self.conditions.items():
+            if isinstance(expected_value, dict):
+                # Complex condition with operator
+                operator = expected_value.get("operator", "equals")
+                check = _CONDITION_OPERATORS.get(operator, _condition_present)
+                compiled_conditions.append((field_name, check, expected_value.get("value")))
+            else:
+                # Simple equality check
+                compiled_conditions.append((field_name, _condition_equals, expected_value))
+        object.__setattr__(self, "_compiled_conditions", tuple(compiled_conditions))
     
     def matches(self, source_system: str, source_status: str, context: Dict[str, Any]) -> bool:
         """Check if this rule matches the given context"""
@@ -69,50 +145,22 @@ class StatusMappingRule:
             return False
         
         # Exact match or regex pattern
-        if isinstance(self.source_status, str):
-            if self.source_status.startswith("regex:"):
-                pattern = self.source_status[6:]  # Remove "regex:" prefix
-                return bool(re.match(pattern, source_status, re.IGNORECASE))
-            else:
-                return source_status.upper() == self.source_status.upper()
+        if self._substring is not None:
+            # "." does not match newlines, so only the first line can contain the literal
+            return self._substring in source_status.partition("\n")[0].casefold()
+        if self._regex_match is not None:
+            return self._regex_match(source_status) is not None
+        if self._status_key is not None:
+            return source_status.casefold() == self._status_key
         
         return False
     
     def evaluate_conditions(self, context: Dict[str, Any]) -> bool:
         """Evaluate conditional mapping rules"""
-        if not self.conditions:
-            return True
-        
-        for field, expected_value in self.conditions.items():
-            actual_value = context.get(field)
-            if actual_value is None:
+        for field_name, check, value in self._compiled_conditions:
+            actual_value = context.get(field_name)
+            if actual_value is None or not check(actual_value, value):
                 return False
-            
-            # Handle different condition types
-            if isinstance(expected_value, dict):
-                # Complex condition with operator
-                operator = expected_value.get("operator", "equals")
-                value = expected_value.get("value")
-                
-                if operator == "equals":
-                    if actual_value != value:
-                        return False
-                elif operator == "contains":
-                    if value not in str(actual_value):
-                        return False
-                elif operator == "greater_than":
-                    if not (isinstance(actual_value, (int, float)) and actual_value > value):
-                        return False
-                elif operator == "less_than":
-                    if not (isinstance(actual_value, (int, float)) and actual_value < value):
-                        return False
-                elif operator == "in":
-                    if actual_value not in value:
-                        return False
-            else:
-                # Simple equality check
-                if actual_value != expected_value:
-                    return False
         
         return True
 
@@ -121,8 +169,30 @@ class StatusMapper:
     """Deterministic status to bundle-event mapping"""
     
     def __init__(self):
-        self.rules: List[StatusMappingRule] = []
-        self._initialize_default_rules()
+        self._rules: List[StatusMappingRule] = []
+        # Default rules are loaded on first use rather than at construction
+        self._initialized = False
+        # Rules indexed for lookup, each paired with its position in self.rules
+        self._exact_index: Dict[Tuple[str, str], List[Tuple[int, StatusMappingRule]]] = {}
+        self._pattern_rules: Dict[str, List[Tuple[int, StatusMappingRule]]] = {}
+        self._candidate_cache: Dict[Tuple[str, str], Tuple[StatusMappingRule, ...]] = {}
+        self._rule_keys: Set[Tuple[Any, ...]] = set()
+        # Rule counts maintained by add_rule for get_mapping_statistics
+        self._rules_by_source: Dict[str, int] = {}
+        self._rules_by_confidence: Dict[str, int] = {"high": 0, "medium": 0, "low": 0}
+        self._rules_by_event_type: Dict[str, int] = {}
+    
+    @property
+    def rules(self) -> List[StatusMappingRule]:
+        """Mapping rules in the order they were added"""
+        self._ensure_initialized()
+        return self._rules
+    
+    def _ensure_initialized(self):
+        """Load the default rules the first time the mapper is used"""
+        if not self._initialized:
+            self._initialized = True
+            self._initialize_default_rules()
     
     def _initialize_default_rules(self):
         """Initialize default status mapping rules"""
@@ -348,9 +418,68 @@ class StatusMapper:
             description="Shipped status (regex pattern)"
         ))
     
-    def add_rule(self, rule: StatusMappingRule):
-        """Add a new mapping rule"""
-        self.rules.append(rule)
+    def add_rule(self, rule: StatusMappingRule, force: bool = False):
+        """Add a new mapping rule
+        
+        Rules identical to one already loaded (same source, target, confidence,
+        conditions and bundle context) are ignored unless ``force`` is set.
+        """
+        self._ensure_initialized()
+        rule_key = (
+            rule.source_system,
+            rule.source_status,
+            rule.canonical_event_type,
+            rule.canonical_status,
+            rule.confidence,
+            json.dumps(rule.conditions, sort_keys=True, default=str),
+            json.dumps(rule.bundle_context, sort_keys=True, default=str),
+        )
+        if rule_key in self._rule_keys and not force:
+            return
+        self._rule_keys.add(rule_key)
+        
+        entry = (len(self._rules), rule)
+        self._rules.append(rule)
+        self._candidate_cache.clear()
+        
+        if rule._regex_match is not None:
+            self._pattern_rules.setdefault(rule.source_system, []).append(entry)
+        elif rule._status_key is not None:
+            key = (rule.source_system, rule._status_key)
+            self._exact_index.setdefault(key, []).append(entry)
+        
+        source = rule.source_system
+        self._rules_by_source[source] = self._rules_by_source.get(source, 0) + 1
+        self._rules_by_confidence[rule.confidence.value] += 1
+        event_type = rule.canonical_event_type.value
+        self._rules_by_event_type[event_type] = self._rules_by_event_type.get(event_type, 0) + 1
+    
+    def _find_candidate_rules(self, source_system: str, source_status: str,
+                              context: Dict[str, Any]) -> Tuple[StatusMappingRule, ...]:
+        """Find rules whose source system and status match, in rule order
+        
+        Matching does not depend on context, so lookups are memoized per
+        (source_system, source_status) until the rule set changes.
+        """
+        cache_key = (source_system, source_status)
+        cached = self._candidate_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        self._ensure_initialized()
+        candidates = list(self._exact_index.get((source_system, source_status.casefold()), ()))
+        pattern_matches = [
+            entry for entry in self._pattern_rules.get(source_system, ())
+            if entry[1].matches(source_system, source_status, context)
+        ]
+        if pattern_matches:
+            candidates.extend(pattern_matches)
+            candidates.sort(key=lambda entry: entry[0])
+        
+        if len(self._candidate_cache) >= _CANDIDATE_CACHE_SIZE:
+            self._candidate_cache.clear()
+        result = self._candidate_cache[cache_key] = tuple(rule for _, rule in candidates)
+        return result
     
     def map_status(self, 
                    source_system: str,
@@ -360,11 +489,10 @@ class StatusMapper:
         context = context or {}
         
         # Find matching rules
-        matching_rules = []
-        for rule in self.rules:
-            if rule.matches(source_system, source_status, context):
-                if rule.evaluate_conditions(context):
-                    matching_rules.append(rule)
+        matching_rules = [
+            rule for rule in self._find_candidate_rules(source_system, source_status, context)
+            if not rule._compiled_conditions or rule.evaluate_conditions(context)
+        ]
         
         if not matching_rules:
             return MappingResult(
@@ -372,71 +500,67 @@ class StatusMapper:
                 canonical_event_type=EventType.REFILL_INITIATED,  # Default
                 canonical_status=RefillStatus.PENDING,
                 confidence=MappingConfidence.LOW,
-                warnings=[f"No mapping rule found for {source_system}:{source_status}"],
+                warnings=(f"No mapping rule found for {source_system}:{source_status}",),
                 requires_manual_review=True
             )
         
         # Select best rule (highest confidence)
-        best_rule = max(matching_rules, key=lambda r: (
-            0 if r.confidence == MappingConfidence.HIGH else
-            1 if r.confidence == MappingConfidence.MEDIUM else 2
-        ))
+        best_rule = max(matching_rules, key=lambda r: _CONFIDENCE_RANK[r.confidence])
         
         # Check for multiple high-confidence matches (ambiguity)
         high_confidence_matches = [r for r in matching_rules if r.confidence == MappingConfidence.HIGH]
-        warnings = []
+        warnings = ()
         requires_review = False
         
         if len(high_confidence_matches) > 1:
-            warnings.append(f"Multiple high-confidence matches found for {source_system}:{source_status}")
+            warnings = (f"Multiple high-confidence matches found for {source_system}:{source_status}",)
             requires_review = True
         
         # Build bundle context
-        bundle_context = best_rule.bundle_context.copy() if best_rule.bundle_context else {}
+        has_bundle_id = bool(context.get("bundle_id"))
+        is_multi_member = context.get("bundle_member_count", 0) > 1
         
-        # Add context-based bundle information
-        if context.get("bundle_id"):
-            bundle_context["has_bundle_id"] = True
-        if context.get("bundle_member_count", 0) > 1:
-            bundle_context["is_multi_member"] = True
+        if has_bundle_id or is_multi_member:
+            bundle_context = dict(best_rule.bundle_context)
+            
+            # Add context-based bundle information
+            if has_bundle_id:
+                bundle_context["has_bundle_id"] = True
+            if is_multi_member:
+                bundle_context["is_multi_member"] = True
+        else:
+            bundle_context = dict(best_rule.bundle_context) if best_rule.bundle_context else None
         
         return MappingResult(
             success=True,
             canonical_event_type=best_rule.canonical_event_type,
             canonical_status=best_rule.canonical_status,
             confidence=best_rule.confidence,
-            bundle_context=bundle_context if bundle_context else None,
+            bundle_context=bundle_context,
             mapping_rules_applied=[best_rule.description],
             warnings=warnings,
             requires_manual_review=requires_review
         )
     
+    def map_status_batch(self,
+                         records: List[Tuple[Any, ...]]) -> List[MappingResult]:
+        """Map a batch of (source_system, source_status[, context]) records
+        
+        Results are returned in input order. Candidate rule lookups are
+        memoized, so statuses repeated across the batch are matched once.
+        """
+        map_status = self.map_status
+        return [map_status(*record) for record in records]
+    
     def get_mapping_statistics(self) -> Dict[str, Any]:
         """Get mapping rule statistics"""
-        stats = {
+        self._ensure_initialized()
+        return {
             "total_rules": len(self.rules),
-            "rules_by_source": {},
-            "rules_by_confidence": {
-                "high": 0,
-                "medium": 0,
-                "low": 0
-            },
-            "rules_by_event_type": {}
+            "rules_by_source": dict(self._rules_by_source),
+            "rules_by_confidence": dict(self._rules_by_confidence),
+            "rules_by_event_type": dict(self._rules_by_event_type)
         }
-        
-        for rule in self.rules:
-            # Count by source system
-            source = rule.source_system
-            stats["rules_by_source"][source] = stats["rules_by_source"].get(source, 0) + 1
-            
-            # Count by confidence
-            stats["rules_by_confidence"][rule.confidence.value] += 1
-            
-            # Count by event type
-            event_type = rule.canonical_event_type.value
-            stats["rules_by_event_type"][event_type] = stats["rules_by_event_type"].get(event_type, 0) + 1
-        
-        return stats
     
     def validate_mapping_consistency(self) -> List[str]:
         """Validate mapping rule consistency"""
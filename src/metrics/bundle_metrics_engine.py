@@ -12,11 +12,12 @@ The engine is designed to be:
 - Explainable (clear metric definitions and calculations)
 """
 
+import heapq
 import time
+from bisect import bisect_left, bisect_right, insort
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 from collections import defaultdict
-import statistics
 
 from ..models.snapshots import RefillSnapshot, SnapshotStage, PAState, BundleTimingState
 from ..models.metrics import (
@@ -34,8 +35,11 @@ class BundleMetricsEngine:
         """Initialize bundle metrics engine"""
         self.audit_logger = audit_logger or AuditLogger()
         self._metrics_cache: Dict[str, BundleMetrics] = {}
-        self._member_metrics_index: Dict[str, List[str]] = defaultdict(list)
-        self._bundle_metrics_index: Dict[str, List[str]] = defaultdict(list)
+        # member/bundle ID -> snapshot IDs, as insertion-ordered sets
+        self._member_metrics_index: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._bundle_metrics_index: Dict[str, Dict[str, None]] = defaultdict(dict)
+        # (overall_risk_score, snapshot ID) pairs kept sorted for range queries
+        self._risk_score_index: List[Tuple[float, str]] = []
         
         # Metric computation thresholds and parameters
         self._stage_age_thresholds = {
@@ -56,17 +60,29 @@ class BundleMetricsEngine:
             "critical": 0.9
         }
     
+    def reset(self) -> None:
+        """Clear cached metrics, their indexes and the audit trail (for testing only)"""
+        self._metrics_cache.clear()
+        self._member_metrics_index.clear()
+        self._bundle_metrics_index.clear()
+        self._risk_score_index.clear()
+        self.audit_logger.clear_audit_trail()
+    
     def compute_metrics(self, snapshot: RefillSnapshot, bundle_snapshots: Optional[List[RefillSnapshot]] = None) -> BundleMetrics:
         """Compute comprehensive bundle metrics for a snapshot"""
-        start_time = time.time()
-        
         # Get bundle context if available
         bundle_context = self._get_bundle_context(snapshot, bundle_snapshots)
+        return self._compute_metrics(snapshot, bundle_context)
+    
+    def _compute_metrics(self, snapshot: RefillSnapshot, bundle_context: Dict[str, Any]) -> BundleMetrics:
+        """Compute, cache and audit metrics for a snapshot with a prepared bundle context"""
+        start_time = time.perf_counter()
+        now = datetime.now(timezone.utc)
         
         # Compute individual metric groups
         age_metrics = self._compute_age_in_stage_metrics(snapshot)
         timing_metrics = self._compute_timing_overlap_metrics(snapshot, bundle_context)
-        gap_metrics = self._compute_refill_gap_metrics(snapshot)
+        gap_metrics = self._compute_refill_gap_metrics(snapshot, now)
         alignment_metrics = self._compute_bundle_alignment_metrics(snapshot, bundle_context)
         
         # Compute overall risk assessment
@@ -84,7 +100,7 @@ class BundleMetricsEngine:
             snapshot_id=snapshot.snapshot_id,
             member_id=snapshot.member_id,
             refill_id=snapshot.refill_id,
-            computed_timestamp=datetime.now(timezone.utc),
+            computed_timestamp=now,
             age_in_stage=age_metrics,
             timing_overlap=timing_metrics,
             refill_gap=gap_metrics,
@@ -94,14 +110,18 @@ class BundleMetricsEngine:
             primary_risk_factors=risk_factors,
             requires_attention=risk_severity in [MetricSeverity.HIGH, MetricSeverity.CRITICAL],
             recommended_actions=recommendations,
-            computation_time_ms=int((time.time() - start_time) * 1000)
+            computation_time_ms=int((time.perf_counter() - start_time) * 1000)
         )
         
         # Cache metrics
+        previous = self._metrics_cache.get(metrics.snapshot_id)
+        if previous is not None:
+            self._remove_risk_score_entry(previous)
         self._metrics_cache[metrics.snapshot_id] = metrics
-        self._member_metrics_index[metrics.member_id].append(metrics.snapshot_id)
+        insort(self._risk_score_index, (metrics.overall_risk_score, metrics.snapshot_id))
+        self._member_metrics_index[metrics.member_id][metrics.snapshot_id] = None
         if snapshot.bundle_id:
-            self._bundle_metrics_index[snapshot.bundle_id].append(metrics.snapshot_id)
+            self._bundle_metrics_index[snapshot.bundle_id][metrics.snapshot_id] = None
         
         # Log computation
         self.audit_logger.log_metrics_computed(
@@ -116,21 +136,27 @@ class BundleMetricsEngine:
     
     def compute_batch_metrics(self, snapshots: List[RefillSnapshot]) -> List[BundleMetrics]:
         """Compute metrics for multiple snapshots"""
-        metrics_list = []
-        
         # Group snapshots by bundle for context
         bundle_groups = defaultdict(list)
         for snapshot in snapshots:
             if snapshot.bundle_id:
                 bundle_groups[snapshot.bundle_id].append(snapshot)
         
-        # Compute metrics for each snapshot
-        for snapshot in snapshots:
-            bundle_snapshots = bundle_groups.get(snapshot.bundle_id, [])
-            metrics = self.compute_metrics(snapshot, bundle_snapshots)
-            metrics_list.append(metrics)
+        # Build each bundle's context once and share it across its snapshots
+        bundle_contexts = {
+            bundle_id: self._build_bundle_context(group)
+            for bundle_id, group in bundle_groups.items()
+        }
         
-        return metrics_list
+        # Compute metrics for each snapshot
+        return [
+            self._compute_metrics(
+                snapshot,
+                bundle_contexts[snapshot.bundle_id] if snapshot.bundle_id
+                else self._get_bundle_context(snapshot, None)
+            )
+            for snapshot in snapshots
+        ]
     
     def get_metrics(self, snapshot_id: str) -> Optional[BundleMetrics]:
         """Retrieve computed metrics by snapshot ID"""
@@ -138,18 +164,23 @@ class BundleMetricsEngine:
     
     def query_metrics(self, query: MetricsQuery) -> MetricsList:
         """Query metrics based on criteria"""
-        all_metrics = list(self._metrics_cache.values())
+        candidate_metrics = self._indexed_candidates(query)
         
         # Apply filters
-        filtered_metrics = self._apply_filters(all_metrics, query)
-        
-        # Sort results
-        sorted_metrics = self._sort_metrics(filtered_metrics, query.sort_by, query.sort_order)
+        filtered_metrics = self._apply_filters(candidate_metrics, query)
         
-        # Paginate
-        total_count = len(sorted_metrics)
+        # Sort and paginate, selecting only up to the requested page when it
+        # ends before the last result
+        total_count = len(filtered_metrics)
         start_idx = query.offset
         end_idx = start_idx + query.limit
+        sort_key = self._metrics_sort_key(query.sort_by)
+        reverse = query.sort_order.lower() == "desc"
+        if end_idx < total_count:
+            select = heapq.nlargest if reverse else heapq.nsmallest
+            sorted_metrics = select(end_idx, filtered_metrics, key=sort_key)
+        else:
+            sorted_metrics = sorted(filtered_metrics, key=sort_key, reverse=reverse)
         paginated_metrics = sorted_metrics[start_idx:end_idx]
         
         # Generate summary
@@ -164,25 +195,66 @@ class BundleMetricsEngine:
             summary=summary
         )
     
+    def _indexed_candidates(self, query: MetricsQuery) -> List[BundleMetrics]:
+        """Narrow the cached metrics to a query's member/bundle using the indexes
+        
+        Candidates are still passed through the full filters, so an index entry
+        left behind by a recomputed snapshot cannot leak into results.
+        """
+        indexes = []
+        if query.member_id:
+            indexes.append(self._member_metrics_index.get(query.member_id, {}))
+        if query.bundle_id:
+            indexes.append(self._bundle_metrics_index.get(query.bundle_id, {}))
+        
+        if not indexes:
+            if query.min_risk_score is not None or query.max_risk_score is not None:
+                return self._risk_score_candidates(query.min_risk_score, query.max_risk_score)
+            return list(self._metrics_cache.values())
+        
+        # Index entries are kept in computation order, matching the cache
+        snapshot_ids = min(indexes, key=len)
+        return [
+            self._metrics_cache[snapshot_id] for snapshot_id in snapshot_ids
+            if snapshot_id in self._metrics_cache
+        ]
+    
+    def _risk_score_candidates(self, min_risk_score: Optional[float],
+                               max_risk_score: Optional[float]) -> List[BundleMetrics]:
+        """Slice the cached metrics within a risk score range, in ascending score order"""
+        index = self._risk_score_index
+        lo = 0 if min_risk_score is None else bisect_left(index, (min_risk_score,))
+        hi = len(index) if max_risk_score is None else bisect_right(index, (max_risk_score, chr(0x10FFFF)))
+        return [self._metrics_cache[snapshot_id] for _, snapshot_id in index[lo:hi]]
+    
+    def _remove_risk_score_entry(self, metrics: BundleMetrics) -> None:
+        """Drop a cached metrics entry from the sorted risk score index"""
+        entry = (metrics.overall_risk_score, metrics.snapshot_id)
+        position = bisect_left(self._risk_score_index, entry)
+        if position < len(self._risk_score_index) and self._risk_score_index[position] == entry:
+            del self._risk_score_index[position]
+    
     def get_member_metrics(self, member_id: str, limit: int = 100) -> List[BundleMetrics]:
         """Get all metrics for a member"""
-        metric_ids = self._member_metrics_index.get(member_id, [])
-        metrics = [self._metrics_cache[mid] for mid in metric_ids if mid in self._metrics_cache]
-        
-        # Sort by computation timestamp descending
-        metrics.sort(key=lambda m: m.computed_timestamp, reverse=True)
+        metric_ids = self._member_metrics_index.get(member_id, ())
         
-        return metrics[:limit]
+        # Newest first by computation timestamp
+        return heapq.nlargest(
+            limit,
+            (self._metrics_cache[mid] for mid in metric_ids if mid in self._metrics_cache),
+            key=lambda m: m.computed_timestamp
+        )
     
     def get_bundle_metrics(self, bundle_id: str, limit: int = 100) -> List[BundleMetrics]:
         """Get all metrics for a bundle"""
-        metric_ids = self._bundle_metrics_index.get(bundle_id, [])
-        metrics = [self._metrics_cache[mid] for mid in metric_ids if mid in self._metrics_cache]
+        metric_ids = self._bundle_metrics_index.get(bundle_id, ())
         
-        # Sort by computation timestamp descending
-        metrics.sort(key=lambda m: m.computed_timestamp, reverse=True)
-        
-        return metrics[:limit]
+        # Newest first by computation timestamp
+        return heapq.nlargest(
+            limit,
+            (self._metrics_cache[mid] for mid in metric_ids if mid in self._metrics_cache),
+            key=lambda m: m.computed_timestamp
+        )
     
     def _compute_age_in_stage_metrics(self, snapshot: RefillSnapshot) -> AgeInStageMetrics:
         """Compute age-in-stage metrics"""
@@ -274,12 +346,20 @@ class BundleMetricsEngine:
             )
         
         # Calculate timing variance
-        timing_gaps = []
-        for i in range(len(refill_due_dates) - 1):
-            gap = abs((refill_due_dates[i+1] - refill_due_dates[i]).days)
-            timing_gaps.append(gap)
-        
-        timing_variance = statistics.variance(timing_gaps) if len(timing_gaps) > 1 else 0
+        timing_gaps = [
+            abs((later - earlier).days)
+            for earlier, later in zip(refill_due_dates, refill_due_dates[1:])
+        ]
+        
+        # Sample variance of the integer gaps, kept in exact integer arithmetic
+        # until the final division (same result as statistics.variance)
+        gap_count = len(timing_gaps)
+        if gap_count > 1:
+            gap_total = sum(timing_gaps)
+            gap_squares = sum(gap * gap for gap in timing_gaps)
+            timing_variance = (gap_count * gap_squares - gap_total * gap_total) / (gap_count * (gap_count - 1))
+        else:
+            timing_variance = 0
         max_gap = max(timing_gaps) if timing_gaps else 0
         
         # Compute overlap score (inverse of variance)
@@ -305,8 +385,9 @@ class BundleMetricsEngine:
             shipment_split_probability=shipment_split_probability
         )
     
-    def _compute_refill_gap_metrics(self, snapshot: RefillSnapshot) -> RefillGapMetrics:
-        """Compute refill gap metrics"""
+    def _compute_refill_gap_metrics(self, snapshot: RefillSnapshot,
+                                    now: Optional[datetime] = None) -> RefillGapMetrics:
+        """Compute refill gap metrics, optionally relative to a caller-supplied ``now``"""
         days_since_last_fill = snapshot.days_since_last_fill or 0
         days_until_due = snapshot.days_until_due or 0
         
@@ -343,7 +424,8 @@ class BundleMetricsEngine:
         supply_buffer_days = None
         
         if snapshot.days_supply and snapshot.last_fill_date:
-            days_consumed = (datetime.now(timezone.utc).date() - snapshot.last_fill_date.date()).days
+            today = (now or datetime.now(timezone.utc)).date()
+            days_consumed = (today - snapshot.last_fill_date.date()).days
             days_supply_remaining = max(0, snapshot.days_supply - days_consumed)
             supply_buffer_days = days_supply_remaining - days_until_due
         
@@ -497,6 +579,10 @@ class BundleMetricsEngine:
         if bundle_snapshots is None:
             bundle_snapshots = []
         
+        return self._build_bundle_context(bundle_snapshots)
+    
+    def _build_bundle_context(self, bundle_snapshots: List[RefillSnapshot]) -> Dict[str, Any]:
+        """Build the bundle context shared by all snapshots of a bundle"""
         return {
             "bundle_size": len(bundle_snapshots),
             "bundle_member_count": len(set(s.member_id for s in bundle_snapshots)),
@@ -512,49 +598,64 @@ class BundleMetricsEngine:
         return min(1.0, days_in_stage / (threshold * 2))
     
     def _apply_filters(self, metrics: List[BundleMetrics], query: MetricsQuery) -> List[BundleMetrics]:
-        """Apply query filters to metrics"""
-        filtered = metrics
+        """Apply query filters to metrics in a single pass"""
+        predicates = self._build_query_predicates(query)
+        if not predicates:
+            return list(metrics)
         
-        if query.member_id:
-            filtered = [m for m in filtered if m.member_id == query.member_id]
+        return [m for m in metrics if all(predicate(m) for predicate in predicates)]
+    
+    def _build_query_predicates(self, query: MetricsQuery) -> List[Callable[[BundleMetrics], bool]]:
+        """Build one predicate per filter set on the query
         
-        if query.refill_id:
-            filtered = [m for m in filtered if m.refill_id == query.refill_id]
+        The query fields are checked once here rather than for every metric.
+        """
+        predicates: List[Callable[[BundleMetrics], bool]] = []
         
-        if query.bundle_id:
-            filtered = [m for m in filtered if m.bundle_alignment.bundle_id == query.bundle_id]
+        member_id = query.member_id
+        if member_id:
+            predicates.append(lambda m: m.member_id == member_id)
+        
+        refill_id = query.refill_id
+        if refill_id:
+            predicates.append(lambda m: m.refill_id == refill_id)
+        
+        bundle_id = query.bundle_id
+        if bundle_id:
+            predicates.append(lambda m: m.bundle_alignment.bundle_id == bundle_id)
         
-        if query.min_risk_score is not None:
-            filtered = [m for m in filtered if m.overall_risk_score >= query.min_risk_score]
+        min_risk_score = query.min_risk_score
+        if min_risk_score is not None:
+            predicates.append(lambda m: m.overall_risk_score >= min_risk_score)
         
-        if query.max_risk_score is not None:
-            filtered = [m for m in filtered if m.overall_risk_score <= query.max_risk_score]
+        max_risk_score = query.max_risk_score
+        if max_risk_score is not None:
+            predicates.append(lambda m: m.overall_risk_score <= max_risk_score)
         
-        if query.risk_severity:
-            filtered = [m for m in filtered if m.risk_severity == query.risk_severity]
+        risk_severity = query.risk_severity
+        if risk_severity:
+            predicates.append(lambda m: m.risk_severity == risk_severity)
         
-        if query.computed_timestamp_from:
-            filtered = [m for m in filtered if m.computed_timestamp >= query.computed_timestamp_from]
+        timestamp_from = query.computed_timestamp_from
+        if timestamp_from:
+            predicates.append(lambda m: m.computed_timestamp >= timestamp_from)
         
-        if query.computed_timestamp_to:
-            filtered = [m for m in filtered if m.computed_timestamp <= query.computed_timestamp_to]
+        timestamp_to = query.computed_timestamp_to
+        if timestamp_to:
+            predicates.append(lambda m: m.computed_timestamp <= timestamp_to)
         
-        return filtered
+        return predicates
     
-    def _sort_metrics(self, metrics: List[BundleMetrics], sort_by: str, sort_order: str) -> List[BundleMetrics]:
-        """Sort metrics by specified field"""
-        reverse = sort_order.lower() == "desc"
-        
-        if sort_by == "computed_timestamp":
-            return sorted(metrics, key=lambda m: m.computed_timestamp, reverse=reverse)
-        elif sort_by == "overall_risk_score":
-            return sorted(metrics, key=lambda m: m.overall_risk_score, reverse=reverse)
+    def _metrics_sort_key(self, sort_by: str) -> Callable[[BundleMetrics], Any]:
+        """Get the sort key for a query's sort field"""
+        if sort_by == "overall_risk_score":
+            return lambda m: m.overall_risk_score
         elif sort_by == "risk_severity":
             severity_order = [MetricSeverity.LOW, MetricSeverity.MEDIUM, MetricSeverity.HIGH, MetricSeverity.CRITICAL]
-            return sorted(metrics, key=lambda m: severity_order.index(m.risk_severity), reverse=reverse)
+            return lambda m: severity_order.index(m.risk_severity)
         else:
             # Default sort by computed timestamp
-            return sorted(metrics, key=lambda m: m.computed_timestamp, reverse=reverse)
+            return lambda m: m.computed_timestamp
     
     def _generate_summary(self, metrics: List[BundleMetrics]) -> BundleMetricsSummary:
         """Generate summary statistics for metrics"""
@@ -571,29 +672,41 @@ class BundleMetricsEngine:
                 computation_time_ms=0
             )
         
-        # Calculate aggregates
-        total_snapshots = len(metrics)
-        avg_risk_score = sum(m.overall_risk_score for m in metrics) / total_snapshots
-        high_risk_count = sum(1 for m in metrics if m.risk_severity == MetricSeverity.HIGH)
-        critical_risk_count = sum(1 for m in metrics if m.risk_severity == MetricSeverity.CRITICAL)
-        
-        # Stage distribution
+        # Calculate aggregates in a single pass
+        total_risk_score = 0.0
+        total_bundle_health = 0.0
+        total_computation_ms = 0
+        high_risk_count = 0
+        critical_risk_count = 0
         stage_dist = defaultdict(int)
+        bundle_ids = set()
+        
         for m in metrics:
+            total_risk_score += m.overall_risk_score
+            total_bundle_health += m.bundle_alignment.bundle_health_score
+            total_computation_ms += m.computation_time_ms
+            
+            if m.risk_severity == MetricSeverity.HIGH:
+                high_risk_count += 1
+            elif m.risk_severity == MetricSeverity.CRITICAL:
+                critical_risk_count += 1
+            
+            # Stage distribution
             stage_dist[m.age_in_stage.current_stage] += 1
+            
+            if m.bundle_alignment.bundle_id:
+                bundle_ids.add(m.bundle_alignment.bundle_id)
         
-        # Bundle health
-        avg_bundle_health = sum(m.bundle_alignment.bundle_health_score for m in metrics) / total_snapshots
-        total_bundles = len(set(m.bundle_alignment.bundle_id for m in metrics if m.bundle_alignment.bundle_id))
+        total_snapshots = len(metrics)
         
         return BundleMetricsSummary(
             computed_timestamp=datetime.now(timezone.utc),
             total_snapshots=total_snapshots,
-            avg_risk_score=avg_risk_score,
+            avg_risk_score=total_risk_score / total_snapshots,
             high_risk_count=high_risk_count,
             critical_risk_count=critical_risk_count,
             stage_distribution=dict(stage_dist),
-            avg_bundle_health=avg_bundle_health,
-            total_bundles=total_bundles,
-            computation_time_ms=sum(m.computation_time_ms for m in metrics)
+            avg_bundle_health=total_bundle_health / total_snapshots,
+            total_bundles=len(bundle_ids),
+            computation_time_ms=total_computation_ms
         )
@@ -14,7 +14,8 @@ from .events import (
     PAEvent,
     OSEvent,
     BundleEvent,
-    create_canonical_event
+    create_canonical_event,
+    create_canonical_events_batch
 )
 
 from .explainability import (
@@ -51,6 +52,7 @@ __all__ = [
     "OSEvent",
     "BundleEvent",
     "create_canonical_event",
+    "create_canonical_events_batch",
     "BundleRiskExplanation",
     "Evidence",
     "EvidenceType",
@@ -9,10 +9,11 @@ and bundle-relevant lifecycle events. All events are designed to be:
 - Bundle-aware
 """
 
+import sys
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field, validator
+from typing import Optional, Dict, Any, List, Iterable
+from pydantic import BaseModel, Field, TypeAdapter, validator
 
 
 class EventType(str, Enum):
@@ -69,6 +70,11 @@ class PAStatus(str, Enum):
     IN_REVIEW = "in_review"
 
 
+def _intern_label(v):
+    """Intern low-cardinality label strings so events share one copy of each value"""
+    return sys.intern(v) if isinstance(v, str) else v
+
+
 class BaseCanonicalEvent(BaseModel):
     """Base class for all canonical events"""
     
@@ -99,6 +105,10 @@ class BaseCanonicalEvent(BaseModel):
     causation_id: Optional[str] = Field(None, description="Causation ID for event chain")
     version: str = Field("1.0", description="Event schema version")
     
+    class Config:
+        # Build validators on first use rather than at import; subclasses inherit this
+        defer_build = True
+    
     @validator('event_timestamp', 'received_timestamp', 'source_timestamp')
     def validate_utc_timestamps(cls, v):
         """Ensure timestamps are in UTC"""
@@ -156,6 +166,8 @@ class PAEvent(BaseCanonicalEvent):
     pa_reason_code: Optional[str] = Field(None, description="PA reason/diagnosis code")
     pa_outcome: Optional[str] = Field(None, description="PA outcome details")
     source_pa_id: Optional[str] = Field(None, description="Original PA ID")
+    
+    _intern_labels = validator('pa_type', pre=True, allow_reuse=True)(_intern_label)
 
 
 class OSEvent(BaseCanonicalEvent):
@@ -175,6 +187,8 @@ class OSEvent(BaseCanonicalEvent):
     affected_quantity: Optional[float] = Field(None, description="Quantity affected")
     alternative_available: Optional[bool] = Field(None, description="Alternative available")
     source_oos_id: Optional[str] = Field(None, description="Original OOS ID")
+    
+    _intern_labels = validator('oos_reason', pre=True, allow_reuse=True)(_intern_label)
 
 
 class BundleEvent(BaseCanonicalEvent):
@@ -195,18 +209,54 @@ class BundleEvent(BaseCanonicalEvent):
     bundle_efficiency_score: Optional[float] = Field(None, description="Bundle efficiency (0-1)")
     bundle_complexity_score: Optional[float] = Field(None, description="Bundle complexity (0-1)")
     split_risk_score: Optional[float] = Field(None, description="Bundle split risk (0-1)")
+    
+    _intern_labels = validator('bundle_type', 'bundle_strategy', pre=True, allow_reuse=True)(_intern_label)
+
+
+# Event type -> canonical event class. Lookups by raw string values also
+# match, since str-mixin enum members hash and compare equal to their values.
+_EVENT_CLASS_BY_TYPE: Dict[Any, type] = {}
+for _event_types, _event_class in (
+    ((EventType.PA_SUBMITTED, EventType.PA_APPROVED, EventType.PA_DENIED, EventType.PA_EXPIRED), PAEvent),
+    ((EventType.OOS_DETECTED, EventType.OOS_RESOLVED), OSEvent),
+    ((EventType.BUNDLE_FORMED, EventType.BUNDLE_SPLIT, EventType.BUNDLE_SHIPPED), BundleEvent),
+):
+    for _event_type in _event_types:
+        _EVENT_CLASS_BY_TYPE[_event_type] = _event_class
+del _event_types, _event_class, _event_type
 
 
 # Event factory for creating appropriate event types
 def create_canonical_event(event_data: Dict[str, Any]) -> BaseCanonicalEvent:
     """Factory function to create appropriate canonical event type"""
-    event_type = event_data.get("event_type")
-    
-    if event_type in [EventType.PA_SUBMITTED, EventType.PA_APPROVED, EventType.PA_DENIED, EventType.PA_EXPIRED]:
-        return PAEvent(**event_data)
-    elif event_type in [EventType.OOS_DETECTED, EventType.OOS_RESOLVED]:
-        return OSEvent(**event_data)
-    elif event_type in [EventType.BUNDLE_FORMED, EventType.BUNDLE_SPLIT, EventType.BUNDLE_SHIPPED]:
-        return BundleEvent(**event_data)
-    else:
-        return RefillEvent(**event_data)
+    event_class = _EVENT_CLASS_BY_TYPE.get(event_data.get("event_type"), RefillEvent)
+    # Validate the mapping directly with the class's prebuilt validator
+    return event_class.model_validate(event_data)
+
+
+# Event class -> list validator, built on first batch so import stays cheap
+_BATCH_ADAPTERS: Dict[type, TypeAdapter] = {}
+
+
+def create_canonical_events_batch(rows: Iterable[Dict[str, Any]]) -> List[BaseCanonicalEvent]:
+    """Create canonical events for many rows, validating each event class's rows in one call
+    
+    Events are returned in input order. An invalid row fails the whole batch;
+    error locations index into that row's event-class group, not the input.
+    Use create_canonical_event when rows must succeed or fail independently.
+    """
+    groups: Dict[type, List[int]] = {}
+    group_rows: Dict[type, List[Dict[str, Any]]] = {}
+    for index, row in enumerate(rows):
+        event_class = _EVENT_CLASS_BY_TYPE.get(row.get("event_type"), RefillEvent)
+        groups.setdefault(event_class, []).append(index)
+        group_rows.setdefault(event_class, []).append(row)
+    
+    events: List[Optional[BaseCanonicalEvent]] = [None] * sum(map(len, groups.values()))
+    for event_class, indexes in groups.items():
+        adapter = _BATCH_ADAPTERS.get(event_class)
+        if adapter is None:
+            adapter = _BATCH_ADAPTERS[event_class] = TypeAdapter(List[event_class])
+        for index, event in zip(indexes, adapter.validate_python(group_rows[event_class])):
+            events[index] = event
+    return events
@@ -300,6 +300,8 @@ class RiskModelConfig(BaseModel):
         for key, value in v.items():
             if not 0 <= value <= 1:
                 raise ValueError(f"Threshold {key} must be between 0 and 1")
+        if all(key in v for key in ("low", "medium", "high")) and not v["low"] <= v["medium"] <= v["high"]:
+            raise ValueError("Thresholds must be ordered low <= medium <= high")
         return v
     
     @validator('driver_weights')
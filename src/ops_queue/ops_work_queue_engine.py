@@ -18,7 +18,8 @@ class OpsWorkQueueEngine:
     def __init__(self):
         self._queue_items: Dict[str, BundleRiskQueueItem] = {}
         self._bundle_index: Dict[str, List[str]] = {}
-        self._status_index: Dict[QueueItemStatus, List[str]] = {}
+        # status -> queue IDs, as an insertion-ordered set so moves are O(1)
+        self._status_index: Dict[QueueItemStatus, Dict[str, None]] = {}
 
     def create_from_risk(
         self,
@@ -28,6 +29,7 @@ class OpsWorkQueueEngine:
     ) -> BundleRiskQueueItem:
         queue_id = f"queue_{uuid.uuid4().hex[:10]}"
         summary = self._build_summary(risk)
+        now = datetime.now(timezone.utc)
         item = BundleRiskQueueItem(
             queue_id=queue_id,
             risk_id=risk.risk_id,
@@ -41,12 +43,14 @@ class OpsWorkQueueEngine:
             priority=priority,
             status=QueueItemStatus.OPEN,
             assigned_to=assigned_to,
+            created_at=now,
+            updated_at=now,
             metadata={"confidence": getattr(risk, "confidence_score", None)},
         )
         self._queue_items[queue_id] = item
         if item.bundle_id:
             self._bundle_index.setdefault(item.bundle_id, []).append(queue_id)
-        self._status_index.setdefault(item.status, []).append(queue_id)
+        self._status_index.setdefault(item.status, {})[queue_id] = None
         return item
 
     def update_status(
@@ -58,8 +62,8 @@ class OpsWorkQueueEngine:
     ) -> BundleRiskQueueItem:
         item = self._queue_items[queue_id]
         if item.status != status:
-            self._status_index.get(item.status, []).remove(queue_id)
-            self._status_index.setdefault(status, []).append(queue_id)
+            self._status_index[item.status].pop(queue_id, None)
+            self._status_index.setdefault(status, {})[queue_id] = None
         item.status = status
         if assigned_to is not None:
             item.assigned_to = assigned_to
@@ -69,7 +73,7 @@ class OpsWorkQueueEngine:
         return item
 
     def list_by_status(self, status: QueueItemStatus) -> List[BundleRiskQueueItem]:
-        return [self._queue_items[qid] for qid in self._status_index.get(status, [])]
+        return [self._queue_items[qid] for qid in self._status_index.get(status, ())]
 
     def list_by_bundle(self, bundle_id: str) -> List[BundleRiskQueueItem]:
         return [self._queue_items[qid] for qid in self._bundle_index.get(bundle_id, [])]
@@ -28,6 +28,7 @@ class OutcomeTrackingEngine:
         cost_savings_estimate: Optional[float] = None,
     ) -> BundleOutcome:
         outcome_id = f"outcome_{uuid.uuid4().hex[:10]}"
+        now = datetime.now(timezone.utc)
         outcome = BundleOutcome(
             outcome_id=outcome_id,
             action_id=action.action_id,
@@ -40,6 +41,8 @@ class OutcomeTrackingEngine:
             baseline_shipments=baseline_shipments,
             baseline_outreach=baseline_outreach,
             cost_savings_estimate=cost_savings_estimate,
+            created_at=now,
+            updated_at=now,
         )
         self._outcomes[outcome_id] = outcome
         self._action_index.setdefault(action.action_id, []).append(outcome_id)
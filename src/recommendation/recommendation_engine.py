@@ -8,6 +8,7 @@ prioritization and deduplication.
 from __future__ import annotations
 
 import uuid
+from datetime import datetime, timezone
 from typing import List, Dict, Iterable
 
 from ..models.risk import BundleBreakRisk, RefillAbandonmentRisk, RiskRecommendation, RiskSeverity
@@ -20,6 +21,16 @@ from ..models.recommendation import (
 )
 
 
+# Source priority strings -> priorities, and the rank each priority sorts by
+_PRIORITY_BY_NAME = {priority.value: priority for priority in RecommendationPriority}
+_PRIORITY_RANK = {
+    RecommendationPriority.URGENT: 0,
+    RecommendationPriority.HIGH: 1,
+    RecommendationPriority.MEDIUM: 2,
+    RecommendationPriority.LOW: 3,
+}
+
+
 class BundleRecommendationEngine:
     """Generate bundle-aware recommendations from risks."""
 
@@ -31,12 +42,13 @@ class BundleRecommendationEngine:
         risk: BundleBreakRisk | RefillAbandonmentRisk,
         metrics: BundleMetrics,
     ) -> List[BundleRecommendation]:
-        recommendations = [
-            self._to_bundle_recommendation(rec, risk, metrics)
-            for rec in risk.recommendations
+        created_at = datetime.now(timezone.utc)
+        # Rank and dedupe the source recommendations so duplicates are never built
+        ranked = self._rank_recommendations(risk.recommendations)
+        deduped = [
+            self._to_bundle_recommendation(rec, risk, metrics, created_at)
+            for rec in self._dedupe_recommendations(ranked)
         ]
-        ranked = self._rank_recommendations(recommendations)
-        deduped = self._dedupe_recommendations(ranked)
         for rec in deduped:
             self._recommendations[rec.recommendation_id] = rec
         return deduped
@@ -49,6 +61,7 @@ class BundleRecommendationEngine:
         rec: RiskRecommendation,
         risk: BundleBreakRisk | RefillAbandonmentRisk,
         metrics: BundleMetrics,
+        created_at: datetime,
     ) -> BundleRecommendation:
         action_type = BundleRecommendationEngine._infer_action_type(rec)
         priority = BundleRecommendationEngine._map_priority(rec.priority)
@@ -75,6 +88,7 @@ class BundleRecommendationEngine:
             time_to_implement=rec.time_to_implement,
             rationale=[rec.description],
             context=context,
+            created_at=created_at,
         )
 
     @staticmethod
@@ -93,34 +107,24 @@ class BundleRecommendationEngine:
 
     @staticmethod
     def _map_priority(priority: str) -> RecommendationPriority:
-        value = priority.lower()
-        if value == "urgent":
-            return RecommendationPriority.URGENT
-        if value == "high":
-            return RecommendationPriority.HIGH
-        if value == "medium":
-            return RecommendationPriority.MEDIUM
-        return RecommendationPriority.LOW
+        return _PRIORITY_BY_NAME.get(priority.lower(), RecommendationPriority.LOW)
 
     @staticmethod
-    def _rank_recommendations(recommendations: Iterable[BundleRecommendation]) -> List[BundleRecommendation]:
-        priority_order = {
-            RecommendationPriority.URGENT: 0,
-            RecommendationPriority.HIGH: 1,
-            RecommendationPriority.MEDIUM: 2,
-            RecommendationPriority.LOW: 3,
-        }
+    def _rank_recommendations(recommendations: Iterable[RiskRecommendation]) -> List[RiskRecommendation]:
         return sorted(
             recommendations,
-            key=lambda r: (priority_order[r.priority], -r.confidence_score),
+            key=lambda r: (
+                _PRIORITY_RANK[BundleRecommendationEngine._map_priority(r.priority)],
+                -(r.success_probability or 0.7),
+            ),
         )
 
     @staticmethod
-    def _dedupe_recommendations(recommendations: Iterable[BundleRecommendation]) -> List[BundleRecommendation]:
+    def _dedupe_recommendations(recommendations: Iterable[RiskRecommendation]) -> List[RiskRecommendation]:
         seen = set()
         deduped = []
         for rec in recommendations:
-            signature = (rec.action_type, rec.title)
+            signature = (BundleRecommendationEngine._infer_action_type(rec), rec.title)
             if signature in seen:
                 continue
             seen.add(signature)
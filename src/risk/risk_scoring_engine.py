@@ -14,10 +14,10 @@ The engine is designed to be:
 
 import time
 import uuid
+from bisect import bisect_right
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple, Any, Union
 from collections import defaultdict
-import statistics
 
 from ..models.snapshots import RefillSnapshot, SnapshotStage, PAState, BundleTimingState
 from ..models.metrics import BundleMetrics
@@ -31,6 +31,192 @@ from ..utils.version_registry import VersionRegistry
 from ..models.versioning import VersionedArtifactType
 
 
+# Placeholder bundle ID for assessments whose metrics carry no bundle
+_UNKNOWN_BUNDLE_ID = "unknown"
+
+# Days a refill can sit in each stage before it is fully aged
+_STAGE_MAX_AGE_DAYS = {
+    "initiated": 7,
+    "eligible": 14,
+    "pa_pending": 10,
+    "pa_approved": 7,
+    "bundled": 5,
+    "oos_detected": 3,
+    "shipped": 0,
+    "completed": 0
+}
+
+# Severity for each band between the low/medium/high threshold cutpoints
+_SEVERITY_BANDS = (RiskSeverity.LOW, RiskSeverity.MEDIUM, RiskSeverity.HIGH, RiskSeverity.CRITICAL)
+
+
+def _threshold_cutpoints(thresholds: Dict[str, float]) -> Tuple[float, float, float]:
+    """Order a threshold mapping as ascending low/medium/high cutpoints"""
+    cutpoints = (thresholds["low"], thresholds["medium"], thresholds["high"])
+    # Band lookup bisects the cutpoints, so they must not decrease
+    if not cutpoints[0] <= cutpoints[1] <= cutpoints[2]:
+        raise ValueError(f"Thresholds must be ordered low <= medium <= high, got {cutpoints}")
+    return cutpoints
+
+
+# Static recommendation content, keyed by recommendation ID prefix. Each
+# assessment stamps a fresh ID and priority onto a shallow copy.
+_RECOMMENDATION_TEMPLATES: Dict[str, RiskRecommendation] = {
+    "timing_alignment": RiskRecommendation(
+        recommendation_id="timing_alignment",
+        priority="medium",
+        category="timing_optimization",
+        title="Optimize Bundle Timing Alignment",
+        description="Improve timing coordination between refills to reduce fragmentation risk",
+        action_steps=[
+            "Review refill due dates for bundle members",
+            "Adjust timing windows for better alignment",
+            "Coordinate with pharmacy for synchronized processing"
+        ],
+        expected_impact="Reduce bundle fragmentation risk by 30-50%",
+        time_to_implement="1-2 weeks",
+        success_probability=0.8,
+        applicable_stages=["eligible", "bundled"],
+        required_resources=["Pharmacy coordinator", "Scheduling system"]
+    ),
+    "fragmentation": RiskRecommendation(
+        recommendation_id="fragmentation",
+        priority="medium",
+        category="bundle_optimization",
+        title="Address Bundle Fragmentation Risk",
+        description="Take proactive steps to prevent bundle fragmentation",
+        action_steps=[
+            "Identify root causes of timing misalignment",
+            "Implement bundle preservation strategies",
+            "Monitor fragmentation risk indicators"
+        ],
+        expected_impact="Prevent shipment splits and reduce costs",
+        time_to_implement="2-4 weeks",
+        success_probability=0.7,
+        applicable_stages=["bundled", "shipped"],
+        required_resources=["Bundle optimization team", "Analytics tools"]
+    ),
+    "stage_aging": RiskRecommendation(
+        recommendation_id="stage_aging",
+        priority="medium",
+        category="process_optimization",
+        title="Expedite Aging Refill Processing",
+        description="Reduce processing time for refills stuck in current stage",
+        action_steps=[
+            "Identify bottlenecks in current stage",
+            "Assign dedicated resources for stuck refills",
+            "Implement automated escalation for aging cases"
+        ],
+        expected_impact="Reduce abandonment risk and improve bundle integrity",
+        time_to_implement="1 week",
+        success_probability=0.9,
+        applicable_stages=["initiated", "eligible", "pa_pending", "pa_approved"],
+        required_resources=["Process improvement team", "Automation tools"]
+    ),
+    "gap_anomaly": RiskRecommendation(
+        recommendation_id="gap_anomaly",
+        priority="medium",
+        category="member_engagement",
+        title="Address Refill Gap Anomaly",
+        description="Proactive outreach to prevent refill abandonment",
+        action_steps=[
+            "Contact member for refill confirmation",
+            "Offer convenient refill options",
+            "Provide education on adherence importance"
+        ],
+        expected_impact="Reduce abandonment risk by 40-60%",
+        time_to_implement="2-3 days",
+        success_probability=0.8,
+        applicable_stages=["eligible", "bundled"],
+        required_resources=["Care coordinator", "Outreach team"]
+    ),
+    "supply_buffer": RiskRecommendation(
+        recommendation_id="supply_buffer",
+        priority="medium",
+        category="supply_management",
+        title="Address Supply Buffer Depletion",
+        description="Ensure adequate medication supply to prevent interruption",
+        action_steps=[
+            "Check inventory levels for prescribed medication",
+            "Arrange early refill if supply is low",
+            "Provide temporary supply options if needed"
+        ],
+        expected_impact="Prevent treatment interruption",
+        time_to_implement="3-5 days",
+        success_probability=0.9,
+        applicable_stages=["eligible", "bundled", "shipped"],
+        required_resources=["Pharmacy staff", "Inventory system"]
+    ),
+}
+
+
+def _recommendation_from_template(template_key: str, priority: str) -> RiskRecommendation:
+    """Copy a recommendation template with a new ID, the given priority and its own lists"""
+    template = _RECOMMENDATION_TEMPLATES[template_key]
+    return template.model_copy(update={
+        "recommendation_id": f"{template_key}_{uuid.uuid4().hex[:8]}",
+        "priority": priority,
+        "action_steps": list(template.action_steps),
+        "applicable_stages": list(template.applicable_stages),
+        "required_resources": list(template.required_resources)
+    })
+
+
+# Fixed driver identity per detected condition; per-assessment fields are filled in on copy
+_DRIVER_TEMPLATES: Dict[str, RiskDriver] = {
+    "timing_misalignment": RiskDriver(
+        driver_type=RiskDriverType.TIMING_MISALIGNMENT,
+        driver_name="Bundle Timing Misalignment",
+        impact_score=0.0,
+        confidence=0.9
+    ),
+    "fragmentation": RiskDriver(
+        driver_type=RiskDriverType.BUNDLE_FRAGMENTATION,
+        driver_name="Bundle Fragmentation Risk",
+        impact_score=0.0,
+        confidence=0.8
+    ),
+    "stage_aging": RiskDriver(
+        driver_type=RiskDriverType.STAGE_AGING,
+        driver_name="Stage Aging Risk",
+        impact_score=0.0,
+        confidence=0.7
+    ),
+    "bundle_health": RiskDriver(
+        driver_type=RiskDriverType.BUNDLE_FRAGMENTATION,
+        driver_name="Poor Bundle Health",
+        impact_score=0.0,
+        confidence=0.6
+    ),
+    "gap_anomaly": RiskDriver(
+        driver_type=RiskDriverType.REFILL_GAP_ANOMALY,
+        driver_name="Refill Gap Anomaly",
+        impact_score=0.0,
+        confidence=0.9
+    ),
+    "supply_buffer": RiskDriver(
+        driver_type=RiskDriverType.SUPPLY_BUFFER_DEPLETION,
+        driver_name="Supply Buffer Depletion",
+        impact_score=0.0,
+        confidence=0.8
+    ),
+}
+
+
+def _driver_from_template(template_key: str, impact_score: float, evidence: Dict[str, Any],
+                          metric_values: Dict[str, float]) -> RiskDriver:
+    """Copy a driver template with this assessment's impact, evidence and detection time
+
+    The copy is not validated, so impact_score must already be within 0-1.
+    """
+    return _DRIVER_TEMPLATES[template_key].model_copy(update={
+        "impact_score": impact_score,
+        "evidence": evidence,
+        "metric_values": {name: float(value) for name, value in metric_values.items()},
+        "detected_timestamp": datetime.now(timezone.utc)
+    })
+
+
 class BundleRiskScoringEngine:
     """Engine for computing explainable bundle risk scores"""
     
@@ -49,6 +235,8 @@ class BundleRiskScoringEngine:
         self._risk_cache: Dict[str, Union[BundleBreakRisk, RefillAbandonmentRisk]] = {}
         self._bundle_risk_index: Dict[str, List[str]] = defaultdict(list)
         self._member_risk_index: Dict[str, List[str]] = defaultdict(list)
+        self._risk_type_index: Dict[RiskType, List[str]] = defaultdict(list)
+        self._severity_risk_index: Dict[RiskSeverity, List[str]] = defaultdict(list)
         
         # Risk scoring thresholds and weights
         self._initialize_scoring_parameters()
@@ -57,21 +245,33 @@ class BundleRiskScoringEngine:
         """Initialize scoring parameters from config"""
         self.break_thresholds = self.config.break_risk_thresholds
         self.abandonment_thresholds = self.config.abandonment_risk_thresholds
+        self._break_cutpoints = _threshold_cutpoints(self.break_thresholds)
+        self._abandonment_cutpoints = _threshold_cutpoints(self.abandonment_thresholds)
         self.driver_weights = self.config.driver_weights
         self.min_confidence = self.config.min_confidence_threshold
     
+    def reset(self) -> None:
+        """Clear stored risk assessments, their indexes and the audit trail (for testing only)"""
+        self._risk_cache.clear()
+        self._bundle_risk_index.clear()
+        self._member_risk_index.clear()
+        self._risk_type_index.clear()
+        self._severity_risk_index.clear()
+        self.audit_logger.clear_audit_trail()
+    
     def assess_bundle_break_risk(self, metrics: BundleMetrics, bundle_snapshots: Optional[List[BundleMetrics]] = None) -> BundleBreakRisk:
         """Assess bundle break risk with explainable drivers"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        # Generate risk ID
-        risk_id = f"bundle_break_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        # Generate risk ID, stamped with the assessment time
+        assessment_timestamp = datetime.now(timezone.utc)
+        risk_id = f"bundle_break_{assessment_timestamp.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
         
         # Compute break probability
         break_probability = self._compute_break_probability(metrics, bundle_snapshots)
         
         # Determine severity
-        severity = self._determine_risk_severity(break_probability, self.break_thresholds)
+        severity = self._severity_from_cutpoints(break_probability, self._break_cutpoints)
         
         # Identify risk drivers
         primary_drivers, secondary_drivers = self._identify_bundle_break_drivers(metrics, bundle_snapshots)
@@ -85,8 +285,8 @@ class BundleRiskScoringEngine:
         # Create risk assessment
         risk_assessment = BundleBreakRisk(
             risk_id=risk_id,
-            bundle_id=metrics.bundle_alignment.bundle_id or "unknown",
-            assessment_timestamp=datetime.now(timezone.utc),
+            bundle_id=metrics.bundle_alignment.bundle_id or _UNKNOWN_BUNDLE_ID,
+            assessment_timestamp=assessment_timestamp,
             model_version=self.config.model_version,
             break_probability=break_probability,
             break_severity=severity,
@@ -102,12 +302,10 @@ class BundleRiskScoringEngine:
         )
         
         # Cache and index
-        self._risk_cache[risk_id] = risk_assessment
-        if risk_assessment.bundle_id != "unknown":
-            self._bundle_risk_index[risk_assessment.bundle_id].append(risk_id)
+        self._register_risk(risk_assessment, RiskType.BUNDLE_BREAK, severity)
         
         # Log assessment
-        assessment_time_ms = int((time.time() - start_time) * 1000)
+        assessment_time_ms = int((time.perf_counter() - start_time) * 1000)
         self.audit_logger.log_risk_assessment(
             risk_id=risk_id,
             risk_type="bundle_break",
@@ -129,16 +327,17 @@ class BundleRiskScoringEngine:
     
     def assess_abandonment_risk(self, metrics: BundleMetrics, snapshot: Optional[RefillSnapshot] = None) -> RefillAbandonmentRisk:
         """Assess refill abandonment risk with explainable drivers"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        # Generate risk ID
-        risk_id = f"abandonment_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        # Generate risk ID, stamped with the assessment time
+        assessment_timestamp = datetime.now(timezone.utc)
+        risk_id = f"abandonment_{assessment_timestamp.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
         
         # Compute abandonment probability
         abandonment_probability = self._compute_abandonment_probability(metrics, snapshot)
         
         # Determine severity
-        severity = self._determine_risk_severity(abandonment_probability, self.abandonment_thresholds)
+        severity = self._severity_from_cutpoints(abandonment_probability, self._abandonment_cutpoints)
         
         # Identify risk drivers
         primary_drivers, secondary_drivers = self._identify_abandonment_drivers(metrics, snapshot)
@@ -154,7 +353,7 @@ class BundleRiskScoringEngine:
             risk_id=risk_id,
             refill_id=metrics.refill_id,
             member_id=metrics.member_id,
-            assessment_timestamp=datetime.now(timezone.utc),
+            assessment_timestamp=assessment_timestamp,
             model_version=self.config.model_version,
             abandonment_probability=abandonment_probability,
             abandonment_severity=severity,
@@ -172,11 +371,10 @@ class BundleRiskScoringEngine:
         )
         
         # Cache and index
-        self._risk_cache[risk_id] = risk_assessment
-        self._member_risk_index[risk_assessment.member_id].append(risk_id)
+        self._register_risk(risk_assessment, RiskType.REFILL_ABANDONMENT, severity)
         
         # Log assessment
-        assessment_time_ms = int((time.time() - start_time) * 1000)
+        assessment_time_ms = int((time.perf_counter() - start_time) * 1000)
         self.audit_logger.log_risk_assessment(
             risk_id=risk_id,
             risk_type="refill_abandonment",
@@ -226,16 +424,30 @@ class BundleRiskScoringEngine:
         
         return risk_assessments
     
+    def _register_risk(self, risk_assessment: Union[BundleBreakRisk, RefillAbandonmentRisk],
+                       risk_type: RiskType, severity: RiskSeverity) -> None:
+        """Cache a risk assessment and add it to the lookup indexes"""
+        risk_id = risk_assessment.risk_id
+        self._risk_cache[risk_id] = risk_assessment
+        self._risk_type_index[risk_type].append(risk_id)
+        self._severity_risk_index[severity].append(risk_id)
+        
+        if risk_type == RiskType.BUNDLE_BREAK:
+            if risk_assessment.bundle_id != _UNKNOWN_BUNDLE_ID:
+                self._bundle_risk_index[risk_assessment.bundle_id].append(risk_id)
+        else:
+            self._member_risk_index[risk_assessment.member_id].append(risk_id)
+    
     def get_risk_assessment(self, risk_id: str) -> Optional[Union[BundleBreakRisk, RefillAbandonmentRisk]]:
         """Retrieve a risk assessment by ID"""
         return self._risk_cache.get(risk_id)
     
     def query_risk_assessments(self, query: RiskQuery) -> RiskList:
         """Query risk assessments based on criteria"""
-        all_risks = list(self._risk_cache.values())
+        candidate_risks = self._indexed_candidates(query)
         
         # Apply filters
-        filtered_risks = self._apply_risk_filters(all_risks, query)
+        filtered_risks = self._apply_risk_filters(candidate_risks, query)
         
         # Sort results
         sorted_risks = self._sort_risk_assessments(filtered_risks, query.sort_by, query.sort_order)
@@ -258,6 +470,29 @@ class BundleRiskScoringEngine:
             summary=summary
         )
     
+    def _indexed_candidates(self, query: RiskQuery) -> List[Union[BundleBreakRisk, RefillAbandonmentRisk]]:
+        """Narrow the cached assessments to the smallest index matching the query
+        
+        Candidates are still passed through the full filters, which apply the
+        remaining criteria.
+        """
+        indexes = []
+        if query.risk_type:
+            indexes.append(self._risk_type_index.get(query.risk_type, []))
+        if query.severity:
+            indexes.append(self._severity_risk_index.get(query.severity, []))
+        if query.bundle_id and query.bundle_id != _UNKNOWN_BUNDLE_ID:
+            indexes.append(self._bundle_risk_index.get(query.bundle_id, []))
+        if query.member_id:
+            indexes.append(self._member_risk_index.get(query.member_id, []))
+        
+        if not indexes:
+            return list(self._risk_cache.values())
+        
+        # Index entries are kept in assessment order, matching the cache
+        risk_ids = min(indexes, key=len)
+        return [self._risk_cache[rid] for rid in risk_ids if rid in self._risk_cache]
+    
     def get_bundle_risks(self, bundle_id: str, limit: int = 100) -> List[BundleBreakRisk]:
         """Get all risk assessments for a bundle"""
         risk_ids = self._bundle_risk_index.get(bundle_id, [])
@@ -300,8 +535,8 @@ class BundleRiskScoringEngine:
         health_score = 1.0 - metrics.bundle_alignment.bundle_health_score
         driver_scores.append(("bundle_health", health_score))
         
-        # PA processing driver (if applicable)
-        pa_score = self._compute_pa_processing_risk(metrics)
+        # PA processing driver (if applicable), reusing the stage aging score
+        pa_score = self._compute_pa_processing_risk(metrics, aging_score)
         if pa_score > 0:
             driver_scores.append(("pa_processing_delay", pa_score))
         
@@ -349,88 +584,80 @@ class BundleRiskScoringEngine:
     
     def _determine_risk_severity(self, probability: float, thresholds: Dict[str, float]) -> RiskSeverity:
         """Determine risk severity from probability and thresholds"""
-        if probability >= thresholds["high"]:
-            return RiskSeverity.CRITICAL
-        elif probability >= thresholds["medium"]:
-            return RiskSeverity.HIGH
-        elif probability >= thresholds["low"]:
-            return RiskSeverity.MEDIUM
-        else:
-            return RiskSeverity.LOW
+        return self._severity_from_cutpoints(probability, _threshold_cutpoints(thresholds))
+    
+    def _severity_from_cutpoints(self, probability: float, cutpoints: Tuple[float, float, float]) -> RiskSeverity:
+        """Map a probability to its severity band; reaching a cutpoint moves up a band"""
+        return _SEVERITY_BANDS[bisect_right(cutpoints, probability)]
     
     def _identify_bundle_break_drivers(self, metrics: BundleMetrics, bundle_snapshots: Optional[List[BundleMetrics]]) -> Tuple[List[RiskDriver], List[RiskDriver]]:
         """Identify primary and secondary bundle break risk drivers"""
+        alignment = metrics.bundle_alignment
+        overlap = metrics.timing_overlap
+        age = metrics.age_in_stage
         drivers = []
         
         # Timing misalignment driver
-        if metrics.bundle_alignment.timing_alignment_score < 0.7:
-            impact = 1.0 - metrics.bundle_alignment.timing_alignment_score
-            drivers.append(RiskDriver(
-                driver_type=RiskDriverType.TIMING_MISALIGNMENT,
-                driver_name="Bundle Timing Misalignment",
+        if alignment.timing_alignment_score < 0.7:
+            impact = 1.0 - alignment.timing_alignment_score
+            drivers.append(_driver_from_template(
+                "timing_misalignment",
                 impact_score=impact,
-                confidence=0.9,
                 evidence={
-                    "timing_alignment_score": metrics.bundle_alignment.timing_alignment_score,
-                    "max_timing_gap": metrics.timing_overlap.max_timing_gap_days
+                    "timing_alignment_score": alignment.timing_alignment_score,
+                    "max_timing_gap": overlap.max_timing_gap_days
                 },
                 metric_values={
-                    "timing_alignment_score": metrics.bundle_alignment.timing_alignment_score,
-                    "refill_overlap_score": metrics.timing_overlap.refill_overlap_score
+                    "timing_alignment_score": alignment.timing_alignment_score,
+                    "refill_overlap_score": overlap.refill_overlap_score
                 }
             ))
         
         # Bundle fragmentation driver
-        if metrics.timing_overlap.fragmentation_risk > 0.5:
-            impact = metrics.timing_overlap.fragmentation_risk
-            drivers.append(RiskDriver(
-                driver_type=RiskDriverType.BUNDLE_FRAGMENTATION,
-                driver_name="Bundle Fragmentation Risk",
+        if overlap.fragmentation_risk > 0.5:
+            impact = overlap.fragmentation_risk
+            drivers.append(_driver_from_template(
+                "fragmentation",
                 impact_score=impact,
-                confidence=0.8,
                 evidence={
-                    "fragmentation_risk": metrics.timing_overlap.fragmentation_risk,
-                    "shipment_split_probability": metrics.timing_overlap.shipment_split_probability
+                    "fragmentation_risk": overlap.fragmentation_risk,
+                    "shipment_split_probability": overlap.shipment_split_probability
                 },
                 metric_values={
-                    "fragmentation_risk": metrics.timing_overlap.fragmentation_risk,
-                    "alignment_efficiency": metrics.timing_overlap.alignment_efficiency
+                    "fragmentation_risk": overlap.fragmentation_risk,
+                    "alignment_efficiency": overlap.alignment_efficiency
                 }
             ))
         
         # Stage aging driver
         aging_risk = self._compute_stage_aging_risk(metrics)
         if aging_risk > 0.6:
-            drivers.append(RiskDriver(
-                driver_type=RiskDriverType.STAGE_AGING,
-                driver_name="Stage Aging Risk",
+            drivers.append(_driver_from_template(
+                "stage_aging",
                 impact_score=aging_risk,
-                confidence=0.7,
                 evidence={
-                    "days_in_current_stage": metrics.age_in_stage.days_in_current_stage,
-                    "current_stage": metrics.age_in_stage.current_stage
+                    "days_in_current_stage": age.days_in_current_stage,
+                    "current_stage": age.current_stage
                 },
                 metric_values={
-                    "days_in_current_stage": metrics.age_in_stage.days_in_current_stage,
-                    "stage_age_percentile": metrics.age_in_stage.stage_age_percentile
+                    "days_in_current_stage": age.days_in_current_stage,
+                    "stage_age_percentile": age.stage_age_percentile
                 }
             ))
         
         # Bundle health driver
-        if metrics.bundle_alignment.bundle_health_score < 0.5:
-            impact = 1.0 - metrics.bundle_alignment.bundle_health_score
-            drivers.append(RiskDriver(
-                driver_type=RiskDriverType.BUNDLE_FRAGMENTATION,
-                driver_name="Poor Bundle Health",
+        if alignment.bundle_health_score < 0.5:
+            impact = 1.0 - alignment.bundle_health_score
+            drivers.append(_driver_from_template(
+                "bundle_health",
                 impact_score=impact,
-                confidence=0.6,
                 evidence={
-                    "bundle_health_score": metrics.bundle_alignment.bundle_health_score,
-                    "bundle_efficiency_score": metrics.bundle_alignment.bundle_efficiency_score
+                    "bundle_health_score": alignment.bundle_health_score,
+                    "bundle_efficiency_score": alignment.bundle_efficiency_score
                 },
                 metric_values={
-                    "bundle_health_score": metrics.bundle_alignment.bundle_health_score,
-                    "bundle_efficiency_score": metrics.bundle_alignment.bundle_efficiency_score
+                    "bundle_health_score": alignment.bundle_health_score,
+                    "bundle_efficiency_score": alignment.bundle_efficiency_score
                 }
             ))
         
@@ -443,59 +670,55 @@ class BundleRiskScoringEngine:
     
     def _identify_abandonment_drivers(self, metrics: BundleMetrics, snapshot: Optional[RefillSnapshot]) -> Tuple[List[RiskDriver], List[RiskDriver]]:
         """Identify primary and secondary abandonment risk drivers"""
+        gap = metrics.refill_gap
+        age = metrics.age_in_stage
         drivers = []
         
         # Refill gap anomaly driver
-        if metrics.refill_gap.abandonment_risk > 0.4:
-            drivers.append(RiskDriver(
-                driver_type=RiskDriverType.REFILL_GAP_ANOMALY,
-                driver_name="Refill Gap Anomaly",
-                impact_score=metrics.refill_gap.abandonment_risk,
-                confidence=0.9,
+        if gap.abandonment_risk > 0.4:
+            drivers.append(_driver_from_template(
+                "gap_anomaly",
+                impact_score=gap.abandonment_risk,
                 evidence={
-                    "days_since_last_fill": metrics.refill_gap.days_since_last_fill,
-                    "days_until_next_due": metrics.refill_gap.days_until_next_due,
-                    "gap_efficiency_score": metrics.refill_gap.gap_efficiency_score
+                    "days_since_last_fill": gap.days_since_last_fill,
+                    "days_until_next_due": gap.days_until_next_due,
+                    "gap_efficiency_score": gap.gap_efficiency_score
                 },
                 metric_values={
-                    "abandonment_risk": metrics.refill_gap.abandonment_risk,
-                    "urgency_score": metrics.refill_gap.urgency_score,
-                    "gap_efficiency_score": metrics.refill_gap.gap_efficiency_score
+                    "abandonment_risk": gap.abandonment_risk,
+                    "urgency_score": gap.urgency_score,
+                    "gap_efficiency_score": gap.gap_efficiency_score
                 }
             ))
         
         # Supply buffer depletion driver
-        if metrics.refill_gap.urgency_score > 0.7:
-            drivers.append(RiskDriver(
-                driver_type=RiskDriverType.SUPPLY_BUFFER_DEPLETION,
-                driver_name="Supply Buffer Depletion",
-                impact_score=metrics.refill_gap.urgency_score,
-                confidence=0.8,
+        if gap.urgency_score > 0.7:
+            drivers.append(_driver_from_template(
+                "supply_buffer",
+                impact_score=gap.urgency_score,
                 evidence={
-                    "days_supply_remaining": metrics.refill_gap.days_supply_remaining,
-                    "supply_buffer_days": metrics.refill_gap.supply_buffer_days
+                    "days_supply_remaining": gap.days_supply_remaining,
+                    "supply_buffer_days": gap.supply_buffer_days
                 },
                 metric_values={
-                    "urgency_score": metrics.refill_gap.urgency_score,
-                    "days_supply_remaining": metrics.refill_gap.days_supply_remaining
+                    "urgency_score": gap.urgency_score,
+                    "days_supply_remaining": gap.days_supply_remaining
                 }
             ))
         
         # Stage aging driver
         aging_risk = self._compute_stage_aging_risk(metrics)
         if aging_risk > 0.5:
-            drivers.append(RiskDriver(
-                driver_type=RiskDriverType.STAGE_AGING,
-                driver_name="Stage Aging Risk",
+            drivers.append(_driver_from_template(
+                "stage_aging",
                 impact_score=aging_risk,
-                confidence=0.7,
                 evidence={
-                    "days_in_current_stage": metrics.age_in_stage.days_in_current_stage,
-                    "current_stage": metrics.age_in_stage.current_stage
+                    "days_in_current_stage": age.days_in_current_stage,
+                    "current_stage": age.current_stage
                 },
                 metric_values={
-                    "days_in_current_stage": metrics.age_in_stage.days_in_current_stage,
-                    "stage_age_percentile": metrics.age_in_stage.stage_age_percentile
+                    "days_in_current_stage": age.days_in_current_stage,
+                    "stage_age_percentile": age.stage_age_percentile
                 }
             ))
         
@@ -512,7 +735,7 @@ class BundleRiskScoringEngine:
             return 0.5  # Low confidence without drivers
         
         # Base confidence from driver confidence levels
-        driver_confidence = statistics.mean([d.confidence for d in drivers])
+        driver_confidence = sum(d.confidence for d in drivers) / len(drivers)
         
         # Adjust based on data quality
         data_quality_factor = self._assess_data_quality(metrics)
@@ -529,65 +752,20 @@ class BundleRiskScoringEngine:
         # Timing alignment recommendations
         timing_driver = next((d for d in drivers if d.driver_type == RiskDriverType.TIMING_MISALIGNMENT), None)
         if timing_driver and timing_driver.impact_score > 0.6:
-            recommendations.append(RiskRecommendation(
-                recommendation_id=f"timing_alignment_{uuid.uuid4().hex[:8]}",
-                priority="high" if severity in [RiskSeverity.HIGH, RiskSeverity.CRITICAL] else "medium",
-                category="timing_optimization",
-                title="Optimize Bundle Timing Alignment",
-                description="Improve timing coordination between refills to reduce fragmentation risk",
-                action_steps=[
-                    "Review refill due dates for bundle members",
-                    "Adjust timing windows for better alignment",
-                    "Coordinate with pharmacy for synchronized processing"
-                ],
-                expected_impact="Reduce bundle fragmentation risk by 30-50%",
-                time_to_implement="1-2 weeks",
-                success_probability=0.8,
-                applicable_stages=["eligible", "bundled"],
-                required_resources=["Pharmacy coordinator", "Scheduling system"]
-            ))
+            priority = "high" if severity in [RiskSeverity.HIGH, RiskSeverity.CRITICAL] else "medium"
+            recommendations.append(_recommendation_from_template("timing_alignment", priority))
         
         # Fragmentation risk recommendations
         fragmentation_driver = next((d for d in drivers if d.driver_type == RiskDriverType.BUNDLE_FRAGMENTATION), None)
         if fragmentation_driver and fragmentation_driver.impact_score > 0.5:
-            recommendations.append(RiskRecommendation(
-                recommendation_id=f"fragmentation_{uuid.uuid4().hex[:8]}",
-                priority="high" if severity == RiskSeverity.CRITICAL else "medium",
-                category="bundle_optimization",
-                title="Address Bundle Fragmentation Risk",
-                description="Take proactive steps to prevent bundle fragmentation",
-                action_steps=[
-                    "Identify root causes of timing misalignment",
-                    "Implement bundle preservation strategies",
-                    "Monitor fragmentation risk indicators"
-                ],
-                expected_impact="Prevent shipment splits and reduce costs",
-                time_to_implement="2-4 weeks",
-                success_probability=0.7,
-                applicable_stages=["bundled", "shipped"],
-                required_resources=["Bundle optimization team", "Analytics tools"]
-            ))
+            priority = "high" if severity == RiskSeverity.CRITICAL else "medium"
+            recommendations.append(_recommendation_from_template("fragmentation", priority))
         
         # Stage aging recommendations
         aging_driver = next((d for d in drivers if d.driver_type == RiskDriverType.STAGE_AGING), None)
         if aging_driver and aging_driver.impact_score > 0.6:
-            recommendations.append(RiskRecommendation(
-                recommendation_id=f"stage_aging_{uuid.uuid4().hex[:8]}",
-                priority="high" if severity in [RiskSeverity.HIGH, RiskSeverity.CRITICAL] else "medium",
-                category="process_optimization",
-                title="Expedite Aging Refill Processing",
-                description="Reduce processing time for refills stuck in current stage",
-                action_steps=[
-                    "Identify bottlenecks in current stage",
-                    "Assign dedicated resources for stuck refills",
-                    "Implement automated escalation for aging cases"
-                ],
-                expected_impact="Reduce abandonment risk and improve bundle integrity",
-                time_to_implement="1 week",
-                success_probability=0.9,
-                applicable_stages=["initiated", "eligible", "pa_pending", "pa_approved"],
-                required_resources=["Process improvement team", "Automation tools"]
-            ))
+            priority = "high" if severity in [RiskSeverity.HIGH, RiskSeverity.CRITICAL] else "medium"
+            recommendations.append(_recommendation_from_template("stage_aging", priority))
         
         return recommendations
     
@@ -598,71 +776,33 @@ class BundleRiskScoringEngine:
         # Gap anomaly recommendations
         gap_driver = next((d for d in drivers if d.driver_type == RiskDriverType.REFILL_GAP_ANOMALY), None)
         if gap_driver and gap_driver.impact_score > 0.6:
-            recommendations.append(RiskRecommendation(
-                recommendation_id=f"gap_anomaly_{uuid.uuid4().hex[:8]}",
-                priority="high" if severity in [RiskSeverity.HIGH, RiskSeverity.CRITICAL] else "medium",
-                category="member_engagement",
-                title="Address Refill Gap Anomaly",
-                description="Proactive outreach to prevent refill abandonment",
-                action_steps=[
-                    "Contact member for refill confirmation",
-                    "Offer convenient refill options",
-                    "Provide education on adherence importance"
-                ],
-                expected_impact="Reduce abandonment risk by 40-60%",
-                time_to_implement="2-3 days",
-                success_probability=0.8,
-                applicable_stages=["eligible", "bundled"],
-                required_resources=["Care coordinator", "Outreach team"]
-            ))
+            priority = "high" if severity in [RiskSeverity.HIGH, RiskSeverity.CRITICAL] else "medium"
+            recommendations.append(_recommendation_from_template("gap_anomaly", priority))
         
         # Supply buffer recommendations
         supply_driver = next((d for d in drivers if d.driver_type == RiskDriverType.SUPPLY_BUFFER_DEPLETION), None)
         if supply_driver and supply_driver.impact_score > 0.7:
-            recommendations.append(RiskRecommendation(
-                recommendation_id=f"supply_buffer_{uuid.uuid4().hex[:8]}",
-                priority="high" if severity == RiskSeverity.CRITICAL else "medium",
-                category="supply_management",
-                title="Address Supply Buffer Depletion",
-                description="Ensure adequate medication supply to prevent interruption",
-                action_steps=[
-                    "Check inventory levels for prescribed medication",
-                    "Arrange early refill if supply is low",
-                    "Provide temporary supply options if needed"
-                ],
-                expected_impact="Prevent treatment interruption",
-                time_to_implement="3-5 days",
-                success_probability=0.9,
-                applicable_stages=["eligible", "bundled", "shipped"],
-                required_resources=["Pharmacy staff", "Inventory system"]
-            ))
+            priority = "high" if severity == RiskSeverity.CRITICAL else "medium"
+            recommendations.append(_recommendation_from_template("supply_buffer", priority))
         
         return recommendations
     
     def _compute_stage_aging_risk(self, metrics: BundleMetrics) -> float:
         """Compute risk from stage aging"""
         # Normalize stage age to 0-1 scale
-        max_age_days = {
-            "initiated": 7,
-            "eligible": 14,
-            "pa_pending": 10,
-            "pa_approved": 7,
-            "bundled": 5,
-            "oos_detected": 3,
-            "shipped": 0,
-            "completed": 0
-        }
-        
         current_stage = metrics.age_in_stage.current_stage
         days_in_stage = metrics.age_in_stage.days_in_current_stage
-        max_days = max_age_days.get(current_stage, 7)
+        max_days = _STAGE_MAX_AGE_DAYS.get(current_stage, 7)
+        if max_days == 0:
+            # Stages with no age limit (shipped, completed) carry no aging risk
+            return 0.0
         
         return min(1.0, days_in_stage / max_days)
     
-    def _compute_pa_processing_risk(self, metrics: BundleMetrics) -> float:
+    def _compute_pa_processing_risk(self, metrics: BundleMetrics, aging_score: Optional[float] = None) -> float:
         """Compute risk from PA processing delays"""
         if metrics.age_in_stage.current_stage in ["pa_pending", "pa_approved"]:
-            return self._compute_stage_aging_risk(metrics)
+            return self._compute_stage_aging_risk(metrics) if aging_score is None else aging_score
         return 0.0
     
     def _compute_oos_disruption_risk(self, metrics: BundleMetrics) -> float:
@@ -748,10 +888,12 @@ class BundleRiskScoringEngine:
     
     def _extract_compliance_history(self, metrics: BundleMetrics) -> Dict[str, Any]:
         """Extract compliance history from metrics (simplified)"""
+        # Event counts live on the snapshot; metrics carry the refill gap instead
+        refill_gap = metrics.refill_gap
         return {
-            "refill_events": metrics.refill_events,
-            "pa_events": metrics.pa_events,
-            "total_events": metrics.total_events,
+            "days_since_last_fill": refill_gap.days_since_last_fill,
+            "refill_gap_days": refill_gap.refill_gap_days,
+            "is_optimal_gap": refill_gap.is_optimal_gap,
             "last_activity": metrics.computed_timestamp.isoformat()
         }
     
@@ -801,7 +943,7 @@ class BundleRiskScoringEngine:
                 filtered = [r for r in filtered if r.abandonment_probability <= query.max_probability]
         
         if query.severity:
-            filtered = [r for r in filtered if r.break_severity == query.severity or r.abandonment_severity == query.severity]
+            filtered = [r for r in filtered if self._risk_severity(r) == query.severity]
         
         if query.assessment_timestamp_from:
             filtered = [r for r in filtered if r.assessment_timestamp >= query.assessment_timestamp_from]
@@ -811,6 +953,10 @@ class BundleRiskScoringEngine:
         
         return filtered
     
+    def _risk_severity(self, risk: Union[BundleBreakRisk, RefillAbandonmentRisk]) -> RiskSeverity:
+        """Severity of an assessment, whichever risk type it is"""
+        return risk.break_severity if isinstance(risk, BundleBreakRisk) else risk.abandonment_severity
+    
     def _sort_risk_assessments(self, risks: List[Union[BundleBreakRisk, RefillAbandonmentRisk]], sort_by: str, sort_order: str) -> List[Union[BundleBreakRisk, RefillAbandonmentRisk]]:
         """Sort risk assessments by specified field"""
         reverse = sort_order.lower() == "desc"
@@ -840,37 +986,48 @@ class BundleRiskScoringEngine:
                 assessment_time_ms=0
             )
         
-        # Separate risk types
-        bundle_risks = [r for r in risks if isinstance(r, BundleBreakRisk)]
-        abandonment_risks = [r for r in risks if isinstance(r, RefillAbandonmentRisk)]
+        # Calculate aggregates in a single pass
+        bundle_count = 0
+        abandonment_count = 0
+        total_break_prob = 0.0
+        total_abandon_prob = 0.0
+        total_assessment_ms = 0
+        high_risk_count = 0
+        severity_distribution = defaultdict(int)
         
-        # Calculate aggregates
-        total_assessments = len(risks)
-        avg_break_prob = statistics.mean([r.break_probability for r in bundle_risks]) if bundle_risks else 0.0
-        avg_abandon_prob = statistics.mean([r.abandonment_probability for r in abandonment_risks]) if abandonment_risks else 0.0
+        for risk in risks:
+            if isinstance(risk, BundleBreakRisk):
+                bundle_count += 1
+                total_break_prob += risk.break_probability
+            else:
+                abandonment_count += 1
+                total_abandon_prob += risk.abandonment_probability
+            
+            severity = self._risk_severity(risk)
+            if severity in (RiskSeverity.HIGH, RiskSeverity.CRITICAL):
+                high_risk_count += 1
+            severity_distribution[severity.value] += 1
+            
+            total_assessment_ms += getattr(risk, 'computation_time_ms', 0)
         
-        high_risk_count = len([r for r in risks if r.break_severity in [RiskSeverity.HIGH, RiskSeverity.CRITICAL] or 
-                                           r.abandonment_severity in [RiskSeverity.HIGH, RiskSeverity.CRITICAL]])
+        total_assessments = len(risks)
+        avg_break_prob = total_break_prob / bundle_count if bundle_count else 0.0
+        avg_abandon_prob = total_abandon_prob / abandonment_count if abandonment_count else 0.0
         
         # Risk distribution
         risk_distribution = {
-            "bundle_break": len(bundle_risks),
-            "refill_abandonment": len(abandonment_risks)
+            "bundle_break": bundle_count,
+            "refill_abandonment": abandonment_count
         }
         
-        severity_distribution = {}
-        for risk in risks:
-            severity = risk.break_severity if isinstance(risk, BundleBreakRisk) else risk.abandonment_severity
-            severity_distribution[severity.value] = severity_distribution.get(severity.value, 0) + 1
-        
         return RiskAssessmentSummary(
             assessment_timestamp=datetime.now(timezone.utc),
             model_version=self.config.model_version,
             total_assessments=total_assessments,
             risk_distribution=risk_distribution,
-            severity_distribution=severity_distribution,
+            severity_distribution=dict(severity_distribution),
             avg_break_probability=avg_break_prob,
             avg_abandonment_probability=avg_abandon_prob,
             high_risk_count=high_risk_count,
-            assessment_time_ms=sum(r.computation_time_ms for r in risks if hasattr(r, 'computation_time_ms'))
+            assessment_time_ms=total_assessment_ms
         )
@@ -3,7 +3,7 @@ Helpers to derive snapshots and metrics from synthetic events.
 """
 
 from datetime import datetime, timezone
-from typing import Iterable, List, Tuple
+from typing import Iterable, Tuple
 
 from ..models.events import BaseCanonicalEvent, EventType
 from ..models.metrics import (
@@ -17,33 +17,57 @@ from ..models.metrics import (
 from ..models.snapshots import RefillSnapshot, SnapshotStage, PAState, BundleTimingState
 
 
+# Event type prefix -> RefillSnapshot counter field
+_EVENT_COUNT_FIELDS = {
+    "refill": "refill_events",
+    "pa": "pa_events",
+    "oos": "oos_events",
+    "bundle": "bundle_events",
+}
+
+
 def build_snapshot(events: Iterable[BaseCanonicalEvent]) -> RefillSnapshot:
-    events_list = list(events)
-    if not events_list:
+    latest_event = earliest_event = None
+    total_events = 0
+    event_types = set()
+    event_counts = dict.fromkeys(_EVENT_COUNT_FIELDS.values(), 0)
+    # Single pass: track the time bounds, seen types and per-category counts together
+    for event in events:
+        total_events += 1
+        timestamp = event.event_timestamp
+        if latest_event is None:
+            latest_event = earliest_event = event
+        elif timestamp > latest_event.event_timestamp:
+            latest_event = event
+        elif timestamp < earliest_event.event_timestamp:
+            earliest_event = event
+        event_type = event.event_type
+        event_types.add(event_type)
+        count_field = _EVENT_COUNT_FIELDS.get(event_type.value.split("_", 1)[0])
+        if count_field is not None:
+            event_counts[count_field] += 1
+    if latest_event is None:
         raise ValueError("No events provided")
 
-    latest_event = max(events_list, key=lambda event: event.event_timestamp)
-    earliest_event = min(events_list, key=lambda event: event.event_timestamp)
-
     bundle_id = latest_event.bundle_id
     member_id = latest_event.member_id
     refill_id = latest_event.refill_id
 
-    if any(event.event_type == EventType.REFILL_SHIPPED for event in events_list):
+    if EventType.REFILL_SHIPPED in event_types:
         stage = SnapshotStage.SHIPPED
-    elif any(event.event_type == EventType.REFILL_BUNDLED for event in events_list):
+    elif EventType.REFILL_BUNDLED in event_types:
         stage = SnapshotStage.BUNDLED
-    elif any(event.event_type == EventType.REFILL_ELIGIBLE for event in events_list):
+    elif EventType.REFILL_ELIGIBLE in event_types:
         stage = SnapshotStage.ELIGIBLE
     else:
         stage = SnapshotStage.INITIATED
 
     pa_state = PAState.NOT_REQUIRED
-    if any(event.event_type == EventType.PA_SUBMITTED for event in events_list):
+    if EventType.PA_SUBMITTED in event_types:
         pa_state = PAState.PENDING
 
     bundle_timing_state = BundleTimingState.ALIGNED
-    if any(event.event_type == EventType.BUNDLE_SPLIT for event in events_list):
+    if EventType.BUNDLE_SPLIT in event_types:
         bundle_timing_state = BundleTimingState.MISALIGNED
 
     return RefillSnapshot(
@@ -55,20 +79,19 @@ def build_snapshot(events: Iterable[BaseCanonicalEvent]) -> RefillSnapshot:
         current_stage=stage,
         pa_state=pa_state,
         bundle_timing_state=bundle_timing_state,
-        total_events=len(events_list),
+        total_events=total_events,
         latest_event_timestamp=latest_event.event_timestamp,
         earliest_event_timestamp=earliest_event.event_timestamp,
-        refill_events=len([e for e in events_list if e.event_type.value.startswith("refill")]),
-        pa_events=len([e for e in events_list if e.event_type.value.startswith("pa")]),
-        oos_events=len([e for e in events_list if e.event_type.value.startswith("oos")]),
-        bundle_events=len([e for e in events_list if e.event_type.value.startswith("bundle")]),
+        **event_counts,
         initiated_timestamp=earliest_event.event_timestamp,
     )
 
 
 def build_metrics(events: Iterable[BaseCanonicalEvent]) -> BundleMetrics:
-    events_list = list(events)
-    snapshot = build_snapshot(events_list)
+    return _metrics_from_snapshot(build_snapshot(events))
+
+
+def _metrics_from_snapshot(snapshot: RefillSnapshot) -> BundleMetrics:
     bundle_health = 0.8 if snapshot.bundle_timing_state == BundleTimingState.ALIGNED else 0.4
     alignment_score = 0.8 if snapshot.bundle_timing_state == BundleTimingState.ALIGNED else 0.4
 
@@ -141,5 +164,4 @@ def build_snapshot_and_metrics(
     events: Iterable[BaseCanonicalEvent],
 ) -> Tuple[RefillSnapshot, BundleMetrics]:
     snapshot = build_snapshot(events)
-    metrics = build_metrics(events)
-    return snapshot, metrics
+    return snapshot, _metrics_from_snapshot(snapshot)
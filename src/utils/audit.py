@@ -6,8 +6,10 @@ Provides comprehensive audit trail for all event processing operations.
 
 import json
 import hashlib
+from collections import deque
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+from itertools import islice
+from typing import Deque, Dict, Any, List, Optional
 from enum import Enum
 from pydantic import BaseModel
 
@@ -72,11 +74,23 @@ class AuditRecord(BaseModel):
 class AuditLogger:
     """Immutable audit logger for PharmIQ events"""
     
-    def __init__(self):
-        self._audit_trail: List[AuditRecord] = []
+    def __init__(self, max_records: Optional[int] = None):
+        # Unbounded by default; with max_records the oldest records are evicted
+        self._audit_trail: Deque[AuditRecord] = deque(maxlen=max_records)
+        self._records_by_action: Dict[str, Deque[AuditRecord]] = {}
         self._batch_counter = 0
         self._event_counter = 0
     
+    def _append(self, record: AuditRecord) -> None:
+        """Append a record to the trail and the per-action index"""
+        trail = self._audit_trail
+        if trail.maxlen is not None and len(trail) == trail.maxlen:
+            # The evicted record is the oldest of its action as well
+            evicted = trail[0]
+            self._records_by_action[evicted.action.value].popleft()
+        trail.append(record)
+        self._records_by_action.setdefault(record.action.value, deque()).append(record)
+    
     def generate_audit_id(self, prefix: str = "audit") -> str:
         """Generate unique audit ID"""
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
@@ -103,7 +117,7 @@ class AuditLogger:
             message=f"Event received from {source_system}",
             details={"event_type": event_data.get("event_type"), "event_size": len(str(event_data))}
         )
-        self._audit_trail.append(record)
+        self._append(record)
         return record
     
     def log_event_validated(self, event_id: str, validation_result: bool, errors: Optional[List[str]] = None) -> AuditRecord:
@@ -121,7 +135,7 @@ class AuditLogger:
             message=f"Event validation {'passed' if validation_result else 'failed'}",
             details={"validation_errors": errors} if errors else None
         )
-        self._audit_trail.append(record)
+        self._append(record)
         return record
     
     def log_event_processed(self, event_id: str, processing_time_ms: int, outcome: str) -> AuditRecord:
@@ -137,7 +151,7 @@ class AuditLogger:
             details={"outcome": outcome, "processing_time_ms": processing_time_ms},
             processing_time_ms=processing_time_ms
         )
-        self._audit_trail.append(record)
+        self._append(record)
         return record
     
     def log_batch_received(self, batch_id: str, source_system: str, event_count: int) -> AuditRecord:
@@ -153,7 +167,7 @@ class AuditLogger:
             message=f"Batch received with {event_count} events",
             details={"event_count": event_count}
         )
-        self._audit_trail.append(record)
+        self._append(record)
         return record
     
     def log_batch_validated(self, batch_id: str, valid_count: int, invalid_count: int) -> AuditRecord:
@@ -170,7 +184,7 @@ class AuditLogger:
             message=f"Batch validation: {valid_count} valid, {invalid_count} invalid",
             details={"valid_count": valid_count, "invalid_count": invalid_count}
         )
-        self._audit_trail.append(record)
+        self._append(record)
         return record
     
     def log_batch_processed(self, batch_id: str, processing_time_ms: int, processed_count: int) -> AuditRecord:
@@ -186,7 +200,7 @@ class AuditLogger:
             details={"processed_count": processed_count, "processing_time_ms": processing_time_ms},
             processing_time_ms=processing_time_ms
         )
-        self._audit_trail.append(record)
+        self._append(record)
         return record
     
     def log_processing_error(self, event_id: Optional[str], batch_id: Optional[str], error: Exception, processing_time_ms: int) -> AuditRecord:
@@ -205,7 +219,7 @@ class AuditLogger:
             stack_trace=str(error.__traceback__) if error.__traceback__ else None,
             processing_time_ms=processing_time_ms
         )
-        self._audit_trail.append(record)
+        self._append(record)
         return record
     
     def get_audit_trail(self, 
@@ -215,17 +229,25 @@ class AuditLogger:
                        severity: Optional[AuditSeverity] = None,
                        limit: Optional[int] = None) -> List[AuditRecord]:
         """Get filtered audit trail"""
-        filtered_trail = self._audit_trail
+        if action:
+            # Start from the action's records instead of scanning the whole trail
+            action_key = action.value if isinstance(action, AuditAction) else action
+            filtered_trail = self._records_by_action.get(action_key, ())
+        else:
+            filtered_trail = self._audit_trail
+        
+        if limit and not (event_id or batch_id or severity):
+            # Take the newest records without copying the whole trail
+            return list(islice(reversed(filtered_trail), limit))[::-1]
         
         if event_id:
             filtered_trail = [r for r in filtered_trail if r.event_id == event_id]
         if batch_id:
             filtered_trail = [r for r in filtered_trail if r.batch_id == batch_id]
-        if action:
-            filtered_trail = [r for r in filtered_trail if r.action == action]
         if severity:
             filtered_trail = [r for r in filtered_trail if r.severity == severity]
         
+        filtered_trail = list(filtered_trail)
         if limit:
             filtered_trail = filtered_trail[-limit:]
         
@@ -265,6 +287,7 @@ class AuditLogger:
     def clear_audit_trail(self) -> None:
         """Clear audit trail (for testing only)"""
         self._audit_trail.clear()
+        self._records_by_action.clear()
         self._batch_counter = 0
         self._event_counter = 0
     
@@ -312,7 +335,7 @@ class AuditLogger:
             details={"events_count": events_count},
             processing_time_ms=processing_time_ms
         )
-        self._audit_trail.append(record)
+        self._append(record)
         return record
     
     def log_snapshot_queried(self, query_params: Dict[str, Any], results_count: int, 
@@ -328,7 +351,7 @@ class AuditLogger:
             details={"query_params": query_params, "results_count": results_count},
             processing_time_ms=processing_time_ms
         )
-        self._audit_trail.append(record)
+        self._append(record)
         return record
     
     def log_snapshot_updated(self, snapshot_id: str, member_id: str, refill_id: str,
@@ -347,7 +370,7 @@ class AuditLogger:
             message=f"Snapshot updated with event {event_id}",
             processing_time_ms=processing_time_ms
         )
-        self._audit_trail.append(record)
+        self._append(record)
         return record
     
     def log_metrics_computed(self, snapshot_id: str, member_id: str, refill_id: str,
@@ -366,7 +389,7 @@ class AuditLogger:
             details={"risk_score": risk_score},
             processing_time_ms=computation_time_ms
         )
-        self._audit_trail.append(record)
+        self._append(record)
         return record
     
     def log_metrics_queried(self, query_params: Dict[str, Any], results_count: int,
@@ -382,7 +405,7 @@ class AuditLogger:
             details={"query_params": query_params, "results_count": results_count},
             processing_time_ms=processing_time_ms
         )
-        self._audit_trail.append(record)
+        self._append(record)
         return record
     
     def log_risk_assessment(self, risk_id: str, risk_type: str, entity_id: str,
@@ -404,7 +427,7 @@ class AuditLogger:
             },
             processing_time_ms=assessment_time_ms
         )
-        self._audit_trail.append(record)
+        self._append(record)
         return record
     
     def log_risk_query(self, query_params: Dict[str, Any], results_count: int,
@@ -420,5 +443,5 @@ class AuditLogger:
             details={"query_params": query_params, "results_count": results_count},
             processing_time_ms=assessment_time_ms
         )
-        self._audit_trail.append(record)
+        self._append(record)
         return record
@@ -0,0 +1,10 @@
+"""
+Python version compatibility helpers for PharmIQ
+"""
+
+import sys
+from typing import Any, Dict
+
+
+# ``dataclass(slots=True)`` needs Python 3.10+; on 3.9 dataclasses keep a __dict__
+DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
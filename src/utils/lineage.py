@@ -27,6 +27,13 @@ class LineageValidator:
         actions: Iterable[TrackedAction],
         outcomes: Iterable[BundleOutcome],
     ) -> LineageReport:
+        # Inputs are walked twice (ID sets, then link checks), so accept one-shot iterables
+        snapshots = list(snapshots)
+        metrics = list(metrics)
+        recommendations = list(recommendations)
+        actions = list(actions)
+        outcomes = list(outcomes)
+
         event_ids = {event.event_id for event in events}
         snapshot_ids = {snapshot.snapshot_id for snapshot in snapshots}
         metrics_ids = {metric.snapshot_id for metric in metrics}
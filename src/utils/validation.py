@@ -6,12 +6,31 @@ Comprehensive validation for canonical events and batches.
 
 from datetime import datetime, timezone
 import re
+from collections import Counter
+from functools import lru_cache
 from typing import Dict, Any, List, Tuple, Optional
 from pydantic import ValidationError
 
 from src.models.events import BaseCanonicalEvent, create_canonical_event
 
 
+_SSN_PATTERN = re.compile(r"\b\d{3}-\d{2}-\d{4}\b")
+_PHONE_PATTERN = re.compile(r"\b\+?\d{10,15}\b")
+_PSEUDONYMOUS_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{8,}")
+
+
+@lru_cache(maxsize=131072)
+def _is_pseudonymous_id_cached(value: str) -> bool:
+    """Check an identifier for pseudonymity; memoized since IDs repeat across batches"""
+    if "@" in value:
+        return False
+    if _SSN_PATTERN.search(value):
+        return False
+    if _PHONE_PATTERN.search(value.replace("-", "")):
+        return False
+    return _PSEUDONYMOUS_ID_PATTERN.fullmatch(value) is not None
+
+
 class ValidationResult:
     """Validation result with errors and warnings"""
     
@@ -77,6 +96,22 @@ class EventValidator:
     
     def validate_single_event(self, event_data: Dict[str, Any]) -> ValidationResult:
         """Validate a single canonical event"""
+        result = self.validate_fields(event_data)
+        
+        # Try to create canonical event for full validation
+        if result.is_valid:
+            try:
+                canonical_event = create_canonical_event(event_data)
+                self.validate_event_specific_fields(canonical_event, result)
+            except ValidationError as e:
+                result.add_error(f"Pydantic validation failed: {str(e)}")
+            except Exception as e:
+                result.add_error(f"Event creation failed: {str(e)}")
+        
+        return result
+    
+    def validate_fields(self, event_data: Dict[str, Any]) -> ValidationResult:
+        """Validate raw event fields without building the canonical event"""
         result = ValidationResult(is_valid=True)
         
         # Check required fields
@@ -90,31 +125,16 @@ class EventValidator:
         self._validate_timestamps(event_data, result)
         self._validate_event_structure(event_data, result)
         
-        # Try to create canonical event for full validation
-        if result.is_valid:
-            try:
-                canonical_event = create_canonical_event(event_data)
-                self._validate_event_specific_fields(canonical_event, result)
-            except ValidationError as e:
-                result.add_error(f"Pydantic validation failed: {str(e)}")
-            except Exception as e:
-                result.add_error(f"Event creation failed: {str(e)}")
-        
         return result
     
     def validate_batch(self, batch_data: List[Dict[str, Any]]) -> Tuple[ValidationResult, List[Tuple[int, ValidationResult]]]:
         """Validate a batch of events"""
-        batch_result = ValidationResult(is_valid=True)
+        batch_result = self.validate_batch_structure(batch_data)
         event_results = []
         
-        # Batch-level validation
         if not batch_data:
-            batch_result.add_error("Batch is empty")
             return batch_result, event_results
         
-        if len(batch_data) > 10000:  # Configurable batch size limit
-            batch_result.add_warning(f"Large batch size: {len(batch_data)} events")
-        
         # Validate each event
         for i, event_data in enumerate(batch_data):
             event_result = self.validate_single_event(event_data)
@@ -123,13 +143,26 @@ class EventValidator:
             if not event_result.is_valid:
                 batch_result.add_warning(f"Event {i} validation failed: {'; '.join(event_result.errors)}")
         
+        return batch_result, event_results
+    
+    def validate_batch_structure(self, batch_data: List[Dict[str, Any]]) -> ValidationResult:
+        """Validate batch-level constraints (size, duplicate IDs)"""
+        batch_result = ValidationResult(is_valid=True)
+        
+        if not batch_data:
+            batch_result.add_error("Batch is empty")
+            return batch_result
+        
+        if len(batch_data) > 10000:  # Configurable batch size limit
+            batch_result.add_warning(f"Large batch size: {len(batch_data)} events")
+        
         # Check for duplicate event IDs
-        event_ids = [event.get("event_id") for event in batch_data if event.get("event_id")]
-        duplicate_ids = set([eid for eid in event_ids if event_ids.count(eid) > 1])
+        id_counts = Counter(event.get("event_id") for event in batch_data if event.get("event_id"))
+        duplicate_ids = [eid for eid, count in id_counts.items() if count > 1]
         if duplicate_ids:
             batch_result.add_error(f"Duplicate event IDs found: {', '.join(duplicate_ids)}")
         
-        return batch_result, event_results
+        return batch_result
     
     def _validate_identifiers(self, event_data: Dict[str, Any], result: ValidationResult) -> None:
         """Validate identifier fields"""
@@ -168,15 +201,9 @@ class EventValidator:
 
     @staticmethod
     def _is_pseudonymous_id(value: str) -> bool:
-        if not value:
-            return False
-        if "@" in value:
-            return False
-        if re.search(r"\b\d{3}-\d{2}-\d{4}\b", value):
-            return False
-        if re.search(r"\b\+?\d{10,15}\b", value.replace("-", "")):
+        if not value or not isinstance(value, str):
             return False
-        return re.fullmatch(r"[A-Za-z0-9_-]{8,}", value) is not None
+        return _is_pseudonymous_id_cached(value)
 
     def _validate_phi_denylist(self, event_data: Dict[str, Any], result: ValidationResult) -> None:
         for field in self.phi_denylist_fields:
@@ -292,7 +319,7 @@ class EventValidator:
                 if not isinstance(value, (int, float)) or not (0 <= value <= 1):
                     result.add_error(f"{field} must be between 0 and 1")
     
-    def _validate_event_specific_fields(self, event: BaseCanonicalEvent, result: ValidationResult) -> None:
+    def validate_event_specific_fields(self, event: BaseCanonicalEvent, result: ValidationResult) -> None:
         """Validate event-type specific fields"""
         event_type = event.event_type.value
         
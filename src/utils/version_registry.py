@@ -42,6 +42,10 @@ class VersionRegistry:
         self._type_index.setdefault(artifact_type, []).append(record_id)
         return record
 
+    def bulk_register(self, entries: Iterable[dict]) -> List[VersionRecord]:
+        """Register many artifacts; each entry holds register() keyword arguments."""
+        return [self.register(**entry) for entry in entries]
+
     def get(self, record_id: str) -> Optional[VersionRecord]:
         return self._records.get(record_id)
 
@@ -53,3 +57,9 @@ class VersionRegistry:
 
     def all_records(self) -> Iterable[VersionRecord]:
         return self._records.values()
+
+    def clear(self) -> None:
+        """Drop all records and their indexes, keeping the registry usable."""
+        self._records.clear()
+        self._artifact_index.clear()
+        self._type_index.clear()
@@ -15,16 +15,28 @@ from src.models.events import (
     OSEvent,
     BundleEvent
 )
+from src.ingestion.api import create_ingestion_api
+
+
+@pytest.fixture(scope="session")
+def real_api_app():
+    """Ingestion API app with a real processor, built once per session"""
+    return create_ingestion_api()
+
+
+SAMPLE_UTC_DATETIME = datetime(2024, 1, 15, 10, 30, 0, tzinfo=timezone.utc)
 
 
 @pytest.fixture
 def sample_utc_datetime():
     """Sample UTC datetime for testing"""
-    return datetime(2024, 1, 15, 10, 30, 0, tzinfo=timezone.utc)
+    return SAMPLE_UTC_DATETIME
 
 
-@pytest.fixture
-def base_event_data(sample_utc_datetime):
+# The sample event payloads are built once per session. They are plain dicts
+# so they can be sent as JSON request bodies; tests copy before modifying.
+@pytest.fixture(scope="session")
+def base_event_data():
     """Base event data for testing"""
     return {
         "event_id": "evt_1234567890abcdef",
@@ -33,11 +45,11 @@ def base_event_data(sample_utc_datetime):
         "bundle_id": "bun_1234567890abcdef",
         "event_type": "refill_initiated",
         "event_source": "centersync",
-        "event_timestamp": sample_utc_datetime.isoformat(),
-        "received_timestamp": sample_utc_datetime.isoformat(),
+        "event_timestamp": SAMPLE_UTC_DATETIME.isoformat(),
+        "received_timestamp": SAMPLE_UTC_DATETIME.isoformat(),
         "source_event_id": "src_evt_123",
         "source_system": "centersync_v2",
-        "source_timestamp": sample_utc_datetime.isoformat(),
+        "source_timestamp": SAMPLE_UTC_DATETIME.isoformat(),
         "bundle_member_count": 3,
         "bundle_refill_count": 5,
         "bundle_sequence": 2,
@@ -47,8 +59,8 @@ def base_event_data(sample_utc_datetime):
     }
 
 
-@pytest.fixture
-def sample_refill_event_data(base_event_data, sample_utc_datetime):
+@pytest.fixture(scope="session")
+def sample_refill_event_data(base_event_data):
     """Sample refill event data"""
     return {
         **base_event_data,
@@ -60,9 +72,9 @@ def sample_refill_event_data(base_event_data, sample_utc_datetime):
         "drug_name": "Lisinopril",
         "days_supply": 30,
         "quantity": 10.0,
-        "refill_due_date": sample_utc_datetime.isoformat(),
-        "ship_by_date": sample_utc_datetime.isoformat(),
-        "last_fill_date": sample_utc_datetime.isoformat(),
+        "refill_due_date": SAMPLE_UTC_DATETIME.isoformat(),
+        "ship_by_date": SAMPLE_UTC_DATETIME.isoformat(),
+        "last_fill_date": SAMPLE_UTC_DATETIME.isoformat(),
         "refill_status": "eligible",
         "source_status": "ELIGIBLE_FOR_BUNDLING",
         "days_until_due": 5,
@@ -71,8 +83,8 @@ def sample_refill_event_data(base_event_data, sample_utc_datetime):
     }
 
 
-@pytest.fixture
-def sample_pa_event_data(base_event_data, sample_utc_datetime):
+@pytest.fixture(scope="session")
+def sample_pa_event_data(base_event_data):
     """Sample PA event data"""
     return {
         **base_event_data,
@@ -82,9 +94,9 @@ def sample_pa_event_data(base_event_data, sample_utc_datetime):
         "event_type": "pa_approved",
         "pa_status": "approved",
         "pa_type": "renewal",
-        "pa_submitted_date": sample_utc_datetime.isoformat(),
-        "pa_response_date": sample_utc_datetime.isoformat(),
-        "pa_expiry_date": sample_utc_datetime.isoformat(),
+        "pa_submitted_date": SAMPLE_UTC_DATETIME.isoformat(),
+        "pa_response_date": SAMPLE_UTC_DATETIME.isoformat(),
+        "pa_expiry_date": SAMPLE_UTC_DATETIME.isoformat(),
         "pa_processing_days": 2,
         "pa_validity_days": 365,
         "pa_reason_code": "J45.909",
@@ -93,8 +105,8 @@ def sample_pa_event_data(base_event_data, sample_utc_datetime):
     }
 
 
-@pytest.fixture
-def sample_oos_event_data(base_event_data, sample_utc_datetime):
+@pytest.fixture(scope="session")
+def sample_oos_event_data(base_event_data):
     """Sample OOS event data"""
     return {
         **base_event_data,
@@ -104,18 +116,18 @@ def sample_oos_event_data(base_event_data, sample_utc_datetime):
         "event_type": "oos_detected",
         "oos_status": "detected",
         "oos_reason": "manufacturer_shortage",
-        "oos_detected_date": sample_utc_datetime.isoformat(),
+        "oos_detected_date": SAMPLE_UTC_DATETIME.isoformat(),
         "oos_resolved_date": None,
         "oos_duration_days": None,
-        "estimated_resupply_date": sample_utc_datetime.isoformat(),
+        "estimated_resupply_date": SAMPLE_UTC_DATETIME.isoformat(),
         "affected_quantity": 100.0,
         "alternative_available": False,
         "source_oos_id": "oos_123456789"
     }
 
 
-@pytest.fixture
-def sample_bundle_event_data(base_event_data, sample_utc_datetime):
+@pytest.fixture(scope="session")
+def sample_bundle_event_data(base_event_data):
     """Sample bundle event data"""
     return {
         **base_event_data,
@@ -125,8 +137,8 @@ def sample_bundle_event_data(base_event_data, sample_utc_datetime):
         "event_type": "bundle_formed",
         "bundle_type": "standard",
         "bundle_strategy": "timing_optimized",
-        "bundle_formed_date": sample_utc_datetime.isoformat(),
-        "bundle_ship_date": sample_utc_datetime.isoformat(),
+        "bundle_formed_date": SAMPLE_UTC_DATETIME.isoformat(),
+        "bundle_ship_date": SAMPLE_UTC_DATETIME.isoformat(),
         "member_refills": [
             {"member_id": "mem_12345678abcd", "refill_id": "ref_4567890abcd"},
             {"member_id": "mem_7890abcd1234", "refill_id": "ref_01234567abcd"}
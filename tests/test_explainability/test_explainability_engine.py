@@ -24,13 +24,14 @@ from src.models.risk import (
 from src.models.explainability import ExplanationQuery, ExplanationType
 
 
+_FIXED_TS = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
 def build_metrics(bundle_id: str) -> BundleMetrics:
-    timestamp = datetime.now(timezone.utc)
     return BundleMetrics(
         snapshot_id="snap_1",
         member_id="mem_1",
         refill_id="ref_1",
-        computed_timestamp=timestamp,
+        computed_timestamp=_FIXED_TS,
         metrics_version="1.0",
         age_in_stage=AgeInStageMetrics(
             current_stage="pa_pending",
@@ -114,7 +115,6 @@ def build_recommendation() -> RiskRecommendation:
 
 
 def build_bundle_break_risk(bundle_id: str) -> BundleBreakRisk:
-    now = datetime.now(timezone.utc)
     drivers = [
         build_driver(RiskDriverType.TIMING_MISALIGNMENT, 0.75),
         build_driver(RiskDriverType.STAGE_AGING, 0.6),
@@ -122,7 +122,7 @@ def build_bundle_break_risk(bundle_id: str) -> BundleBreakRisk:
     return BundleBreakRisk(
         risk_id="risk_break_1",
         bundle_id=bundle_id,
-        assessment_timestamp=now,
+        assessment_timestamp=_FIXED_TS,
         model_version="1.0",
         break_probability=0.75,
         break_severity=RiskSeverity.HIGH,
@@ -139,13 +139,12 @@ def build_bundle_break_risk(bundle_id: str) -> BundleBreakRisk:
 
 
 def build_abandonment_risk() -> RefillAbandonmentRisk:
-    now = datetime.now(timezone.utc)
     drivers = [build_driver(RiskDriverType.REFILL_GAP_ANOMALY, 0.7)]
     return RefillAbandonmentRisk(
         risk_id="risk_abandon_1",
         refill_id="ref_1",
         member_id="mem_1",
-        assessment_timestamp=now,
+        assessment_timestamp=_FIXED_TS,
         model_version="1.0",
         abandonment_probability=0.7,
         abandonment_severity=RiskSeverity.HIGH,
@@ -163,11 +162,33 @@ def build_abandonment_risk() -> RefillAbandonmentRisk:
     )
 
 
+@pytest.fixture(scope="module")
+def shared_metrics() -> BundleMetrics:
+    return build_metrics("bundle_1")
+
+
+@pytest.fixture(scope="module")
+def shared_break_risk() -> BundleBreakRisk:
+    return build_bundle_break_risk("bundle_1")
+
+
+@pytest.fixture(scope="module")
+def shared_abandon_risk() -> RefillAbandonmentRisk:
+    return build_abandonment_risk()
+
+
+@pytest.fixture(scope="module")
+def explained_engine(shared_metrics, shared_break_risk) -> BundleRiskExplainabilityEngine:
+    engine = BundleRiskExplainabilityEngine()
+    engine.explain_bundle_break(shared_break_risk, shared_metrics)
+    return engine
+
+
 class TestExplainabilityEngine:
-    def test_explain_bundle_break(self):
+    def test_explain_bundle_break(self, shared_metrics, shared_break_risk):
         engine = BundleRiskExplainabilityEngine()
-        metrics = build_metrics("bundle_1")
-        risk = build_bundle_break_risk("bundle_1")
+        metrics = shared_metrics
+        risk = shared_break_risk
 
         explanation = engine.explain_bundle_break(risk, metrics)
 
@@ -179,10 +200,10 @@ class TestExplainabilityEngine:
         assert 0 <= explanation.overall_confidence <= 1
         assert 0 <= explanation.explanation_completeness <= 1
 
-    def test_explain_abandonment(self):
+    def test_explain_abandonment(self, shared_metrics, shared_abandon_risk):
         engine = BundleRiskExplainabilityEngine()
-        metrics = build_metrics("bundle_1")
-        risk = build_abandonment_risk()
+        metrics = shared_metrics
+        risk = shared_abandon_risk
 
         explanation = engine.explain_abandonment(risk, metrics)
 
@@ -190,36 +211,25 @@ class TestExplainabilityEngine:
         assert explanation.primary_drivers
         assert explanation.key_takeaways
 
-    def test_query_explanations(self):
-        engine = BundleRiskExplainabilityEngine()
-        metrics = build_metrics("bundle_1")
-        risk = build_bundle_break_risk("bundle_1")
-        engine.explain_bundle_break(risk, metrics)
-
-        query = ExplanationQuery(bundle_ids=["bundle_1"], limit=10, offset=0)
-        result = engine.query_explanations(query)
-
-        assert result.total_count == 1
-        assert result.explanations
-
-    def test_query_confidence_threshold(self):
-        engine = BundleRiskExplainabilityEngine()
-        metrics = build_metrics("bundle_1")
-        risk = build_bundle_break_risk("bundle_1")
-        engine.explain_bundle_break(risk, metrics)
-
-        query = ExplanationQuery(confidence_threshold=0.9)
-        result = engine.query_explanations(query)
-
-        assert result.total_count in (0, 1)
-
-    def test_query_risk_type(self):
-        engine = BundleRiskExplainabilityEngine()
-        metrics = build_metrics("bundle_1")
-        risk = build_bundle_break_risk("bundle_1")
-        engine.explain_bundle_break(risk, metrics)
-
-        query = ExplanationQuery(risk_types=["bundle_break"])
-        result = engine.query_explanations(query)
+    @pytest.mark.parametrize(
+        "query, check",
+        [
+            (
+                ExplanationQuery(bundle_ids=["bundle_1"], limit=10, offset=0),
+                lambda result: result.total_count == 1 and result.explanations,
+            ),
+            (
+                ExplanationQuery(confidence_threshold=0.9),
+                lambda result: result.total_count in (0, 1),
+            ),
+            (
+                ExplanationQuery(risk_types=["bundle_break"]),
+                lambda result: result.total_count == 1,
+            ),
+        ],
+        ids=["bundle_ids", "confidence_threshold", "risk_type"],
+    )
+    def test_query_explanations(self, explained_engine, query, check):
+        result = explained_engine.query_explanations(query)
 
-        assert result.total_count == 1
+        assert check(result)
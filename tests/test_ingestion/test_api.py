@@ -3,62 +3,157 @@ Tests for ingestion API endpoints.
 """
 
 import pytest
+import pytest_asyncio
+import httpx
 import json
+from dataclasses import replace
 from datetime import datetime, timezone
-from unittest.mock import Mock, patch, AsyncMock
 from fastapi.testclient import TestClient
 from fastapi import status
 
-from src.ingestion.api import IngestionAPI, create_ingestion_api
+from src.ingestion.api import IngestionAPI
 from src.ingestion.processors import ProcessingResult
-from src.models.events import EventType, EventSource
+
+
+_FIXED_TS = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_TS_ISO = _FIXED_TS.isoformat()
+
+# Static request bodies are serialized once and posted as raw bytes
+_JSON_HEADERS = {"content-type": "application/json"}
+_INVALID_EVENT_BODY = json.dumps({
+    "event_data": {"invalid": "data"},
+    "source_system": "test_system"
+}).encode()
+_MINIMAL_EVENT_BODY = json.dumps({
+    "event_data": {"event_id": "test_event_1234567890"},
+    "source_system": "test_system"
+}).encode()
+_MINIMAL_BATCH_BODY = json.dumps({
+    "events": [{"event_id": "test_event_1234567890"}],
+    "source_system": "test_system"
+}).encode()
+_AUDIT_TRAIL_BODY = json.dumps({"event_id": "test_event_123", "limit": 10}).encode()
+_INVALID_ACTION_BODY = json.dumps({"action": "invalid_action", "limit": 10}).encode()
+
+# Batch larger than the limit; the server rejects on size alone, so the
+# payload is serialized once at import rather than on every run.
+_LARGE_BATCH_BYTES = json.dumps({
+    "events": [{"event_id": f"evt_{i:010d}", "member_id": f"mem_{i:010d}",
+                "refill_id": f"ref_{i:010d}", "event_type": "refill_initiated",
+                "event_source": "centersync", "event_timestamp": _TS_ISO,
+                "received_timestamp": _TS_ISO}
+               for i in range(10001)],
+    "source_system": "test_system",
+    "batch_size_limit": 10000
+}).encode()
+
+# Shared processor results; variants are derived with dataclasses.replace
+_OK = ProcessingResult(
+    success=True,
+    processed_events=[],
+    validation_errors=[],
+    processing_errors=[],
+    processing_time_ms=50
+)
+_OK_BATCH = replace(_OK, processing_time_ms=100, batch_id="test_batch_123")
+
+
+class _AuditRecord:
+    """Audit record stand-in exposing only to_dict()"""
+    
+    __slots__ = ("data",)
+    
+    def __init__(self, data):
+        self.data = data
+    
+    def to_dict(self):
+        return self.data
+
+
+class _FakeAuditLogger:
+    """Audit logger stand-in returning canned values"""
+    
+    def __init__(self):
+        self.audit_trail = []
+        self.export_data = {}
+    
+    def get_audit_trail(self, **filters):
+        return self.audit_trail
+    
+    def export_audit_trail(self, format="json"):
+        return self.export_data
+
+
+def _raising(error):
+    """Build a processor method stand-in that raises ``error`` directly"""
+    def _raise(*args, **kwargs):
+        raise error
+    return _raise
+
+
+class _FakeProcessor:
+    """Event processor stand-in returning pre-built results"""
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Drop per-test method overrides and restore default canned results"""
+        self.__dict__.clear()
+        self.audit_logger = _FakeAuditLogger()
+        self.process_single_event_result = _OK
+        self.process_batch_result = _OK_BATCH
+        self.processing_statistics = {"total_records": 0}
+        self.batch_details = {"batch_id": "test_batch_123"}
+        self.event_lineage = []
+    
+    def process_single_event(self, event_data, source_system=None):
+        return self.process_single_event_result
+    
+    def process_batch(self, batch_data, source_system=None):
+        return self.process_batch_result
+    
+    def get_processing_statistics(self):
+        return self.processing_statistics
+    
+    def get_batch_details(self, batch_id):
+        return self.batch_details
+    
+    def get_event_lineage(self, event_id):
+        return self.event_lineage
 
 
 class TestIngestionAPI:
     """Test IngestionAPI class and endpoints"""
     
     @pytest.fixture
-    def api_client(self):
+    def api_client(self, real_api_app):
         """Create test client for API"""
-        app = create_ingestion_api()
-        return TestClient(app)
+        return TestClient(real_api_app)
     
-    @pytest.fixture
-    def mock_processor(self):
-        """Create mock event processor"""
-        processor = Mock()
-        processor.process_single_event = Mock(return_value=ProcessingResult(
-            success=True,
-            processed_events=[],
-            validation_errors=[],
-            processing_errors=[],
-            processing_time_ms=50
-        ))
-        processor.process_batch = Mock(return_value=ProcessingResult(
-            success=True,
-            processed_events=[],
-            validation_errors=[],
-            processing_errors=[],
-            processing_time_ms=100,
-            batch_id="test_batch_123"
-        ))
-        processor.audit_logger = Mock()
-        processor.audit_logger.get_audit_trail = Mock(return_value=[])
-        processor.get_processing_statistics = Mock(return_value={"total_records": 0})
-        processor.get_batch_details = Mock(return_value={"batch_id": "test_batch_123"})
-        processor.get_event_lineage = Mock(return_value=[])
-        return processor
+    @pytest.fixture(scope="class")
+    def fake_api(self):
+        """Build the API around a fake processor once for the class"""
+        return IngestionAPI(processor=_FakeProcessor())
     
     @pytest.fixture
-    def api_client_with_mock(self, mock_processor):
-        """Create test client with mocked processor"""
-        api = IngestionAPI(processor=mock_processor)
-        return TestClient(api.get_app()), api
+    def mock_processor(self, fake_api):
+        """Reset and return the shared fake event processor"""
+        fake_api.processor.reset()
+        return fake_api.processor
     
-    def test_ingest_single_event_success(self, api_client_with_mock, sample_refill_event_data):
+    @pytest_asyncio.fixture
+    async def api_client_with_mock(self, fake_api, mock_processor):
+        """Create async client bound in-process to the app with fake processor"""
+        transport = httpx.ASGITransport(app=fake_api.get_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client, fake_api
+    
+    @pytest.mark.asyncio
+    async def test_ingest_single_event_success(self, api_client_with_mock, sample_refill_event_data):
         """Test successful single event ingestion"""
         client, api = api_client_with_mock
-        response = client.post(
+        response = await client.post(
             "/ingest/event",
             json={
                 "event_data": sample_refill_event_data,
@@ -74,64 +169,74 @@ class TestIngestionAPI:
         assert len(data["validation_errors"]) == 0
         assert len(data["processing_errors"]) == 0
     
-    def test_ingest_single_event_validation_error(self, api_client_with_mock):
-        """Test single event ingestion with validation error"""
-        client, api = api_client_with_mock
-        # Mock processor to return validation error
-        api.processor.process_single_event.return_value = ProcessingResult(
-            success=False,
-            processed_events=[],
-            validation_errors=[{"errors": ["Missing required field"]}],
-            processing_errors=[{"error": "Processing failed"}],
-            processing_time_ms=25
-        )
-        
-        response = client.post(
-            "/ingest/event",
-            json={
-                "event_data": {"invalid": "data"},
-                "source_system": "test_system"
-            }
-        )
-        
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert data["success"] is False
-        assert len(data["validation_errors"]) == 1
-        assert "Missing required field" in str(data["validation_errors"])
-    
-    def test_ingest_single_event_processing_error(self, api_client_with_mock):
-        """Test single event ingestion with processing error"""
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "outcome, body, expected_status, error_field, needle",
+        [
+            (
+                replace(
+                    _OK,
+                    success=False,
+                    validation_errors=[{"errors": ["Missing required field"]}],
+                    processing_errors=[{"error": "Processing failed"}],
+                    processing_time_ms=25
+                ),
+                _INVALID_EVENT_BODY,
+                status.HTTP_200_OK,
+                "validation_errors",
+                "Missing required field"
+            ),
+            (
+                replace(
+                    _OK,
+                    success=False,
+                    processing_errors=[{"event_id": "test", "error": "Processing failed"}],
+                    processing_time_ms=15
+                ),
+                _MINIMAL_EVENT_BODY,
+                status.HTTP_200_OK,
+                "processing_errors",
+                "Processing failed"
+            ),
+            (
+                Exception("Server error"),
+                _MINIMAL_EVENT_BODY,
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "detail",
+                "Event ingestion failed"
+            ),
+        ],
+        ids=["validation_error", "processing_error", "server_error"]
+    )
+    async def test_ingest_single_event_errors(self, api_client_with_mock, outcome, body,
+                                              expected_status, error_field, needle):
+        """Test single event ingestion error paths"""
         client, api = api_client_with_mock
-        # Mock processor to return processing error
-        api.processor.process_single_event.return_value = ProcessingResult(
-            success=False,
-            processed_events=[],
-            validation_errors=[],
-            processing_errors=[{"event_id": "test", "error": "Processing failed"}],
-            processing_time_ms=15
-        )
+        if isinstance(outcome, Exception):
+            api.processor.process_single_event = _raising(outcome)
+        else:
+            api.processor.process_single_event_result = outcome
         
-        response = client.post(
+        response = await client.post(
             "/ingest/event",
-            json={
-                "event_data": {"event_id": "test_event_1234567890"},
-                "source_system": "test_system"
-            }
+            content=body,
+            headers=_JSON_HEADERS
         )
         
-        assert response.status_code == status.HTTP_200_OK
+        assert response.status_code == expected_status
         data = response.json()
-        assert data["success"] is False
-        assert len(data["processing_errors"]) == 1
-        assert "Processing failed" in data["processing_errors"][0]
+        if expected_status == status.HTTP_200_OK:
+            assert data["success"] is False
+            assert len(data[error_field]) == 1
+        assert needle in str(data[error_field])
     
-    def test_ingest_batch_success(self, api_client_with_mock, sample_refill_event_data, sample_pa_event_data):
+    @pytest.mark.asyncio
+    async def test_ingest_batch_success(self, api_client_with_mock, sample_refill_event_data, sample_pa_event_data):
         """Test successful batch ingestion"""
         client, api = api_client_with_mock
         batch_data = [sample_refill_event_data, sample_pa_event_data]
         
-        response = client.post(
+        response = await client.post(
             "/ingest/batch",
             json={
                 "events": batch_data,
@@ -144,53 +249,42 @@ class TestIngestionAPI:
         data = response.json()
         assert data["success"] is True
         assert data["total_events"] == 2
-        assert data["processed_events"] == 0  # Mock returns empty
+        assert data["processed_events"] == 0  # Fake returns empty
         assert data["validation_errors"] == 0
         assert data["processing_errors"] == 0
         assert data["batch_id"] == "test_batch_123"
         assert data["processing_time_ms"] >= 0
     
-    def test_ingest_batch_size_limit_exceeded(self, api_client_with_mock):
+    @pytest.mark.asyncio
+    async def test_ingest_batch_size_limit_exceeded(self, api_client_with_mock):
         """Test batch ingestion with size limit exceeded"""
         client, api = api_client_with_mock
-        # Create batch larger than limit
-        large_batch = [{"event_id": f"evt_{i:010d}", "member_id": f"mem_{i:010d}", 
-                        "refill_id": f"ref_{i:010d}", "event_type": "refill_initiated",
-                        "event_source": "centersync", "event_timestamp": datetime.now(timezone.utc).isoformat(),
-                        "received_timestamp": datetime.now(timezone.utc).isoformat()} 
-                       for i in range(10001)]
-        
-        response = client.post(
+        response = await client.post(
             "/ingest/batch",
-            json={
-                "events": large_batch,
-                "source_system": "test_system",
-                "batch_size_limit": 10000
-            }
+            content=_LARGE_BATCH_BYTES,
+            headers=_JSON_HEADERS
         )
         
         assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
         assert "exceeds limit" in response.json()["detail"]
     
-    def test_ingest_batch_validation_errors(self, api_client_with_mock):
+    @pytest.mark.asyncio
+    async def test_ingest_batch_validation_errors(self, api_client_with_mock):
         """Test batch ingestion with validation errors"""
         client, api = api_client_with_mock
-        # Mock processor to return validation errors
-        api.processor.process_batch.return_value = ProcessingResult(
+        # Configure processor to return validation errors
+        api.processor.process_batch_result = replace(
+            _OK_BATCH,
             success=False,
-            processed_events=[],
             validation_errors=[{"event_id": "test1", "errors": ["Invalid field"]}],
-            processing_errors=[],
             processing_time_ms=75,
             batch_id="test_batch_456"
         )
         
-        response = client.post(
+        response = await client.post(
             "/ingest/batch",
-            json={
-                "events": [{"event_id": "test_event_1234567890"}],
-                "source_system": "test_system"
-            }
+            content=_MINIMAL_BATCH_BODY,
+            headers=_JSON_HEADERS
         )
         
         assert response.status_code == status.HTTP_200_OK
@@ -200,10 +294,11 @@ class TestIngestionAPI:
         assert len(data["invalid_events"]) == 1
         assert "Invalid field" in data["invalid_events"][0]["errors"][0]
     
-    def test_health_check(self, api_client_with_mock):
+    @pytest.mark.asyncio
+    async def test_health_check(self, api_client_with_mock):
         """Test healthy health check"""
         client, api = api_client_with_mock
-        response = client.get("/health")
+        response = await client.get("/health")
         
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
@@ -212,35 +307,35 @@ class TestIngestionAPI:
         assert data["version"] == "0.1.0"
         assert "audit_stats" in data
     
-    def test_health_check_unhealthy(self, api_client_with_mock):
+    @pytest.mark.asyncio
+    async def test_health_check_unhealthy(self, api_client_with_mock):
         """Test unhealthy health check"""
         client, api = api_client_with_mock
-        # Mock processor to raise exception
-        api.processor.get_processing_statistics.side_effect = Exception("Health check failed")
+        # Configure processor to raise exception
+        api.processor.get_processing_statistics = _raising(Exception("Health check failed"))
         
-        response = client.get("/health")
+        response = await client.get("/health")
         
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert data["status"] == "unhealthy"
         assert "error" in data["audit_stats"]
     
-    def test_get_audit_trail_success(self, api_client_with_mock):
+    @pytest.mark.asyncio
+    async def test_get_audit_trail_success(self, api_client_with_mock):
         """Test successful audit trail retrieval"""
         client, api = api_client_with_mock
-        # Mock audit trail
+        # Canned audit trail
         mock_records = [
-            Mock(to_dict=lambda: {"audit_id": "audit_1", "action": "event_received"}),
-            Mock(to_dict=lambda: {"audit_id": "audit_2", "action": "event_processed"})
+            _AuditRecord({"audit_id": "audit_1", "action": "event_received"}),
+            _AuditRecord({"audit_id": "audit_2", "action": "event_processed"})
         ]
-        api.processor.audit_logger.get_audit_trail.return_value = mock_records
+        api.processor.audit_logger.audit_trail = mock_records
         
-        response = client.post(
+        response = await client.post(
             "/audit/trail",
-            json={
-                "event_id": "test_event_123",
-                "limit": 10
-            }
+            content=_AUDIT_TRAIL_BODY,
+            headers=_JSON_HEADERS
         )
         
         assert response.status_code == status.HTTP_200_OK
@@ -250,31 +345,31 @@ class TestIngestionAPI:
         assert data["total_records"] == 2
         assert data["filters_applied"]["event_id"] == "test_event_123"
     
-    def test_get_audit_trail_invalid_action(self, api_client_with_mock):
+    @pytest.mark.asyncio
+    async def test_get_audit_trail_invalid_action(self, api_client_with_mock):
         """Test audit trail retrieval with invalid action"""
         client, api = api_client_with_mock
-        response = client.post(
+        response = await client.post(
             "/audit/trail",
-            json={
-                "action": "invalid_action",
-                "limit": 10
-            }
+            content=_INVALID_ACTION_BODY,
+            headers=_JSON_HEADERS
         )
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "Invalid action" in response.json()["detail"]
     
-    def test_get_event_lineage_success(self, api_client_with_mock):
+    @pytest.mark.asyncio
+    async def test_get_event_lineage_success(self, api_client_with_mock):
         """Test successful event lineage retrieval"""
         client, api = api_client_with_mock
-        # Mock lineage
+        # Canned lineage
         mock_lineage = [
             {"audit_id": "audit_1", "action": "event_received", "event_id": "test_event"},
             {"audit_id": "audit_2", "action": "event_processed", "event_id": "test_event"}
         ]
-        api.processor.get_event_lineage.return_value = mock_lineage
+        api.processor.event_lineage = mock_lineage
         
-        response = client.get("/audit/event/test_event/lineage")
+        response = await client.get("/audit/event/test_event/lineage")
         
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
@@ -282,7 +377,8 @@ class TestIngestionAPI:
         assert len(data["lineage"]) == 2
         assert data["total_records"] == 2
     
-    def test_get_batch_details_success(self, api_client_with_mock):
+    @pytest.mark.asyncio
+    async def test_get_batch_details_success(self, api_client_with_mock):
         """Test successful batch details retrieval"""
         client, api = api_client_with_mock
         mock_details = {
@@ -290,16 +386,17 @@ class TestIngestionAPI:
             "total_records": 5,
             "actions": ["batch_received", "batch_processed"]
         }
-        api.processor.get_batch_details.return_value = mock_details
+        api.processor.batch_details = mock_details
         
-        response = client.get("/audit/batch/test_batch_123")
+        response = await client.get("/audit/batch/test_batch_123")
         
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert data["batch_id"] == "test_batch_123"
         assert data["total_records"] == 5
     
-    def test_get_processing_statistics_success(self, api_client_with_mock):
+    @pytest.mark.asyncio
+    async def test_get_processing_statistics_success(self, api_client_with_mock):
         """Test successful processing statistics retrieval"""
         client, api = api_client_with_mock
         mock_stats = {
@@ -309,61 +406,45 @@ class TestIngestionAPI:
             "failed_processing": 2,
             "success_rate": 0.95
         }
-        api.processor.get_processing_statistics.return_value = mock_stats
+        api.processor.processing_statistics = mock_stats
         
-        response = client.get("/stats")
+        response = await client.get("/stats")
         
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert data["total_records"] == 100
         assert data["success_rate"] == 0.95
     
-    def test_export_audit_trail_success(self, api_client_with_mock):
+    @pytest.mark.asyncio
+    async def test_export_audit_trail_success(self, api_client_with_mock):
         """Test successful audit trail export"""
         client, api = api_client_with_mock
-        # Mock export
-        api.processor.audit_logger.export_audit_trail.return_value = {"test": "data"}
+        # Canned export
+        api.processor.audit_logger.export_data = {"test": "data"}
         
-        response = client.get("/audit/export?format=json")
+        response = await client.get("/audit/export?format=json")
         
         assert response.status_code == status.HTTP_200_OK
         assert response.headers["content-disposition"] == "attachment; filename=audit_trail.json"
         assert response.json() == {"test": "data"}
     
-    def test_export_audit_trail_invalid_format(self, api_client_with_mock):
+    @pytest.mark.asyncio
+    async def test_export_audit_trail_invalid_format(self, api_client_with_mock):
         """Test audit trail export with invalid format"""
         client, api = api_client_with_mock
-        response = client.get("/audit/export?format=xml")
+        response = await client.get("/audit/export?format=xml")
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "Unsupported format" in response.json()["detail"]
-    
-    def test_server_error_handling(self, api_client_with_mock):
-        """Test server error handling"""
-        client, api = api_client_with_mock
-        # Mock processor to raise exception
-        api.processor.process_single_event.side_effect = Exception("Server error")
-        
-        response = client.post(
-            "/ingest/event",
-            json={
-                "event_data": {"event_id": "test_event_1234567890"},
-                "source_system": "test_system"
-            }
-        )
-        
-        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-        assert "Event ingestion failed" in response.json()["detail"]
 
 
 class TestAPIIntegration:
     """Integration tests for API with real processor"""
     
     @pytest.fixture
-    def integration_client(self):
+    def integration_client(self, real_api_app):
         """Create test client with real processor"""
-        app = create_ingestion_api()
-        return TestClient(app)
+        return TestClient(real_api_app)
     
     def test_integration_single_event(self, integration_client, sample_refill_event_data):
         """Integration test for single event ingestion"""
@@ -3,13 +3,14 @@ Tests for event processing logic.
 """
 
 import pytest
+import json
 from datetime import datetime, timezone
 from unittest.mock import Mock, patch
 
 from src.ingestion.processors import EventProcessor, ProcessingResult
 from src.utils.audit import AuditLogger, AuditAction
 from src.utils.validation import EventValidator
-from src.models.events import EventType, EventSource
+from src.models.events import EventType, EventSource, create_canonical_event
 
 
 class TestEventProcessor:
@@ -111,6 +112,20 @@ class TestEventProcessor:
             assert len(result.processing_errors) == 1
             assert "Test error" in result.processing_errors[0]["error"]
     
+    def test_process_single_event_builds_canonical_event_once(self, sample_refill_event_data):
+        """Test the canonical event built during validation is reused"""
+        processor = EventProcessor()
+        
+        with patch('src.ingestion.processors.create_canonical_event',
+                   wraps=create_canonical_event) as builder:
+            result = processor.process_single_event(
+                event_data=sample_refill_event_data,
+                source_system="test_system"
+            )
+        
+        assert result.success is True
+        assert builder.call_count == 1
+    
     def test_process_batch_valid_events(self, sample_refill_event_data, sample_pa_event_data):
         """Test processing batch of valid events"""
         processor = EventProcessor()
@@ -157,6 +172,35 @@ class TestEventProcessor:
         assert len(result.processing_errors) == 0
         assert result.batch_id is not None
     
+    def test_process_batch_raw_json(self, sample_refill_event_data, sample_pa_event_data):
+        """Test processing batch supplied as a raw JSON array"""
+        processor = EventProcessor()
+        
+        payload = json.dumps([sample_refill_event_data, sample_pa_event_data]).encode()
+        
+        result = processor.process_batch(
+            batch_data=payload,
+            source_system="test_system"
+        )
+        
+        assert result.success is True
+        assert len(result.processed_events) == 2
+        assert result.batch_id is not None
+    
+    def test_process_batch_without_retaining_events(self, sample_refill_event_data, sample_pa_event_data):
+        """Test counting processed events without retaining them"""
+        processor = EventProcessor()
+        
+        result = processor.process_batch(
+            batch_data=[sample_refill_event_data, sample_pa_event_data],
+            source_system="test_system",
+            retain_events=False
+        )
+        
+        assert result.success is True
+        assert result.processed_count == 2
+        assert len(result.processed_events) == 0
+    
     def test_process_batch_empty(self):
         """Test processing empty batch"""
         processor = EventProcessor()
@@ -156,12 +156,7 @@ class TestBundleDetector:
     def test_find_recent_member_bundles(self, detector, sample_event):
         """Test finding recent bundles for a member"""
         # Add a bundle for the member
-        bundle_id = sample_event.bundle_id
-        detector.active_bundles[bundle_id] = BundleContext(
-            bundle_id=bundle_id,
-            member_ids={sample_event.member_id},
-            last_activity=sample_event.event_timestamp
-        )
+        bundle_id = detector.detect_bundle_context(sample_event).bundle_id
         
         recent_bundles = detector._find_recent_member_bundles(
             sample_event.member_id, 
@@ -273,6 +268,28 @@ class TestBundleDetector:
         assert len(detector.completed_bundles) == initial_count - cleaned_count
         assert "old_bundle" not in detector.completed_bundles
         assert "recent_bundle" in detector.completed_bundles
+
+    def test_complete_bundle_drops_member_relationships(self, detector, sample_event):
+        """Test completed bundles no longer appear in member relationships"""
+        detector.detect_bundle_context(sample_event)
+        detector.complete_bundle(sample_event.bundle_id, "shipped")
+
+        relationships = detector.export_bundle_contexts()["member_relationships"]
+        assert sample_event.member_id not in relationships
+        assert detector.get_bundle_statistics()["total_members"] == 0
+
+    def test_cleanup_old_bundles_drops_member_relationships(self, detector, sample_event):
+        """Test cleaned-up bundles are unlinked even after a late event relinks them"""
+        old_time = datetime.now(timezone.utc) - timedelta(hours=200)
+        old_event = sample_event.model_copy(update={"event_timestamp": old_time})
+        detector.detect_bundle_context(old_event)
+        detector.complete_bundle(old_event.bundle_id, "shipped")
+        # A late event naming the completed bundle links it to the member again
+        detector.detect_bundle_context(old_event)
+        assert old_event.member_id in detector.export_bundle_contexts()["member_relationships"]
+
+        assert detector.cleanup_old_bundles(max_age_hours=168) == 1
+        assert detector.export_bundle_contexts()["member_relationships"] == {}
     
     def test_export_bundle_contexts(self, detector, sample_event):
         """Test bundle context export"""
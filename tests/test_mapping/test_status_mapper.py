@@ -3,6 +3,7 @@ Tests for status to bundle-event mapping.
 """
 
 import pytest
+from dataclasses import FrozenInstanceError
 from datetime import datetime, timezone
 
 from src.mapping.status_mapper import StatusMapper, StatusMappingRule, MappingConfidence, MappingResult
@@ -44,6 +45,21 @@ class TestStatusMappingRule:
         assert rule.matches("centersync", "shipped_today", {})
         assert not rule.matches("centersync", "PENDING", {})
         assert not rule.matches("hpie", "SHIPPED", {})
+        assert not rule.matches("centersync", "PENDING\nSHIPPED", {})
+    
+    def test_rule_is_immutable(self):
+        """Test that rules cannot be modified after construction"""
+        rule = StatusMappingRule(
+            source_system="centersync",
+            source_status="SHIPPED",
+            canonical_event_type=EventType.REFILL_SHIPPED,
+            canonical_status=RefillStatus.SHIPPED,
+            confidence=MappingConfidence.HIGH,
+            description="Frozen rule"
+        )
+        
+        with pytest.raises(FrozenInstanceError):
+            rule.source_status = "COMPLETED"
     
     def test_conditional_rule_evaluation(self):
         """Test conditional rule evaluation"""
@@ -116,15 +132,51 @@ class TestStatusMappingRule:
         assert rule.evaluate_conditions({"source_status": "CHECKED"})
         assert not rule.evaluate_conditions({"source_status": "DENIED"})
 
+    
+    def test_less_than_and_simple_conditions(self):
+        """Test 'less_than' operator and plain equality conditions"""
+        rule = StatusMappingRule(
+            source_system="centersync",
+            source_status="LOW_SUPPLY",
+            canonical_event_type=EventType.REFILL_ELIGIBLE,
+            canonical_status=RefillStatus.ELIGIBLE,
+            confidence=MappingConfidence.MEDIUM,
+            description="Less-than rule",
+            conditions={
+                "days_supply": {"operator": "less_than", "value": 7},
+                "channel": "mail"
+            }
+        )
+        
+        assert rule.evaluate_conditions({"days_supply": 3, "channel": "mail"})
+        assert not rule.evaluate_conditions({"days_supply": 10, "channel": "mail"})
+        assert not rule.evaluate_conditions({"days_supply": "3", "channel": "mail"})
+        assert not rule.evaluate_conditions({"days_supply": 3, "channel": "retail"})
 
 class TestStatusMapper:
     """Test StatusMapper functionality"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def mapper(self):
-        """Create status mapper with default rules"""
+        """Create status mapper with default rules, shared by read-only tests"""
         return StatusMapper()
     
+    @pytest.fixture
+    def fresh_mapper(self):
+        """Create status mapper for tests that add rules"""
+        return StatusMapper()
+    
+    def test_default_rules_loaded_on_first_use(self):
+        """Test that default rules are loaded lazily but transparently"""
+        lazy_mapper = StatusMapper()
+        assert lazy_mapper._initialized is False
+        
+        result = lazy_mapper.map_status("centersync", "BUNDLED")
+        
+        assert result.success is True
+        assert lazy_mapper._initialized is True
+        assert lazy_mapper.get_mapping_statistics()["total_rules"] == len(lazy_mapper.rules)
+    
     def test_high_confidence_mapping(self, mapper):
         """Test high confidence status mapping"""
         result = mapper.map_status("centersync", "ELIGIBLE_FOR_BUNDLING")
@@ -154,6 +206,15 @@ class TestStatusMapper:
         assert result.canonical_status == RefillStatus.SHIPPED
         assert result.confidence == MappingConfidence.MEDIUM
     
+    def test_highest_confidence_rule_selected(self, mapper):
+        """Test that an exact high-confidence rule wins over a matching regex rule"""
+        result = mapper.map_status("centersync", "SHIPPED")
+        
+        assert result.success is True
+        assert result.canonical_event_type == EventType.REFILL_SHIPPED
+        assert result.confidence == MappingConfidence.HIGH
+        assert result.mapping_rules_applied == ["Refill shipped"]
+    
     def test_no_mapping_found(self, mapper):
         """Test behavior when no mapping rule is found"""
         result = mapper.map_status("unknown_system", "UNKNOWN_STATUS")
@@ -165,6 +226,7 @@ class TestStatusMapper:
         assert len(result.warnings) > 0
         assert result.requires_manual_review is True
         assert "No mapping rule found" in result.warnings[0]
+        assert isinstance(result.warnings, tuple)
     
     def test_conditional_mapping_success(self, mapper):
         """Test conditional mapping with matching context"""
@@ -200,6 +262,18 @@ class TestStatusMapper:
         assert result.bundle_context is not None
         assert result.bundle_context.get("bundle_type") == "standard"
     
+    def test_bundle_context_is_copied_per_result(self, mapper):
+        """Test that results get their own dict and cannot modify a rule's bundle context"""
+        result = mapper.map_status("centersync", "BUNDLE_FORMED")
+        
+        assert type(result.bundle_context) is dict
+        result.bundle_context["bundle_type"] = "complex"
+        
+        # Context-derived fields are added to a copy, not the rule's context
+        enriched = mapper.map_status("centersync", "BUNDLE_FORMED", {"bundle_id": "bundle_123"})
+        assert enriched.bundle_context == {"bundle_type": "standard", "has_bundle_id": True}
+        assert mapper.map_status("centersync", "BUNDLE_FORMED").bundle_context == {"bundle_type": "standard"}
+    
     def test_context_based_bundle_context(self, mapper):
         """Test bundle context derived from event context"""
         context = {
@@ -212,7 +286,7 @@ class TestStatusMapper:
         assert result.bundle_context.get("has_bundle_id") is True
         assert result.bundle_context.get("is_multi_member") is True
     
-    def test_multiple_high_confidence_matches(self, mapper):
+    def test_multiple_high_confidence_matches(self, fresh_mapper):
         """Test handling of multiple high-confidence matches"""
         # Add a duplicate rule for testing
         duplicate_rule = StatusMappingRule(
@@ -223,13 +297,14 @@ class TestStatusMapper:
             confidence=MappingConfidence.HIGH,
             description="Duplicate rule"
         )
-        mapper.add_rule(duplicate_rule)
+        fresh_mapper.add_rule(duplicate_rule, force=True)
         
-        result = mapper.map_status("centersync", "ELIGIBLE_FOR_BUNDLING")
+        result = fresh_mapper.map_status("centersync", "ELIGIBLE_FOR_BUNDLING")
         
         assert result.success is True
         assert len(result.warnings) > 0
         assert "Multiple high-confidence matches" in result.warnings[0]
+        assert isinstance(result.warnings, tuple)
         assert result.requires_manual_review is True
     
     def test_pa_status_mapping(self, mapper):
@@ -250,6 +325,21 @@ class TestStatusMapper:
         assert result.canonical_status == "detected"
         assert result.confidence == MappingConfidence.HIGH
     
+    def test_map_status_batch(self, mapper):
+        """Test batch mapping preserves input order and per-record context"""
+        records = [
+            ("centersync", "ELIGIBLE_FOR_BUNDLING"),
+            ("centersync", "PENDING", {"days_supply": 30, "quantity": 10}),
+            ("centersync", "PENDING", {"days_supply": 0, "quantity": 10}),
+            ("pa_system", "APPROVED", None),
+        ]
+        
+        results = mapper.map_status_batch(records)
+        
+        assert [r.success for r in results] == [True, True, False, True]
+        assert results[0].canonical_event_type == EventType.REFILL_ELIGIBLE
+        assert results[3].canonical_event_type == EventType.PA_APPROVED
+    
     def test_mapping_statistics(self, mapper):
         """Test mapping statistics generation"""
         stats = mapper.get_mapping_statistics()
@@ -264,7 +354,47 @@ class TestStatusMapper:
         assert stats["rules_by_confidence"]["high"] > 0
         assert stats["rules_by_confidence"]["medium"] > 0
     
-    def test_mapping_consistency_validation(self, mapper):
+    def test_mapping_statistics_track_added_rules(self, fresh_mapper):
+        """Test that statistics reflect rules added after construction"""
+        before = fresh_mapper.get_mapping_statistics()
+        
+        fresh_mapper.add_rule(StatusMappingRule(
+            source_system="custom_system",
+            source_status="CUSTOM_STATUS",
+            canonical_event_type=EventType.REFILL_ELIGIBLE,
+            canonical_status=RefillStatus.ELIGIBLE,
+            confidence=MappingConfidence.LOW,
+            description="Custom low-confidence rule"
+        ))
+        after = fresh_mapper.get_mapping_statistics()
+        
+        assert after["total_rules"] == before["total_rules"] + 1
+        assert after["rules_by_source"]["custom_system"] == 1
+        assert after["rules_by_confidence"]["low"] == before["rules_by_confidence"]["low"] + 1
+        assert after["rules_by_event_type"]["refill_eligible"] == before["rules_by_event_type"]["refill_eligible"] + 1
+        
+        # Returned statistics are snapshots
+        assert "custom_system" not in before["rules_by_source"]
+    
+    def test_add_duplicate_rule_is_ignored(self, fresh_mapper):
+        """Test that re-adding an identical rule does not duplicate it"""
+        duplicate_rule = StatusMappingRule(
+            source_system="centersync",
+            source_status="ELIGIBLE_FOR_BUNDLING",
+            canonical_event_type=EventType.REFILL_ELIGIBLE,
+            canonical_status=RefillStatus.ELIGIBLE,
+            confidence=MappingConfidence.HIGH,
+            description="Reloaded rule"
+        )
+        initial_count = len(fresh_mapper.rules)
+        
+        fresh_mapper.add_rule(duplicate_rule)
+        
+        assert len(fresh_mapper.rules) == initial_count
+        result = fresh_mapper.map_status("centersync", "ELIGIBLE_FOR_BUNDLING")
+        assert result.requires_manual_review is False
+    
+    def test_mapping_consistency_validation(self, fresh_mapper):
         """Test mapping rule consistency validation"""
         # Add a rule without description for testing
         bad_rule = StatusMappingRule(
@@ -275,9 +405,9 @@ class TestStatusMapper:
             confidence=MappingConfidence.HIGH,
             description=""  # Empty description
         )
-        mapper.add_rule(bad_rule)
+        fresh_mapper.add_rule(bad_rule)
         
-        issues = mapper.validate_mapping_consistency()
+        issues = fresh_mapper.validate_mapping_consistency()
         
         assert len(issues) > 0
         assert any("missing description" in issue for issue in issues)
@@ -298,7 +428,7 @@ class TestStatusMapper:
         assert "confidence" in rule
         assert "description" in rule
     
-    def test_add_custom_rule(self, mapper):
+    def test_add_custom_rule(self, fresh_mapper):
         """Test adding custom mapping rule"""
         custom_rule = StatusMappingRule(
             source_system="custom_system",
@@ -309,16 +439,49 @@ class TestStatusMapper:
             description="Custom test rule"
         )
         
-        initial_count = len(mapper.rules)
-        mapper.add_rule(custom_rule)
+        initial_count = len(fresh_mapper.rules)
+        fresh_mapper.add_rule(custom_rule)
         
-        assert len(mapper.rules) == initial_count + 1
+        assert len(fresh_mapper.rules) == initial_count + 1
         
         # Test the new rule works
-        result = mapper.map_status("custom_system", "CUSTOM_STATUS")
+        result = fresh_mapper.map_status("custom_system", "CUSTOM_STATUS")
         assert result.success is True
         assert result.canonical_event_type == EventType.REFILL_ELIGIBLE
     
+    def test_add_custom_regex_rule(self, fresh_mapper):
+        """Test adding a regex rule scoped to its source system"""
+        fresh_mapper.add_rule(StatusMappingRule(
+            source_system="custom_system",
+            source_status="regex:.*DELIVERED.*",
+            canonical_event_type=EventType.REFILL_COMPLETED,
+            canonical_status=RefillStatus.COMPLETED,
+            confidence=MappingConfidence.MEDIUM,
+            description="Custom regex rule"
+        ))
+        
+        result = fresh_mapper.map_status("custom_system", "order_delivered")
+        assert result.success is True
+        assert result.canonical_event_type == EventType.REFILL_COMPLETED
+        
+        # Regex rules only apply to their own source system
+        assert fresh_mapper.map_status("hpie", "ORDER_DELIVERED").success is False
+    
+    def test_rule_added_after_mapping_is_applied(self, fresh_mapper):
+        """Test that adding a rule invalidates memoized lookups"""
+        assert fresh_mapper.map_status("custom_system", "LATE_STATUS").success is False
+        
+        fresh_mapper.add_rule(StatusMappingRule(
+            source_system="custom_system",
+            source_status="LATE_STATUS",
+            canonical_event_type=EventType.REFILL_ELIGIBLE,
+            canonical_status=RefillStatus.ELIGIBLE,
+            confidence=MappingConfidence.HIGH,
+            description="Rule added after first lookup"
+        ))
+        
+        assert fresh_mapper.map_status("custom_system", "LATE_STATUS").success is True
+    
     def test_case_insensitive_matching(self, mapper):
         """Test case insensitive status matching"""
         result_lower = mapper.map_status("centersync", "eligible_for_bundling")
@@ -16,73 +16,96 @@ from src.metrics.bundle_metrics_engine import BundleMetricsEngine
 from src.utils.audit import AuditLogger
 
 
+# Shared queries, built once for the module; the engine never mutates them
+QUERY_BY_MEMBER = MetricsQuery(member_id="mem_test_1234567890abcdef")
+QUERY_BY_BUNDLE = MetricsQuery(bundle_id="bun_test_1234567890abcdef")
+QUERY_HIGH_RISK = MetricsQuery(min_risk_score=0.7)
+QUERY_FIRST_PAGE = MetricsQuery(limit=2, offset=0)
+QUERY_SECOND_PAGE = MetricsQuery(limit=2, offset=2)
+QUERY_SUMMARY = MetricsQuery(limit=10)
+
+
+SAMPLE_UTC_DATETIME = datetime(2026, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+
+# Field values for the sample snapshot; validated once in
+# test_sample_snapshot_fields_are_valid rather than in every fixture
+_BASE_SNAPSHOT_FIELDS = {
+    "snapshot_id": "snap_test_1234567890abcdef",
+    "member_id": "mem_test_1234567890abcdef",
+    "refill_id": "ref_test_1234567890abcdef",
+    "bundle_id": "bun_test_1234567890abcdef",
+    "snapshot_timestamp": SAMPLE_UTC_DATETIME,
+    "current_stage": SnapshotStage.BUNDLED,
+    "pa_state": PAState.APPROVED,
+    "bundle_timing_state": BundleTimingState.ALIGNED,
+    "drug_ndc": "123456789012",
+    "drug_name": "Lisinopril",
+    "days_supply": 30,
+    "quantity": 10.0,
+    "refill_due_date": SAMPLE_UTC_DATETIME + timedelta(days=30),
+    "ship_by_date": SAMPLE_UTC_DATETIME + timedelta(days=25),
+    "last_fill_date": SAMPLE_UTC_DATETIME - timedelta(days=60),
+    "refill_status": "bundled",
+    "source_status": "BUNDLED",
+    "bundle_member_count": 2,
+    "bundle_refill_count": 3,
+    "bundle_sequence": 1,
+    "bundle_alignment_score": 0.85,
+    "total_events": 5,
+    "latest_event_timestamp": SAMPLE_UTC_DATETIME + timedelta(hours=4),
+    "earliest_event_timestamp": SAMPLE_UTC_DATETIME,
+    "refill_events": 3,
+    "pa_events": 2,
+    "oos_events": 0,
+    "bundle_events": 0,
+    "initiated_timestamp": SAMPLE_UTC_DATETIME,
+    "eligible_timestamp": SAMPLE_UTC_DATETIME + timedelta(hours=2),
+    "pa_submitted_timestamp": SAMPLE_UTC_DATETIME + timedelta(hours=6),
+    "pa_resolved_timestamp": SAMPLE_UTC_DATETIME + timedelta(days=2),
+    "bundled_timestamp": SAMPLE_UTC_DATETIME + timedelta(hours=4),
+    "shipped_timestamp": None,
+    "completed_timestamp": None,
+    "pa_type": "new",
+    "pa_processing_days": 2,
+    "pa_expiry_date": SAMPLE_UTC_DATETIME + timedelta(days=92),
+    "days_until_due": 30,
+    "days_since_last_fill": 60,
+    "days_in_current_stage": 5,
+    "total_processing_days": 5,
+    "event_ids": ["evt_1", "evt_2", "evt_3", "evt_4", "evt_5"],
+    "correlation_id": "corr_1234567890abcdef",
+}
+
+
+def _make_snapshot(**overrides) -> RefillSnapshot:
+    """Build a sample snapshot without re-running model validation"""
+    fields = {**_BASE_SNAPSHOT_FIELDS, **overrides}
+    fields["event_ids"] = list(fields["event_ids"])
+    return RefillSnapshot.model_construct(**fields)
+
+
 class TestBundleMetricsEngine:
     """Test cases for bundle metrics engine"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def audit_logger(self):
         """Create audit logger for testing"""
         return AuditLogger()
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def metrics_engine(self, audit_logger):
-        """Create metrics engine for testing"""
+        """Create metrics engine for testing, shared across the module"""
         return BundleMetricsEngine(audit_logger=audit_logger)
     
-    @pytest.fixture
-    def sample_utc_datetime(self):
-        """Sample UTC datetime for testing"""
-        return datetime(2026, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+    @pytest.fixture(autouse=True)
+    def reset_metrics_engine(self, metrics_engine):
+        """Start every test from an empty engine and audit trail"""
+        metrics_engine.reset()
     
     @pytest.fixture
-    def sample_snapshot(self, sample_utc_datetime):
+    def sample_snapshot(self):
         """Sample refill snapshot for testing"""
-        return RefillSnapshot(
-            snapshot_id="snap_test_1234567890abcdef",
-            member_id="mem_test_1234567890abcdef",
-            refill_id="ref_test_1234567890abcdef",
-            bundle_id="bun_test_1234567890abcdef",
-            snapshot_timestamp=sample_utc_datetime,
-            current_stage=SnapshotStage.BUNDLED,
-            pa_state=PAState.APPROVED,
-            bundle_timing_state=BundleTimingState.ALIGNED,
-            drug_ndc="123456789012",
-            drug_name="Lisinopril",
-            days_supply=30,
-            quantity=10.0,
-            refill_due_date=sample_utc_datetime + timedelta(days=30),
-            ship_by_date=sample_utc_datetime + timedelta(days=25),
-            last_fill_date=sample_utc_datetime - timedelta(days=60),
-            refill_status="bundled",
-            source_status="BUNDLED",
-            bundle_member_count=2,
-            bundle_refill_count=3,
-            bundle_sequence=1,
-            bundle_alignment_score=0.85,
-            total_events=5,
-            latest_event_timestamp=sample_utc_datetime + timedelta(hours=4),
-            earliest_event_timestamp=sample_utc_datetime,
-            refill_events=3,
-            pa_events=2,
-            oos_events=0,
-            bundle_events=0,
-            initiated_timestamp=sample_utc_datetime,
-            eligible_timestamp=sample_utc_datetime + timedelta(hours=2),
-            pa_submitted_timestamp=sample_utc_datetime + timedelta(hours=6),
-            pa_resolved_timestamp=sample_utc_datetime + timedelta(days=2),
-            bundled_timestamp=sample_utc_datetime + timedelta(hours=4),
-            shipped_timestamp=None,
-            completed_timestamp=None,
-            pa_type="new",
-            pa_processing_days=2,
-            pa_expiry_date=sample_utc_datetime + timedelta(days=92),
-            days_until_due=30,
-            days_since_last_fill=60,
-            days_in_current_stage=5,
-            total_processing_days=5,
-            event_ids=["evt_1", "evt_2", "evt_3", "evt_4", "evt_5"],
-            correlation_id="corr_1234567890abcdef"
-        )
+        return _make_snapshot()
     
     @pytest.fixture
     def sample_bundle_snapshots(self, sample_snapshot):
@@ -91,29 +114,34 @@ class TestBundleMetricsEngine:
         snapshots = [sample_snapshot]
         
         # Second member in bundle
-        snapshot2 = sample_snapshot.copy(deep=True)
-        snapshot2.snapshot_id = "snap_test_2_1234567890abcdef"
-        snapshot2.member_id = "mem_test_2_1234567890abcdef"
-        snapshot2.refill_id = "ref_test_2_1234567890abcdef"
-        snapshot2.bundle_sequence = 2
-        snapshot2.days_until_due = 28
-        snapshot2.days_since_last_fill = 58
-        snapshot2.bundle_alignment_score = 0.80
-        snapshots.append(snapshot2)
+        snapshots.append(_make_snapshot(
+            snapshot_id="snap_test_2_1234567890abcdef",
+            member_id="mem_test_2_1234567890abcdef",
+            refill_id="ref_test_2_1234567890abcdef",
+            bundle_sequence=2,
+            days_until_due=28,
+            days_since_last_fill=58,
+            bundle_alignment_score=0.80,
+        ))
         
         # Third member in bundle
-        snapshot3 = sample_snapshot.copy(deep=True)
-        snapshot3.snapshot_id = "snap_test_3_1234567890abcdef"
-        snapshot3.member_id = "mem_test_3_1234567890abcdef"
-        snapshot3.refill_id = "ref_test_3_1234567890abcdef"
-        snapshot3.bundle_sequence = 3
-        snapshot3.days_until_due = 32
-        snapshot3.days_since_last_fill = 62
-        snapshot3.bundle_alignment_score = 0.90
-        snapshots.append(snapshot3)
+        snapshots.append(_make_snapshot(
+            snapshot_id="snap_test_3_1234567890abcdef",
+            member_id="mem_test_3_1234567890abcdef",
+            refill_id="ref_test_3_1234567890abcdef",
+            bundle_sequence=3,
+            days_until_due=32,
+            days_since_last_fill=62,
+            bundle_alignment_score=0.90,
+        ))
         
         return snapshots
     
+    def test_sample_snapshot_fields_are_valid(self):
+        """Test that the unvalidated sample snapshot data passes validation"""
+        snapshot = RefillSnapshot(**_BASE_SNAPSHOT_FIELDS)
+        assert snapshot == _make_snapshot()
+    
     def test_compute_basic_metrics(self, metrics_engine, sample_snapshot):
         """Test basic metrics computation"""
         metrics = metrics_engine.compute_metrics(sample_snapshot)
@@ -194,6 +222,24 @@ class TestBundleMetricsEngine:
         assert 0 <= timing_metrics.fragmentation_risk <= 1
         assert 0 <= timing_metrics.shipment_split_probability <= 1
     
+    def test_timing_overlap_variance(self, metrics_engine, sample_snapshot):
+        """Test timing variance and max gap over staggered due dates"""
+        base_due = sample_snapshot.refill_due_date
+        bundle_snapshots = [
+            sample_snapshot.model_copy(update={
+                "snapshot_id": f"snap_test_due_{offset}",
+                "refill_due_date": base_due + timedelta(days=offset),
+            })
+            for offset in (0, 10, 12, 30)
+        ]
+        
+        metrics = metrics_engine.compute_metrics(bundle_snapshots[0], bundle_snapshots)
+        timing_metrics = metrics.timing_overlap
+        
+        # Gaps of 10, 2 and 18 days
+        assert timing_metrics.timing_variance_days == 64.0
+        assert timing_metrics.max_timing_gap_days == 18
+    
     def test_refill_gap_metrics(self, metrics_engine, sample_snapshot):
         """Test refill gap metrics computation"""
         metrics = metrics_engine.compute_metrics(sample_snapshot)
@@ -243,7 +289,7 @@ class TestBundleMetricsEngine:
     def test_risk_assessment_low_risk(self, metrics_engine):
         """Test risk assessment for low-risk scenario"""
         # Create low-risk snapshot
-        low_risk_snapshot = RefillSnapshot(
+        low_risk_snapshot = RefillSnapshot.model_construct(
             snapshot_id="snap_low_risk",
             member_id="mem_low_risk",
             refill_id="ref_low_risk",
@@ -271,7 +317,7 @@ class TestBundleMetricsEngine:
     def test_risk_assessment_high_risk(self, metrics_engine):
         """Test risk assessment for high-risk scenario"""
         # Create high-risk snapshot
-        high_risk_snapshot = RefillSnapshot(
+        high_risk_snapshot = RefillSnapshot.model_construct(
             snapshot_id="snap_high_risk",
             member_id="mem_high_risk",
             refill_id="ref_high_risk",
@@ -308,6 +354,17 @@ class TestBundleMetricsEngine:
         snapshot_ids = [m.snapshot_id for m in metrics_list]
         assert len(snapshot_ids) == len(set(snapshot_ids))
     
+    def test_batch_metrics_bundle_context(self, metrics_engine, sample_bundle_snapshots):
+        """Test that batch computation gives every snapshot its bundle's context"""
+        metrics_list = metrics_engine.compute_batch_metrics(sample_bundle_snapshots)
+        
+        assert all(m.timing_overlap.bundle_size == 3 for m in metrics_list)
+        assert all(m.bundle_alignment.bundle_member_count == 3 for m in metrics_list)
+        
+        # Matches computing each snapshot individually with the same bundle
+        single = metrics_engine.compute_metrics(sample_bundle_snapshots[1], sample_bundle_snapshots)
+        assert single.overall_risk_score == metrics_list[1].overall_risk_score
+    
     def test_metrics_caching(self, metrics_engine, sample_snapshot):
         """Test metrics caching functionality"""
         # Compute metrics first time
@@ -327,7 +384,7 @@ class TestBundleMetricsEngine:
         metrics_engine.compute_batch_metrics(sample_bundle_snapshots)
         
         # Query by member ID
-        query = MetricsQuery(member_id="mem_test_1234567890abcdef")
+        query = QUERY_BY_MEMBER
         results = metrics_engine.query_metrics(query)
         
         # Should return only metrics for that member
@@ -341,24 +398,55 @@ class TestBundleMetricsEngine:
         metrics_engine.compute_batch_metrics(sample_bundle_snapshots)
         
         # Query for high risk metrics
-        query = MetricsQuery(min_risk_score=0.7)
+        query = QUERY_HIGH_RISK
         results = metrics_engine.query_metrics(query)
         
         # Should return metrics with risk score >= 0.7
         for metrics in results.metrics:
             assert metrics.overall_risk_score >= 0.7
-    
+
+    def test_query_metrics_by_risk_score_range(self, metrics_engine, sample_bundle_snapshots):
+        """Test risk score range queries against the sorted risk index"""
+        all_metrics = metrics_engine.compute_batch_metrics(sample_bundle_snapshots)
+        # Recomputing must replace, not duplicate, the snapshot's index entry
+        metrics_engine.compute_metrics(sample_bundle_snapshots[0], sample_bundle_snapshots)
+
+        scores = sorted(m.overall_risk_score for m in all_metrics)
+        results = metrics_engine.query_metrics(
+            MetricsQuery(min_risk_score=scores[0], max_risk_score=scores[-1])
+        )
+        assert results.total_count == len(all_metrics)
+
+        results = metrics_engine.query_metrics(MetricsQuery(min_risk_score=scores[-1] + 0.01))
+        assert results.total_count == 0
+
+    def test_query_metrics_combined_filters(self, metrics_engine, sample_bundle_snapshots):
+        """Test that every filter set on a query is applied"""
+        all_metrics = metrics_engine.compute_batch_metrics(sample_bundle_snapshots)
+        target = all_metrics[1]
+
+        query = MetricsQuery(
+            refill_id=target.refill_id,
+            risk_severity=target.risk_severity,
+            max_risk_score=target.overall_risk_score
+        )
+        results = metrics_engine.query_metrics(query)
+        assert [m.snapshot_id for m in results.metrics] == [target.snapshot_id]
+
+        query = MetricsQuery(refill_id=target.refill_id, max_risk_score=target.overall_risk_score - 0.01)
+        assert metrics_engine.query_metrics(query).total_count == 0
+
     def test_query_metrics_pagination(self, metrics_engine, sample_bundle_snapshots):
         """Test metrics query pagination"""
         # Compute metrics for all snapshots
         metrics_engine.compute_batch_metrics(sample_bundle_snapshots)
         
         # Query with pagination
-        query = MetricsQuery(limit=2, offset=0)
+        query = QUERY_FIRST_PAGE
         results1 = metrics_engine.query_metrics(query)
         
         # Second page
-        query2 = MetricsQuery(limit=2, offset=2)
+        query2 = QUERY_SECOND_PAGE
         results2 = metrics_engine.query_metrics(query2)
         
         # Verify pagination
@@ -367,6 +455,24 @@ class TestBundleMetricsEngine:
         assert results1.has_more is True
         assert results2.has_more is False
     
+    def test_query_metrics_pages_follow_sort_order(self, metrics_engine, sample_bundle_snapshots):
+        """Test that partial pages match the fully sorted results"""
+        metrics_engine.compute_batch_metrics(sample_bundle_snapshots)
+
+        for sort_order in ("asc", "desc"):
+            full = metrics_engine.query_metrics(
+                MetricsQuery(sort_by="overall_risk_score", sort_order=sort_order)
+            )
+            first_page = metrics_engine.query_metrics(
+                MetricsQuery(sort_by="overall_risk_score", sort_order=sort_order, limit=1)
+            )
+            second_page = metrics_engine.query_metrics(
+                MetricsQuery(sort_by="overall_risk_score", sort_order=sort_order, limit=1, offset=1)
+            )
+
+            assert first_page.metrics + second_page.metrics == full.metrics[:2]
+            assert first_page.total_count == full.total_count
+
     def test_get_member_metrics(self, metrics_engine, sample_bundle_snapshots):
         """Test getting all metrics for a member"""
         # Compute metrics for all snapshots
@@ -379,6 +485,17 @@ class TestBundleMetricsEngine:
         assert len(member_metrics) == 1
         assert member_metrics[0].member_id == "mem_test_1234567890abcdef"
     
+    def test_recomputed_metrics_indexed_once(self, metrics_engine, sample_bundle_snapshots):
+        """Test that recomputing a snapshot does not duplicate index entries"""
+        metrics_engine.compute_batch_metrics(sample_bundle_snapshots)
+        metrics_engine.compute_metrics(sample_bundle_snapshots[0], sample_bundle_snapshots)
+        
+        assert len(metrics_engine.get_member_metrics("mem_test_1234567890abcdef")) == 1
+        assert len(metrics_engine.get_bundle_metrics("bun_test_1234567890abcdef")) == 3
+        
+        results = metrics_engine.query_metrics(QUERY_BY_BUNDLE)
+        assert results.total_count == 3
+    
     def test_get_bundle_metrics(self, metrics_engine, sample_bundle_snapshots):
         """Test getting all metrics for a bundle"""
         # Compute metrics for all snapshots
@@ -397,7 +514,7 @@ class TestBundleMetricsEngine:
         metrics_engine.compute_batch_metrics(sample_bundle_snapshots)
         
         # Query metrics with summary
-        query = MetricsQuery(limit=10)
+        query = QUERY_SUMMARY
         results = metrics_engine.query_metrics(query)
         
         # Should have summary
@@ -408,6 +525,17 @@ class TestBundleMetricsEngine:
         assert results.summary.high_risk_count >= 0
         assert results.summary.critical_risk_count >= 0
     
+    def test_reset_clears_cached_metrics(self, metrics_engine, sample_bundle_snapshots):
+        """Test that resetting the engine drops cached metrics and indexes"""
+        metrics_engine.compute_batch_metrics(sample_bundle_snapshots)
+
+        metrics_engine.reset()
+
+        assert metrics_engine.get_metrics(sample_bundle_snapshots[0].snapshot_id) is None
+        assert metrics_engine.get_bundle_metrics("bun_test_1234567890abcdef") == []
+        assert metrics_engine.query_metrics(QUERY_HIGH_RISK).total_count == 0
+        assert len(metrics_engine.audit_logger._audit_trail) == 0
+
     def test_audit_logging(self, metrics_engine, sample_snapshot):
         """Test audit logging during metrics computation"""
         initial_count = len(metrics_engine.audit_logger._audit_trail)
@@ -16,7 +16,8 @@ from src.models.events import (
     PAEvent,
     OSEvent,
     BundleEvent,
-    create_canonical_event
+    create_canonical_event,
+    create_canonical_events_batch
 )
 
 
@@ -37,16 +38,18 @@ class TestBaseCanonicalEvent:
         invalid_data = base_event_data.copy()
         invalid_data["event_timestamp"] = datetime(2024, 1, 15, 10, 30, 0)  # No timezone
         
-        with pytest.raises(ValidationError, match="Timestamps must be timezone-aware"):
+        with pytest.raises(ValidationError) as exc_info:
             BaseCanonicalEvent(**invalid_data)
+        assert "Timestamps must be timezone-aware" in str(exc_info.value)
     
     def test_invalid_short_member_id(self, base_event_data):
         """Test that short pseudonymized IDs fail validation"""
         invalid_data = base_event_data.copy()
         invalid_data["member_id"] = "short"
         
-        with pytest.raises(ValidationError, match="Pseudonymized IDs should be at least 8 characters"):
+        with pytest.raises(ValidationError) as exc_info:
             BaseCanonicalEvent(**invalid_data)
+        assert "Pseudonymized IDs should be at least 8 characters" in str(exc_info.value)
     
     def test_optional_fields(self, base_event_data):
         """Test that optional fields can be None"""
@@ -118,6 +121,13 @@ class TestOSEvent:
         """Test that OOS event inherits from base event"""
         event = OSEvent(**sample_oos_event_data)
         assert isinstance(event, BaseCanonicalEvent)
+    
+    def test_oos_reason_interned(self, sample_oos_event_data):
+        """Test that repeated OOS reasons share one string object"""
+        data = {**sample_oos_event_data, "oos_reason": "".join(["manufacturer", "_shortage"])}
+        first = OSEvent(**data)
+        second = OSEvent(**{**data, "oos_reason": "".join(["manufacturer", "_shortage"])})
+        assert first.oos_reason is second.oos_reason
 
 
 class TestBundleEvent:
@@ -149,29 +159,20 @@ class TestBundleEvent:
 class TestEventFactory:
     """Test event factory functionality"""
     
-    def test_create_refill_event(self, sample_refill_event_data):
-        """Test factory creates refill event"""
-        event = create_canonical_event(sample_refill_event_data)
-        assert isinstance(event, RefillEvent)
-        assert event.event_type == EventType.REFILL_ELIGIBLE
-    
-    def test_create_pa_event(self, sample_pa_event_data):
-        """Test factory creates PA event"""
-        event = create_canonical_event(sample_pa_event_data)
-        assert isinstance(event, PAEvent)
-        assert event.event_type == EventType.PA_APPROVED
-    
-    def test_create_oos_event(self, sample_oos_event_data):
-        """Test factory creates OOS event"""
-        event = create_canonical_event(sample_oos_event_data)
-        assert isinstance(event, OSEvent)
-        assert event.event_type == EventType.OOS_DETECTED
-    
-    def test_create_bundle_event(self, sample_bundle_event_data):
-        """Test factory creates bundle event"""
-        event = create_canonical_event(sample_bundle_event_data)
-        assert isinstance(event, BundleEvent)
-        assert event.event_type == EventType.BUNDLE_FORMED
+    @pytest.mark.parametrize(
+        ("fixture_name", "expected_class", "expected_type"),
+        [
+            ("sample_refill_event_data", RefillEvent, EventType.REFILL_ELIGIBLE),
+            ("sample_pa_event_data", PAEvent, EventType.PA_APPROVED),
+            ("sample_oos_event_data", OSEvent, EventType.OOS_DETECTED),
+            ("sample_bundle_event_data", BundleEvent, EventType.BUNDLE_FORMED),
+        ],
+    )
+    def test_create_event(self, request, fixture_name, expected_class, expected_type):
+        """Test factory creates the event class for each event type"""
+        event = create_canonical_event(request.getfixturevalue(fixture_name))
+        assert isinstance(event, expected_class)
+        assert event.event_type == expected_type
     
     def test_create_default_refill_event(self, base_event_data):
         """Test factory defaults to refill event for unknown types"""
@@ -182,6 +183,39 @@ class TestEventFactory:
         assert isinstance(event, RefillEvent)
 
 
+class TestEventBatchFactory:
+    """Test batch event factory functionality"""
+    
+    def test_batch_preserves_order_and_types(self, sample_refill_event_data, sample_pa_event_data,
+                                             sample_oos_event_data, sample_bundle_event_data):
+        """Test mixed batches come back in input order with the right classes"""
+        rows = [sample_pa_event_data, sample_refill_event_data, sample_bundle_event_data,
+                sample_oos_event_data, sample_pa_event_data]
+        
+        events = create_canonical_events_batch(rows)
+        
+        assert [type(e) for e in events] == [PAEvent, RefillEvent, BundleEvent, OSEvent, PAEvent]
+        assert events == [create_canonical_event(row) for row in rows]
+    
+    def test_batch_of_refill_events(self, sample_refill_event_data):
+        """Test a large refill batch validates every row"""
+        rows = [{**sample_refill_event_data, "event_id": f"evt_refill_{i:06d}"} for i in range(1000)]
+        
+        events = create_canonical_events_batch(rows)
+        
+        assert len(events) == 1000
+        assert [e.event_id for e in events] == [row["event_id"] for row in rows]
+        assert all(e.refill_status == RefillStatus.ELIGIBLE for e in events)
+    
+    def test_batch_rejects_invalid_row(self, sample_refill_event_data):
+        """Test an invalid row fails the batch"""
+        rows = [sample_refill_event_data, {**sample_refill_event_data, "member_id": "short"}]
+        
+        with pytest.raises(ValidationError) as exc_info:
+            create_canonical_events_batch(rows)
+        assert "Pseudonymized IDs should be at least 8 characters" in str(exc_info.value)
+
+
 class TestEventEnums:
     """Test event enums"""
     
@@ -34,6 +34,7 @@ def test_ops_queue_create_and_update():
     item = engine.create_from_risk(risk, priority=QueuePriority.HIGH, assigned_to="ops")
     assert item.status == QueueItemStatus.OPEN
     assert item.priority == QueuePriority.HIGH
+    assert item.created_at == item.updated_at
 
     updated = engine.update_status(item.queue_id, QueueItemStatus.IN_PROGRESS, notes="Working")
     assert updated.status == QueueItemStatus.IN_PROGRESS
@@ -41,3 +42,19 @@ def test_ops_queue_create_and_update():
     items = engine.list_by_status(QueueItemStatus.IN_PROGRESS)
     assert items
     assert items[0].queue_id == item.queue_id
+
+
+def test_ops_queue_status_index_moves_items():
+    engine = OpsWorkQueueEngine()
+    first = engine.create_from_risk(build_bundle_break_risk())
+    second = engine.create_from_risk(build_bundle_break_risk())
+
+    engine.update_status(first.queue_id, QueueItemStatus.RESOLVED)
+
+    assert [i.queue_id for i in engine.list_by_status(QueueItemStatus.OPEN)] == [second.queue_id]
+    assert [i.queue_id for i in engine.list_by_status(QueueItemStatus.RESOLVED)] == [first.queue_id]
+
+    # Re-setting the same status leaves the index unchanged
+    engine.update_status(first.queue_id, QueueItemStatus.RESOLVED)
+    assert len(engine.list_by_status(QueueItemStatus.RESOLVED)) == 1
+    assert engine.list_by_status(QueueItemStatus.DISMISSED) == []
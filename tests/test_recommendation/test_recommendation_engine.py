@@ -143,3 +143,15 @@ def test_recommendation_engine_rank_and_dedupe():
     assert output[0].priority.value == "urgent"
     assert output[1].priority.value in {"high", "medium"}
     assert output[0].action_type.value in {"outreach", "monitor"}
+    assert output[0].created_at == output[1].created_at
+
+
+def test_recommendation_engine_keeps_highest_priority_duplicate():
+    engine = BundleRecommendationEngine()
+    output = engine.from_risk_assessment(build_risk("bundle_rec"), build_metrics("bundle_rec"))
+
+    timing = [rec for rec in output if rec.title == "Optimize Bundle Timing"]
+    assert [rec.priority.value for rec in timing] == ["high"]
+    # Dropped duplicates are never built or stored
+    assert all(engine.get(rec.recommendation_id) is rec for rec in output)
+    assert len(engine._recommendations) == len(output)
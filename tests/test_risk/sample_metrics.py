@@ -0,0 +1,181 @@
+"""
+Shared bundle metrics for the risk scoring engine tests
+"""
+
+from src.models.metrics import (
+    BundleMetrics, AgeInStageMetrics, TimingOverlapMetrics, RefillGapMetrics, BundleAlignmentMetrics
+)
+from src.models.risk import RiskSeverity
+from tests.conftest import SAMPLE_UTC_DATETIME
+
+
+# Sub-metric templates are built once at import and shared by the fixtures;
+# derive variants with model_copy(update=...) rather than mutating them.
+HIGH_RISK_SUBMETRICS = {
+    "age_in_stage": AgeInStageMetrics(
+        current_stage="pa_pending",
+        days_in_current_stage=15,
+        stage_history={},
+        initiation_to_eligible_days=2,
+        eligibility_to_bundled_days=0,
+        bundled_to_shipped_days=None,
+        is_aging_in_stage=True,
+        stage_age_percentile=1.0
+    ),
+    "timing_overlap": TimingOverlapMetrics(
+        bundle_id="bun_high_risk",
+        bundle_size=3,
+        refill_overlap_score=0.3,
+        timing_variance_days=15.0,
+        max_timing_gap_days=21,
+        is_well_aligned=False,
+        alignment_efficiency=0.4,
+        fragmentation_risk=0.8,
+        shipment_split_probability=0.7
+    ),
+    "refill_gap": RefillGapMetrics(
+        days_since_last_fill=120,
+        days_until_next_due=-5,
+        refill_gap_days=120,
+        is_optimal_gap=False,
+        gap_efficiency_score=0.0,
+        abandonment_risk=0.8,
+        urgency_score=1.0,
+        days_supply_remaining=0,
+        supply_buffer_days=-10
+    ),
+    "bundle_alignment": BundleAlignmentMetrics(
+        bundle_id="bun_high_risk",
+        bundle_member_count=3,
+        bundle_refill_count=3,
+        bundle_alignment_score=0.2,
+        timing_alignment_score=0.2,
+        bundle_efficiency_score=0.16,
+        cost_savings_potential=0.0,
+        split_risk_score=0.8,
+        outreach_reduction_score=0.1,
+        bundle_health_score=0.12,
+        recommended_actions=["Review bundle composition"]
+    ),
+}
+
+MEDIUM_RISK_SUBMETRICS = {
+    "age_in_stage": AgeInStageMetrics(
+        current_stage="eligible",
+        days_in_current_stage=5,
+        is_aging_in_stage=False,
+        stage_age_percentile=0.4
+    ),
+    "timing_overlap": TimingOverlapMetrics(
+        bundle_size=2,
+        refill_overlap_score=0.7,
+        timing_variance_days=4.0,
+        max_timing_gap_days=6,
+        is_well_aligned=True,
+        alignment_efficiency=0.7,
+        fragmentation_risk=0.3,
+        shipment_split_probability=0.2
+    ),
+    "refill_gap": RefillGapMetrics(
+        days_since_last_fill=28,
+        days_until_next_due=5,
+        refill_gap_days=28,
+        is_optimal_gap=True,
+        gap_efficiency_score=0.7,
+        abandonment_risk=0.3,
+        urgency_score=0.5,
+        days_supply_remaining=5,
+        supply_buffer_days=2
+    ),
+    "bundle_alignment": BundleAlignmentMetrics(
+        bundle_id="bun_test_1234567890abcdef",
+        bundle_member_count=2,
+        bundle_refill_count=2,
+        bundle_alignment_score=0.75,
+        timing_alignment_score=0.75,
+        bundle_efficiency_score=0.6,
+        cost_savings_potential=0.4,
+        split_risk_score=0.3,
+        outreach_reduction_score=0.4,
+        bundle_health_score=0.65
+    ),
+}
+
+LOW_RISK_SUBMETRICS = {
+    "age_in_stage": AgeInStageMetrics(
+        current_stage="completed",
+        days_in_current_stage=0,
+        stage_history={},
+        initiation_to_eligible_days=0,
+        eligibility_to_bundled_days=0,
+        bundled_to_shipped_days=0,
+        is_aging_in_stage=False,
+        stage_age_percentile=0.0
+    ),
+    "timing_overlap": TimingOverlapMetrics(
+        bundle_id="bun_low_risk",
+        bundle_size=1,
+        refill_overlap_score=1.0,
+        timing_variance_days=0.0,
+        max_timing_gap_days=0,
+        is_well_aligned=True,
+        alignment_efficiency=1.0,
+        fragmentation_risk=0.0,
+        shipment_split_probability=0.0
+    ),
+    "refill_gap": RefillGapMetrics(
+        days_since_last_fill=30,
+        days_until_next_due=15,
+        refill_gap_days=30,
+        is_optimal_gap=True,
+        gap_efficiency_score=0.9,
+        abandonment_risk=0.1,
+        urgency_score=0.2,
+        days_supply_remaining=15,
+        supply_buffer_days=5
+    ),
+    "bundle_alignment": BundleAlignmentMetrics(
+        bundle_id="bun_low_risk",
+        bundle_member_count=1,
+        bundle_refill_count=1,
+        bundle_alignment_score=0.95,
+        timing_alignment_score=0.95,
+        bundle_efficiency_score=0.85,
+        cost_savings_potential=0.8,
+        split_risk_score=0.1,
+        outreach_reduction_score=0.7,
+        bundle_health_score=0.9,
+        recommended_actions=[]
+    ),
+}
+
+
+HIGH_RISK_METRICS = BundleMetrics(
+    snapshot_id="snap_high_risk",
+    member_id="mem_high_risk",
+    refill_id="ref_high_risk",
+    computed_timestamp=SAMPLE_UTC_DATETIME,
+    metrics_version="1.0",
+    **HIGH_RISK_SUBMETRICS,
+    overall_risk_score=0.85,
+    risk_severity=RiskSeverity.HIGH,
+    primary_risk_factors=["stage_aging", "bundle_fragmentation"],
+    requires_attention=True,
+    recommended_actions=["Expedite processing", "Review bundle composition"],
+    computation_time_ms=75
+)
+
+LOW_RISK_METRICS = BundleMetrics(
+    snapshot_id="snap_low_risk",
+    member_id="mem_low_risk",
+    refill_id="ref_low_risk",
+    computed_timestamp=SAMPLE_UTC_DATETIME,
+    metrics_version="1.0",
+    **LOW_RISK_SUBMETRICS,
+    overall_risk_score=0.15,
+    risk_severity=RiskSeverity.LOW,
+    primary_risk_factors=[],
+    requires_attention=False,
+    recommended_actions=[],
+    computation_time_ms=25
+)
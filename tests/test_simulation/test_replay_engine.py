@@ -24,4 +24,5 @@ def test_replay_deterministic():
     first = engine.replay("replay_1")
     second = engine.replay("replay_1")
 
-    assert [event.model_dump() for event in first.events] == [event.model_dump() for event in second.events]
+    # Model equality checks event class and field values without dumping each event
+    assert first.events == second.events
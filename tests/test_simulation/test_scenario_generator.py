@@ -1,35 +1,31 @@
 """Tests for synthetic scenario generator."""
 
+import pytest
+
 from src.simulation.scenario_generator import ScenarioGenerator
 from src.models.simulation import ScenarioType, SimulationConfig, UniformRange
 from src.simulation.snapshot_builder import build_snapshot_and_metrics
 
 
-def test_generate_clean_bundle():
-    generator = ScenarioGenerator()
-    scenario = generator.generate(ScenarioType.CLEAN_BUNDLE, bundle_size=2)
+@pytest.fixture(scope="module")
+def generator():
+    return ScenarioGenerator()
+
+
+@pytest.mark.parametrize(
+    "scenario_type",
+    [ScenarioType.CLEAN_BUNDLE, ScenarioType.PA_DELAYED_SPLIT, ScenarioType.OOS_DRIVEN_SPLIT],
+)
+def test_generate(generator, scenario_type):
+    scenario = generator.generate(scenario_type, bundle_size=2)
     assert scenario.events
-    assert scenario.scenario_type == ScenarioType.CLEAN_BUNDLE
+    assert scenario.scenario_type == scenario_type
 
     snapshot, metrics = build_snapshot_and_metrics(scenario.events)
     assert snapshot.bundle_timing_state.value in {"aligned", "misaligned"}
     assert metrics.bundle_alignment.bundle_alignment_score is not None
 
 
-def test_generate_pa_split():
-    generator = ScenarioGenerator()
-    scenario = generator.generate(ScenarioType.PA_DELAYED_SPLIT, bundle_size=2)
-    assert scenario.events
-    assert scenario.scenario_type == ScenarioType.PA_DELAYED_SPLIT
-
-
-def test_generate_oos_split():
-    generator = ScenarioGenerator()
-    scenario = generator.generate(ScenarioType.OOS_DRIVEN_SPLIT, bundle_size=2)
-    assert scenario.events
-    assert scenario.scenario_type == ScenarioType.OOS_DRIVEN_SPLIT
-
-
 def test_generate_with_custom_ranges():
     config = SimulationConfig(
         pa_processing_days=UniformRange(minimum=3, maximum=3),
@@ -41,3 +37,16 @@ def test_generate_with_custom_ranges():
     pa_events = [event for event in scenario.events if getattr(event, "pa_processing_days", None) is not None]
     assert pa_events
     assert pa_events[0].pa_processing_days == 3
+
+
+def test_build_snapshot_and_metrics_from_iterator():
+    generator = ScenarioGenerator(seed=11)
+    scenario = generator.generate(ScenarioType.PA_DELAYED_SPLIT, bundle_size=2)
+
+    # A one-shot iterator is enough: the events are walked a single time
+    snapshot, metrics = build_snapshot_and_metrics(iter(scenario.events))
+    assert snapshot.total_events == len(scenario.events)
+    assert (snapshot.refill_events, snapshot.pa_events, snapshot.oos_events, snapshot.bundle_events) == (6, 1, 0, 1)
+    assert snapshot.pa_state.value == "pending"
+    assert snapshot.bundle_timing_state.value == "misaligned"
+    assert metrics.refill_id == snapshot.refill_id
@@ -0,0 +1,67 @@
+"""Tests for audit trail logging and retrieval."""
+
+from src.utils.audit import AuditLogger, AuditAction, AuditSeverity
+
+
+def _logger_with_records() -> AuditLogger:
+    audit_logger = AuditLogger()
+    audit_logger.log_event_received("evt_1", "centersync", {"event_type": "refill_initiated"})
+    audit_logger.log_event_validated("evt_1", True)
+    audit_logger.log_event_received("evt_2", "centersync", {"event_type": "pa_submitted"})
+    audit_logger.log_event_validated("evt_2", False, ["missing member_id"])
+    audit_logger.log_event_processed("evt_1", 5, "success")
+    return audit_logger
+
+
+def test_get_audit_trail_by_action():
+    audit_logger = _logger_with_records()
+
+    received = audit_logger.get_audit_trail(action=AuditAction.EVENT_RECEIVED)
+    assert [r.event_id for r in received] == ["evt_1", "evt_2"]
+
+    # Plain string actions match the enum values
+    assert audit_logger.get_audit_trail(action="event_received") == received
+    assert audit_logger.get_audit_trail(action=AuditAction.BATCH_RECEIVED) == []
+
+
+def test_get_audit_trail_combined_filters():
+    audit_logger = _logger_with_records()
+
+    records = audit_logger.get_audit_trail(event_id="evt_2", action=AuditAction.VALIDATION_FAILED)
+    assert len(records) == 1
+    assert records[0].severity == AuditSeverity.ERROR
+
+    assert len(audit_logger.get_audit_trail(action=AuditAction.EVENT_RECEIVED, limit=1)) == 1
+
+
+def test_clear_audit_trail_resets_action_index():
+    audit_logger = _logger_with_records()
+
+    audit_logger.clear_audit_trail()
+
+    assert audit_logger.get_audit_trail(action=AuditAction.EVENT_RECEIVED) == []
+
+
+def test_get_audit_trail_limit_returns_newest():
+    audit_logger = _logger_with_records()
+
+    records = audit_logger.get_audit_trail(limit=2)
+    assert [r.action for r in records] == [AuditAction.VALIDATION_FAILED, AuditAction.EVENT_PROCESSED]
+    assert len(audit_logger.get_audit_trail()) == 5
+
+
+def test_bounded_audit_trail_evicts_oldest_records():
+    audit_logger = AuditLogger(max_records=3)
+    audit_logger.log_event_received("evt_1", "centersync", {})
+    audit_logger.log_event_received("evt_2", "centersync", {})
+    audit_logger.log_event_validated("evt_1", True)
+    audit_logger.log_event_received("evt_3", "centersync", {})
+
+    assert len(audit_logger._audit_trail) == 3
+    received = audit_logger.get_audit_trail(action=AuditAction.EVENT_RECEIVED)
+    assert [r.event_id for r in received] == ["evt_2", "evt_3"]
+
+    audit_logger.log_event_processed("evt_1", 5, "success")
+    audit_logger.log_event_processed("evt_2", 5, "success")
+    assert audit_logger.get_audit_trail(action=AuditAction.EVENT_VALIDATED) == []
+    assert [r.event_id for r in audit_logger.get_audit_trail(action=AuditAction.EVENT_RECEIVED)] == ["evt_3"]
@@ -196,3 +196,23 @@ def test_lineage_missing_snapshot_event():
 
     assert report.is_complete is False
     assert any(gap.stage == "snapshot" for gap in report.gaps)
+
+
+def test_lineage_accepts_generators():
+    event = _sample_event()
+    snapshot = _sample_snapshot("snapshot_1", "missing_event")
+    metrics = _sample_metrics("snapshot_missing")
+
+    validator = LineageValidator()
+    report = validator.validate(
+        events=(e for e in [event]),
+        snapshots=(s for s in [snapshot]),
+        metrics=(m for m in [metrics]),
+        recommendations=iter([]),
+        actions=iter([]),
+        outcomes=iter([]),
+    )
+
+    assert [gap.stage for gap in report.gaps] == ["snapshot", "metrics"]
+    assert report.total_snapshots == 1
+    assert report.total_metrics == 1
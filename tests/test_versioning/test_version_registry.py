@@ -2,6 +2,8 @@
 
 from datetime import datetime, timezone
 
+import pytest
+
 from src.utils.version_registry import VersionRegistry
 from src.models.versioning import VersionedArtifactType
 from src.risk.risk_scoring_engine import BundleRiskScoringEngine
@@ -17,13 +19,16 @@ from src.models.metrics import (
 from src.models.risk import RiskDriver, RiskDriverType, RiskRecommendation, RiskSeverity, BundleBreakRisk
 
 
-def build_metrics(bundle_id: str) -> BundleMetrics:
-    timestamp = datetime.now(timezone.utc)
+# Tests never read these timestamps, so a fixed value keeps the helpers deterministic
+_FIXED_TS = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _validated_metrics(bundle_id: str) -> BundleMetrics:
     return BundleMetrics(
         snapshot_id="snap_v1",
         member_id="member_0001",
         refill_id="refill_0001",
-        computed_timestamp=timestamp,
+        computed_timestamp=_FIXED_TS,
         metrics_version="1.0",
         age_in_stage=AgeInStageMetrics(
             current_stage="pa_pending",
@@ -79,8 +84,7 @@ def build_metrics(bundle_id: str) -> BundleMetrics:
     )
 
 
-def build_risk(bundle_id: str) -> BundleBreakRisk:
-    now = datetime.now(timezone.utc)
+def _validated_risk(bundle_id: str) -> BundleBreakRisk:
     driver = RiskDriver(
         driver_type=RiskDriverType.TIMING_MISALIGNMENT,
         driver_name="Timing Misalignment",
@@ -88,6 +92,7 @@ def build_risk(bundle_id: str) -> BundleBreakRisk:
         confidence=0.9,
         evidence={},
         metric_values={},
+        detected_timestamp=_FIXED_TS,
     )
     recommendation = RiskRecommendation(
         recommendation_id="rec_v1",
@@ -105,7 +110,7 @@ def build_risk(bundle_id: str) -> BundleBreakRisk:
     return BundleBreakRisk(
         risk_id="risk_v1",
         bundle_id=bundle_id,
-        assessment_timestamp=now,
+        assessment_timestamp=_FIXED_TS,
         model_version="1.0",
         break_probability=0.2,
         break_severity=RiskSeverity.LOW,
@@ -121,8 +126,63 @@ def build_risk(bundle_id: str) -> BundleBreakRisk:
     )
 
 
-def test_version_registry_register():
-    registry = VersionRegistry()
+# Validated once at import; the builders below copy them under a new bundle_id
+_PROTOTYPE_METRICS = _validated_metrics("bundle_proto")
+_PROTOTYPE_RISK = _validated_risk("bundle_proto")
+
+
+def build_metrics(bundle_id: str) -> BundleMetrics:
+    # Only the two sub-models carrying bundle_id are copied; the rest are shared
+    return _PROTOTYPE_METRICS.model_copy(update={
+        "timing_overlap": _PROTOTYPE_METRICS.timing_overlap.model_copy(update={"bundle_id": bundle_id}),
+        "bundle_alignment": _PROTOTYPE_METRICS.bundle_alignment.model_copy(update={"bundle_id": bundle_id}),
+    })
+
+
+def build_risk(bundle_id: str) -> BundleBreakRisk:
+    return _PROTOTYPE_RISK.model_copy(update={"bundle_id": bundle_id})
+
+
+@pytest.fixture(scope="module")
+def sample_metrics() -> BundleMetrics:
+    # The engines only read their inputs, so one instance serves every test
+    return build_metrics("bundle_v1")
+
+
+@pytest.fixture(scope="module")
+def sample_risk() -> BundleBreakRisk:
+    return build_risk("bundle_v1")
+
+
+@pytest.fixture(scope="module")
+def shared_registry() -> VersionRegistry:
+    return VersionRegistry()
+
+
+@pytest.fixture
+def registry(shared_registry) -> VersionRegistry:
+    """Shared registry, emptied before each test"""
+    shared_registry.clear()
+    return shared_registry
+
+
+@pytest.fixture(scope="module")
+def risk_engine(shared_registry) -> BundleRiskScoringEngine:
+    # Engines keep the shared registry, which the registry fixture empties in place
+    return BundleRiskScoringEngine(version_registry=shared_registry)
+
+
+@pytest.fixture(scope="module")
+def explain_engine(shared_registry) -> BundleRiskExplainabilityEngine:
+    return BundleRiskExplainabilityEngine(version_registry=shared_registry)
+
+
+def test_prototype_copies_match_validated_models():
+    assert build_metrics("bundle_v2") == _validated_metrics("bundle_v2")
+    assert build_risk("bundle_v2") == _validated_risk("bundle_v2")
+
+
+def test_version_registry_register(registry):
     record = registry.register(
         artifact_id="artifact_1",
         artifact_type=VersionedArtifactType.RISK_ASSESSMENT,
@@ -136,25 +196,57 @@ def test_version_registry_register():
     assert registry.list_by_type(VersionedArtifactType.RISK_ASSESSMENT)
 
 
-def test_version_registry_engine_integration():
-    registry = VersionRegistry()
-    risk_engine = BundleRiskScoringEngine(version_registry=registry)
-    metrics = build_metrics("bundle_v1")
-    risk = risk_engine.assess_bundle_break_risk(metrics)
+def test_version_registry_bulk_register(registry):
+    records = registry.bulk_register([
+        {
+            "artifact_id": "artifact_1",
+            "artifact_type": VersionedArtifactType.RISK_ASSESSMENT,
+            "model_name": "risk_engine",
+            "model_version": "1.0",
+        },
+        {
+            "artifact_id": "artifact_1",
+            "artifact_type": VersionedArtifactType.EXPLANATION,
+            "model_name": "explainability_engine",
+            "model_version": "1.0",
+            "metadata": {"risk_type": "bundle_break"},
+        },
+    ])
+
+    assert [record.artifact_type for record in records] == [
+        VersionedArtifactType.RISK_ASSESSMENT,
+        VersionedArtifactType.EXPLANATION,
+    ]
+    assert registry.list_by_artifact("artifact_1") == records
+    assert registry.list_by_type(VersionedArtifactType.EXPLANATION) == records[1:]
+
+
+def test_version_registry_engine_integration(registry, risk_engine, sample_metrics):
+    risk = risk_engine.assess_bundle_break_risk(sample_metrics)
 
     records = registry.list_by_artifact(risk.risk_id)
     assert records
     assert records[0].artifact_type == VersionedArtifactType.RISK_ASSESSMENT
 
 
-def test_version_registry_explainability_integration():
-    registry = VersionRegistry()
-    explain_engine = BundleRiskExplainabilityEngine(version_registry=registry)
-    metrics = build_metrics("bundle_v1")
-    risk = build_risk("bundle_v1")
-
-    explanation = explain_engine.explain_bundle_break(risk, metrics)
+def test_version_registry_explainability_integration(registry, explain_engine, sample_metrics, sample_risk):
+    explanation = explain_engine.explain_bundle_break(sample_risk, sample_metrics)
 
     records = registry.list_by_artifact(explanation.explanation_id)
     assert records
     assert records[0].artifact_type == VersionedArtifactType.EXPLANATION
+
+
+def test_version_registry_clear(registry):
+    record = registry.register(
+        artifact_id="artifact_1",
+        artifact_type=VersionedArtifactType.RISK_ASSESSMENT,
+        model_name="risk_engine",
+        model_version="1.0",
+    )
+
+    registry.clear()
+
+    assert registry.get(record.record_id) is None
+    assert registry.list_by_artifact("artifact_1") == []
+    assert registry.list_by_type(VersionedArtifactType.RISK_ASSESSMENT) == []